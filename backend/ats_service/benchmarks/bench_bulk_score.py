@@ -0,0 +1,86 @@
+"""
+Bulk Scoring Benchmark
+Scores a generated .tar.gz of resumes with a growing number of worker
+processes and reports throughput and speedup over one worker, plus the time
+to read every archive member by reopening the archive per resume (the old
+approach, quadratic for .tar.gz) versus one streaming pass.
+
+Usage:
+    python benchmarks/bench_bulk_score.py [--resumes 400] [--workers 1 2 4 8]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+import bulk_score
+
+LINES = ["Jane Doe - Data Engineer", "Experience", "Data Engineer, Acme (2018 - 2022)",
+         "- Developed ETL pipelines in Python and Spark", "- Built CI with Docker and Jenkins",
+         "Education", "B.Sc. Computer Science, University of Lahore", "Skills", "Python, SQL, AWS, Kubernetes"]
+
+
+def build_archive(path, resumes):
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(LINES):
+        page.insert_text((50, 60 + 18 * i), line, fontsize=13 if len(line) < 12 else 10)
+    pdf = doc.tobytes()
+    with tarfile.open(path, "w:gz") as tf:
+        for i in range(resumes):
+            info = tarfile.TarInfo(f"resumes/{i:06d}.pdf")
+            info.size = len(pdf)
+            tf.addfile(info, io.BytesIO(pdf))
+
+
+def read_reopening(path):
+    for source_id, _ in bulk_score.iter_sources(path):
+        with tarfile.open(path) as tf:
+            tf.extractfile(source_id.split(bulk_score.ARCHIVE_SEPARATOR, 1)[1]).read()
+
+
+def read_streaming(path):
+    for _ in bulk_score.iter_tasks(path):
+        pass
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    print(f"{'members':>8} {'reopen s':>9} {'stream s':>9}")
+    for n in (args.resumes // 4, args.resumes // 2, args.resumes):
+        path = os.path.join(tmp, f"read-{n}.tar.gz")
+        build_archive(path, n)
+        print(f"{n:>8} {timed(read_reopening, path):>9.2f} {timed(read_streaming, path):>9.2f}")
+
+    archive = os.path.join(tmp, "resumes.tar.gz")
+    build_archive(archive, args.resumes)
+    print(f"\n{os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>8} {'resumes/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        out = os.path.join(tmp, f"results-{workers}.jsonl")
+        elapsed = timed(bulk_score.run, archive, out, workers)
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>8.2f} {args.resumes / elapsed:>10.1f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+DOCX Extraction Benchmark
+Compares python-docx (`extract_text_from_docx`) with the streaming zip/XML
+extractor (`extract_text_from_docx_fast`) on generated resumes of growing size.
+
+Peak memory is measured with tracemalloc, which does not see lxml's C-level
+allocations, so python-docx's real footprint is higher than reported.
+
+Usage:
+    python benchmarks/bench_docx.py [--paragraphs 200 2000 20000] [--repeat 5]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx
+from utils.extractor import extract_text_from_docx, extract_text_from_docx_fast
+
+
+def build_docx(paragraphs):
+    """Builds a resume-like DOCX with a header, body paragraphs and a skills table."""
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | Senior Software Engineer"
+    doc.add_heading("Experience", level=1)
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Developed service {i} in Python and Go, cutting latency by {i % 90}% for 2M users.", style="List Bullet")
+    doc.add_heading("Skills", level=1)
+    table = doc.add_table(rows=max(paragraphs // 20, 1), cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = ["Python", "Kubernetes", "PostgreSQL"][c] + f" {r}"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def measure(fn, data, repeat):
+    fn(data)  # Warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        text = fn(data)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+
+    tracemalloc.start()
+    fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / (1024 * 1024), len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'paragraphs':>10} {'size KB':>8} | {'python-docx ms':>14} {'peak MB':>8} {'chars':>8} | {'streaming ms':>12} {'peak MB':>8} {'chars':>8} | {'speedup':>7}")
+    for n in args.paragraphs:
+        data = build_docx(n)
+        slow = measure(extract_text_from_docx, data, args.repeat)
+        fast = measure(extract_text_from_docx_fast, data, args.repeat)
+        print(f"{n:>10} {len(data) / 1024:>8.0f} | {slow[0]:>14.1f} {slow[1]:>8.1f} {slow[2]:>8} | "
+              f"{fast[0]:>12.1f} {fast[1]:>8.1f} {fast[2]:>8} | {slow[0] / fast[0]:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
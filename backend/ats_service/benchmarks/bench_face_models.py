@@ -0,0 +1,120 @@
+"""
+Face Model Pack Benchmark
+Compares face engine configurations (model pack, INT8 recognition) against
+buffalo_l on a local image set: load time, per-image latency, peak RSS and
+agreement of /verify-face decisions over every image pair.
+
+Each configuration runs in a fresh process so memory numbers are not shared.
+Images may be grouped in one sub-folder per person to also report the
+genuine-pair accept rate.
+
+Usage:
+    python benchmarks/bench_face_models.py --images ./faces
+    python benchmarks/bench_face_models.py --images ./faces --configs buffalo_l buffalo_l:int8 buffalo_s buffalo_sc
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def list_images(folder):
+    images = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, name)
+                images.append((path, os.path.relpath(root, folder)))
+    return images
+
+
+def run_config(config, paths):
+    """Runs in a child process: loads one engine and embeds every image."""
+    sys.path.insert(0, ROOT)
+    import cv2
+    from utils.face_engine import load_face_analyzer, embed_image
+
+    pack, _, variant = config.partition(":")
+    started = time.perf_counter()
+    analyzer = load_face_analyzer(pack=pack, int8=(variant == "int8"))
+    load_s = time.perf_counter() - started
+
+    embeddings, latencies = {}, []
+    for path in paths:
+        img = cv2.imread(path, cv2.IMREAD_COLOR)
+        if img is None:
+            continue
+        started = time.perf_counter()
+        embedding, reason, _ = embed_image(analyzer, img)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if embedding is not None:
+            embeddings[path] = np.asarray(embedding, dtype=np.float32)
+
+    return {
+        "load_s": load_s,
+        "latencies": latencies,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "embeddings": embeddings,
+    }
+
+
+def pair_scores(embeddings, paths):
+    matrix = np.stack([embeddings[p] for p in paths])
+    scores = matrix @ matrix.T
+    upper = np.triu_indices(len(paths), k=1)
+    return scores[upper], upper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", required=True, help="Folder of face images (optionally one sub-folder per person)")
+    parser.add_argument("--configs", nargs="+", default=["buffalo_l", "buffalo_l:int8", "buffalo_s", "buffalo_s:int8"])
+    parser.add_argument("--threshold", type=float, default=0.75)
+    args = parser.parse_args()
+
+    images = list_images(args.images)
+    paths = [p for p, _ in images]
+    person = dict(images)
+    if not paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    configs = ["buffalo_l"] + [c for c in args.configs if c != "buffalo_l"]
+    ctx = mp.get_context("spawn")
+    results = {}
+    for config in configs:
+        with ctx.Pool(1) as pool:
+            results[config] = pool.apply(run_config, (config, paths))
+
+    baseline = results["buffalo_l"]["embeddings"]
+    print(f"{len(paths)} images, threshold {args.threshold}")
+    print(f"{'config':>16} {'load s':>7} {'p50 ms':>7} {'p95 ms':>7} {'peak RSS MB':>11} {'faces':>6} "
+          f"{'decision agree':>14} {'mean |dscore|':>13} {'genuine accept':>14}")
+
+    for config in configs:
+        r = results[config]
+        common = [p for p in paths if p in r["embeddings"] and p in baseline]
+        agree = dscore = genuine_rate = float("nan")
+        if len(common) > 1:
+            scores, (i, j) = pair_scores(r["embeddings"], common)
+            base_scores, _ = pair_scores(baseline, common)
+            agree = 100 * np.mean((scores >= args.threshold) == (base_scores >= args.threshold))
+            dscore = np.mean(np.abs(scores - base_scores))
+            genuine = np.array([person[common[a]] == person[common[b]] and person[common[a]] != "." for a, b in zip(i, j)])
+            if genuine.any():
+                genuine_rate = 100 * np.mean(scores[genuine] >= args.threshold)
+
+        lat = np.array(r["latencies"]) if r["latencies"] else np.array([np.nan])
+        print(f"{config:>16} {r['load_s']:>7.2f} {np.percentile(lat, 50):>7.1f} {np.percentile(lat, 95):>7.1f} "
+              f"{r['peak_rss_mb']:>11.0f} {len(r['embeddings']):>6} {agree:>13.2f}% {dscore:>13.4f} {genuine_rate:>13.1f}%")
+
+
+if __name__ == "__main__":
+    main()
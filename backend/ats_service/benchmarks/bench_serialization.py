@@ -0,0 +1,98 @@
+"""
+Response Serialization Benchmark
+Compares CPU time per response for FastAPI's default path (jsonable_encoder +
+json.dumps), a validated pydantic response_model, and FastJSONResponse, then
+reports bytes on the wire raw, gzip and brotli for quiz and ATS responses,
+including batch-sized payloads.
+
+Usage:
+    python benchmarks/bench_serialization.py [--batch 100] [--repeat 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from utils.quiz_generator import generate_quiz
+from utils.responses import brotli, compress, dumps, orjson
+from utils.schemas import ATSResponse, QuizResponse
+
+
+def ats_payload(i=0):
+    return {
+        "resume_score": 87.5,
+        "skills_detected": ["python", "fastapi", "docker", "kubernetes", "postgresql", "aws", "react", "git"],
+        "sections_found": ["skills", "experience", "education", "projects", "certifications"],
+        "strengths": ["Strong technical skill set", "Quantified achievements in experience", "Clear structure"],
+        "weaknesses": ["Summary section is missing", "Few leadership examples"],
+        "suggestions": ["Add a 2-3 line professional summary", "Mention team size for led projects",
+                        "List cloud certifications with dates"],
+        "ats_feedback": "Your resume is well structured and keyword rich; a short summary would improve it.",
+        "status": "success",
+        "resume_id": f"{i:016x}",
+        "near_duplicate": None,
+    }
+
+
+def quiz_payload(num_questions):
+    quiz = generate_quiz("python", num_questions)
+    return dict(quiz, status="success")
+
+
+def default_path(content):
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def bench(fn, content, repeat):
+    fn(content)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(content)
+    return (time.perf_counter() - started) / repeat * 1e6, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=100, help="Results per batch-sized ATS payload")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    ats_batch = TypeAdapter(List[ATSResponse])
+    payloads = [
+        ("quiz (10 q)", quiz_payload(10), TypeAdapter(QuizResponse)),
+        ("quiz (50 q)", quiz_payload(50), TypeAdapter(QuizResponse)),
+        ("ats", ats_payload(), TypeAdapter(ATSResponse)),
+        (f"ats batch x{args.batch}", [ats_payload(i) for i in range(args.batch)], ats_batch),
+    ]
+
+    print(f"JSON backend: {'orjson' if orjson else 'json'}, brotli: {'yes' if brotli else 'not installed'}")
+    print(f"{'payload':>16} {'default us':>11} {'model us':>9} {'fast us':>8} {'speedup':>8} "
+          f"{'raw B':>8} {'gzip B':>8} {'gzip us':>8} {'br B':>8} {'br us':>8}")
+    for name, content, adapter in payloads:
+        repeat = max(args.repeat // (len(content) if isinstance(content, list) else 1), 20)
+        default_us, raw = bench(default_path, content, repeat)
+        model_us, _ = bench(lambda c: adapter.dump_json(adapter.validate_python(c)), content, repeat)
+        fast_us, body = bench(dumps, content, repeat)
+        assert json.loads(body) == json.loads(raw)
+
+        gzip_us, gz = bench(lambda b: compress(b, "gzip"), body, repeat)
+        br_cols = f"{'-':>8} {'-':>8}"
+        if brotli is not None:
+            br_us, br = bench(lambda b: compress(b, "br"), body, repeat)
+            br_cols = f"{len(br):>8} {br_us:>8.1f}"
+        print(f"{name:>16} {default_us:>11.1f} {model_us:>9.1f} {fast_us:>8.1f} {default_us / fast_us:>7.1f}x "
+              f"{len(body):>8} {len(gz):>8} {gzip_us:>8.1f} {br_cols}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Embedding Codec Evaluation
+Measures how far verification scores drift from float32 when the gallery is
+stored as float16 or int8, and how many verify/reject decisions flip at the
+`/verify-face` threshold.
+
+Real embeddings can be supplied as an (N, 512) .npy of normed embeddings with
+an (N,) .npy of identity labels; otherwise a synthetic set is generated whose
+genuine-pair scores straddle the threshold.
+
+Usage:
+    python benchmarks/eval_embedding_codec.py
+    python benchmarks/eval_embedding_codec.py --embeddings emb.npy --labels ids.npy
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.embedding_codec import CODECS, encode, similarity, bytes_per_vector
+
+
+def synthetic_embeddings(identities, per_identity, dim, seed=0):
+    """Unit vectors clustered per identity; noise puts genuine scores around 0.6-0.9."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((identities, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    noise = rng.uniform(0.35, 0.75, size=(identities * per_identity, 1)).astype(np.float32)
+    samples = np.repeat(centers, per_identity, axis=0)
+    samples += noise * rng.standard_normal(samples.shape).astype(np.float32) / np.sqrt(dim)
+    samples /= np.linalg.norm(samples, axis=1, keepdims=True)
+    return samples, np.repeat(np.arange(identities), per_identity)
+
+
+def evaluate(embeddings, labels, threshold, queries):
+    rng = np.random.default_rng(1)
+    query_idx = rng.choice(len(embeddings), size=min(queries, len(embeddings)), replace=False)
+    reference = {}
+
+    print(f"{len(embeddings)} embeddings, {len(query_idx)} queries, threshold {threshold}")
+    print(f"{'codec':>8} {'bytes/vec':>9} {'gallery MB':>10} {'max |drift|':>11} {'mean |drift|':>12} "
+          f"{'flips':>7} {'flip %':>7} {'ms/query':>8}")
+
+    for codec in CODECS:
+        codes, scales = encode(embeddings, codec)
+        started = time.perf_counter()
+        scores = np.stack([similarity(codes, scales, embeddings[i]) for i in query_idx])
+        ms_per_query = (time.perf_counter() - started) * 1000 / len(query_idx)
+
+        # Exclude self-matches, which are always ~1.0
+        mask = np.ones_like(scores, dtype=bool)
+        mask[np.arange(len(query_idx)), query_idx] = False
+        if codec == "float32":
+            reference = {"scores": scores, "decisions": scores >= threshold}
+        drift = np.abs(scores - reference["scores"])[mask]
+        flips = int(((scores >= threshold) != reference["decisions"])[mask].sum())
+        gallery_mb = (codes.nbytes + (scales.nbytes if scales is not None else 0)) / (1024 * 1024)
+
+        print(f"{codec:>8} {bytes_per_vector(codec, embeddings.shape[1]):>9} {gallery_mb:>10.2f} {drift.max():>11.6f} "
+              f"{drift.mean():>12.7f} {flips:>7} {100 * flips / mask.sum():>6.4f}% {ms_per_query:>8.3f}")
+
+    genuine = (labels[query_idx][:, None] == labels[None, :]) & mask
+    near = np.abs(reference["scores"] - threshold) < 0.01
+    print(f"float32 genuine pairs >= threshold: {100 * (reference['decisions'] & genuine).sum() / max(genuine.sum(), 1):.1f}%; "
+          f"pairs within 0.01 of threshold: {int((near & mask).sum())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embeddings", help="(N, 512) .npy of normed embeddings")
+    parser.add_argument("--labels", help="(N,) .npy of identity labels")
+    parser.add_argument("--identities", type=int, default=2000)
+    parser.add_argument("--per-identity", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=0.75)
+    args = parser.parse_args()
+
+    if args.embeddings:
+        embeddings = np.load(args.embeddings).astype(np.float32)
+        labels = np.load(args.labels) if args.labels else np.arange(len(embeddings))
+    else:
+        embeddings, labels = synthetic_embeddings(args.identities, args.per_identity, 512)
+    evaluate(embeddings, labels, args.threshold, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Bulk Resume Scoring CLI
+Scores every resume in a directory or archive (.zip / .tar / .tar.gz) offline,
+without going through the HTTP API.
+
+Usage:
+    python bulk_score.py ./resumes --out results.jsonl --workers 8
+    python bulk_score.py resumes.zip --out results.parquet --resume
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tarfile
+import time
+import zipfile
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc")
+ARCHIVE_SEPARATOR = "::"
+
+# Populated once per worker process by _init_worker so spaCy/NLTK are
+# loaded a single time per process rather than once per resume.
+_pipeline = {}
+# Zip archives opened by this worker; reading a member is then a seek
+_zip_files = {}
+
+
+def _init_worker():
+    # An exception escaping a Pool initializer makes the pool respawn workers
+    # forever, so the failure is recorded and reported per resume instead.
+    try:
+        from utils.extractor import extract_resume_layout
+        from utils.preprocessor import preprocess_text
+        from utils.analyzer import extract_information, calculate_ats_score
+        from utils.explainer import get_fallback_feedback
+    except Exception as e:
+        _pipeline["init_error"] = f"Worker initialization failed: {e}"
+        return
+
+    _pipeline.update(
+        extract_resume_layout=extract_resume_layout,
+        preprocess_text=preprocess_text,
+        extract_information=extract_information,
+        calculate_ats_score=calculate_ats_score,
+        get_fallback_feedback=get_fallback_feedback,
+    )
+
+
+def iter_sources(path):
+    """
+    Yields (source_id, extension) for every supported resume under `path`.
+    Archive members are addressed as "<archive>::<member>".
+    """
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                ext = os.path.splitext(name)[1].lower()
+                if ext in SUPPORTED_EXTENSIONS:
+                    yield os.path.join(root, name), ext
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for name in zf.namelist():
+                ext = os.path.splitext(name)[1].lower()
+                if ext in SUPPORTED_EXTENSIONS:
+                    yield f"{path}{ARCHIVE_SEPARATOR}{name}", ext
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as tf:
+            for member in tf.getmembers():
+                ext = os.path.splitext(member.name)[1].lower()
+                if member.isfile() and ext in SUPPORTED_EXTENSIONS:
+                    yield f"{path}{ARCHIVE_SEPARATOR}{member.name}", ext
+    else:
+        raise ValueError(f"Not a directory or supported archive: {path}")
+
+
+def read_source(source_id):
+    """
+    Reads the raw bytes of a file or zip member. Tar members are not read here:
+    finding one means scanning (and for .tar.gz decompressing) the archive up
+    to it, so `iter_tasks` streams them from the parent instead.
+    """
+    if ARCHIVE_SEPARATOR not in source_id:
+        with open(source_id, "rb") as f:
+            return f.read()
+
+    archive, member = source_id.split(ARCHIVE_SEPARATOR, 1)
+    zf = _zip_files.get(archive)
+    if zf is None:
+        zf = _zip_files[archive] = zipfile.ZipFile(archive)
+    return zf.read(member)
+
+
+def iter_tasks(path, skip=()):
+    """
+    Yields (source_id, extension, content) for the resumes under `path` not in
+    `skip`. Content is None when the worker reads the file itself; tar members
+    are read by the parent in one sequential pass and sent with the task.
+    """
+    if os.path.isdir(path) or zipfile.is_zipfile(path):
+        for source_id, ext in iter_sources(path):
+            if source_id not in skip:
+                yield source_id, ext, None
+        return
+    with tarfile.open(path, "r|*") as tf:
+        for member in tf:
+            ext = os.path.splitext(member.name)[1].lower()
+            source_id = f"{path}{ARCHIVE_SEPARATOR}{member.name}"
+            if member.isfile() and ext in SUPPORTED_EXTENSIONS and source_id not in skip:
+                yield source_id, ext, tf.extractfile(member).read()
+
+
+def score_resume(task):
+    """Runs the full ATS pipeline on a single resume inside a worker."""
+    source_id, extension, content = task
+    started = time.perf_counter()
+    try:
+        if "init_error" in _pipeline:
+            raise RuntimeError(_pipeline["init_error"])
+        if content is None:
+            content = read_source(source_id)
+        # Pages are not split across processes here; the pool already runs one resume per worker
+        raw_text, header_hints = _pipeline["extract_resume_layout"](content, extension, parallel=False)
+        clean_text = _pipeline["preprocess_text"](raw_text)
+        extracted_data = _pipeline["extract_information"](clean_text, header_hints)
+        score, sections_found = _pipeline["calculate_ats_score"](extracted_data, clean_text)
+        feedback = _pipeline["get_fallback_feedback"](score, extracted_data)
+
+        return {
+            "source": source_id,
+            "status": "error" if "error" in extracted_data else "success",
+            "error": extracted_data.get("error"),
+            "resume_score": score,
+            "skills_detected": extracted_data.get("skills", []),
+            "sections_found": sections_found,
+            "strengths": feedback.get("strengths", []),
+            "weaknesses": feedback.get("weaknesses", []),
+            "suggestions": feedback.get("suggestions", []),
+            "ats_feedback": feedback.get("summary", ""),
+            "experience_years": round(extracted_data.get("experience_months", 0) / 12, 1),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+    except Exception as e:
+        return {
+            "source": source_id,
+            "status": "error",
+            "error": str(e),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+
+class JsonlWriter:
+    """Appends one JSON record per line, flushing so progress survives a crash."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def completed(self):
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["source"])
+                except (ValueError, KeyError):
+                    continue  # Truncated last line from an interrupted run
+        return done
+
+    def open(self, append):
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Writes every batch of `batch_size` records as a finished part file in
+    `<out>.parts/`, so an interrupted run keeps all flushed batches and
+    `--resume` picks them up. On close, the previous output (when resuming)
+    and the parts are merged into a single table at `<out>`.
+    """
+
+    def __init__(self, path, batch_size=500):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+        self.path = path
+        self.parts_dir = path + ".parts"
+        self.batch_size = batch_size
+        self._buffer = []
+        self._append = False
+        self._next_part = 0
+
+    def _parts(self):
+        if not os.path.isdir(self.parts_dir):
+            return []
+        return sorted(os.path.join(self.parts_dir, name) for name in os.listdir(self.parts_dir)
+                      if name.endswith(".parquet"))
+
+    def completed(self):
+        import pyarrow.parquet as pq
+
+        done = set()
+        for path in ([self.path] if os.path.exists(self.path) else []) + self._parts():
+            done.update(pq.read_table(path, columns=["source"]).column("source").to_pylist())
+        return done
+
+    def open(self, append):
+        self._append = append
+        if not append:
+            # A fresh run must not merge parts left behind by an interrupted one
+            shutil.rmtree(self.parts_dir, ignore_errors=True)
+        os.makedirs(self.parts_dir, exist_ok=True)
+        parts = self._parts()
+        self._next_part = int(os.path.basename(parts[-1])[5:11]) + 1 if parts else 0
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+        rows = [{k: (json.dumps(v) if isinstance(v, (list, dict)) else v) for k, v in r.items()} for r in self._buffer]
+        part = os.path.join(self.parts_dir, f"part-{self._next_part:06d}.parquet")
+        pq.write_table(pa.Table.from_pylist(rows, schema=self._schema()), part + ".tmp")
+        os.replace(part + ".tmp", part)
+        self._next_part += 1
+        self._buffer = []
+
+    def _schema(self):
+        import pyarrow as pa
+
+        return pa.schema([
+            ("source", pa.string()), ("status", pa.string()), ("error", pa.string()),
+            ("resume_score", pa.float64()), ("skills_detected", pa.string()),
+            ("sections_found", pa.string()), ("strengths", pa.string()),
+            ("weaknesses", pa.string()), ("suggestions", pa.string()),
+            ("ats_feedback", pa.string()), ("experience_years", pa.float64()),
+            ("elapsed_ms", pa.float64()),
+        ])
+
+    def _conform(self, table):
+        """Casts a table to the current schema, adding columns older outputs lack as nulls."""
+        import pyarrow as pa
+
+        schema = self._schema()
+        for field in schema:
+            if field.name not in table.column_names:
+                table = table.append_column(field.name, pa.nulls(len(table), field.type))
+        return table.select(schema.names).cast(schema)
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        import pyarrow.parquet as pq
+
+        self._flush()
+        sources = ([self.path] if self._append and os.path.exists(self.path) else []) + self._parts()
+        if not sources:
+            return
+        tmp_path = self.path + ".tmp"
+        with pq.ParquetWriter(tmp_path, self._schema()) as writer:
+            for source in sources:
+                writer.write_table(self._conform(pq.read_table(source)))
+        os.replace(tmp_path, self.path)
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
+
+
+def run(input_path, output_path, workers=None, resume=False, chunksize=4):
+    writer = ParquetWriter(output_path) if output_path.endswith(".parquet") else JsonlWriter(output_path)
+    done = writer.completed() if resume else set()
+    total = sum(1 for source_id, _ in iter_sources(input_path) if source_id not in done)
+
+    print(f"Found {total + len(done)} resumes, {len(done)} already scored, {total} to go.")
+    if not total:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    processed = 0
+    failed = 0
+
+    writer.open(append=resume)
+    try:
+        with mp.Pool(processes=workers, initializer=_init_worker) as pool:
+            # The pool consumes tasks lazily, so streamed tar contents are not all held at once
+            for record in pool.imap_unordered(score_resume, iter_tasks(input_path, done), chunksize=chunksize):
+                writer.write(record)
+                processed += 1
+                if record["status"] != "success":
+                    failed += 1
+                if processed % 100 == 0:
+                    rate = processed / (time.perf_counter() - started)
+                    print(f"  {processed}/{total} scored ({rate:.1f} resumes/s)")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Scored {processed} resumes in {elapsed:.1f}s with {workers} workers "
+          f"({processed / elapsed:.1f} resumes/s, {failed} failed).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a folder or archive of resumes offline.")
+    parser.add_argument("input", help="Directory, .zip or .tar(.gz) archive of PDF/DOCX resumes")
+    parser.add_argument("--out", default="results.jsonl", help="Output file (.jsonl or .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=4, help="Resumes handed to a worker at a time")
+    parser.add_argument("--resume", action="store_true", help="Skip resumes already present in the output file")
+    args = parser.parse_args(argv)
+
+    run(args.input, args.out, workers=args.workers, resume=args.resume, chunksize=args.chunksize)
+
+
+if __name__ == "__main__":
+    # Make `utils` importable when launched from another directory
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    main()
@@ -1,30 +1,70 @@
 import uvicorn
+import asyncio
 import os
 import json
 from typing import List
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 try:
     import cv2
     import numpy as np
-    from insightface.app import FaceAnalysis
+    from utils.face_engine import load_face_analyzer, embed_image
+    from utils.face_quality import REASONS, record_rejection, fit_image
     FACE_RECOGNITION_AVAILABLE = True
 except ImportError:
     FACE_RECOGNITION_AVAILABLE = False
     print("Warning: InsightFace or OpenCV not found. Identity verification will be disabled.")
 
 # ATS Utils
-from utils.extractor import extract_resume_text
+from utils.extractor import extract_resume_layout, start_pdf_pool, stop_pdf_pool
 from utils.preprocessor import preprocess_text
 from utils.analyzer import extract_information, calculate_ats_score
+from utils.incremental import extract_information_incremental
+from utils.dedup import check_duplicate, resume_index, DEDUP_INDEX_PATH, REUSE_THRESHOLD as DEDUP_REUSE_THRESHOLD
 from utils.explainer import generate_feedback, get_fallback_feedback
-from utils.quiz_generator import generate_quiz
+from utils.skill_graph import skill_graph, resume_terms, SKILL_GRAPH_PATH
+from utils.scoring import extract_features
+from utils.history_store import analysis_history, to_epoch, PERIODS
+from utils.quiz_generator import generate_quiz, prepare_question_pools
+from utils.quiz_pool import question_bank, pool_builder
+from utils import metrics
+from utils.scheduler import admission, scheduler
+from utils import diagnostics
+from utils.responses import FastJSONResponse, CompressionMiddleware
+from utils.schemas import ATSResponse, QuizResponse, VerifyFaceResponse
+from utils.uploads import (
+    UploadBudget, UploadLimitMiddleware, read_upload, sniff_file_type,
+    RESUME_TYPES, IMAGE_TYPES, MAX_REQUEST_BYTES
+)
+
+# Reuse cached per-paragraph analysis when a resume is re-uploaded with small edits
+INCREMENTAL_ANALYSIS = os.getenv("ATS_INCREMENTAL_ANALYSIS", "1") == "1"
+
+app = FastAPI(
+    title="True-Profile AI Unified Backend",
+    description="ATS + Skills + Identity Verification",
+    default_response_class=FastJSONResponse,
+)
+
+# gzip/brotli for JSON responses above COMPRESSION_MIN_BYTES
+app.add_middleware(CompressionMiddleware)
 
-app = FastAPI(title="True-Profile AI Unified Backend", description="ATS + Skills + Identity Verification")
+# Reject oversized request bodies before they are buffered
+app.add_middleware(UploadLimitMiddleware, max_bytes=MAX_REQUEST_BYTES)
 
-# Enable CORS
+# Worker recycling after WORKER_MAX_REQUESTS or above WORKER_MAX_RSS_MB, and the
+# opt-in /diagnostics memory endpoints (DIAGNOSTICS_ENABLED=1)
+if diagnostics.watchdog.enabled or diagnostics.DIAGNOSTICS_ENABLED:
+    app.add_middleware(diagnostics.RequestTrackingMiddleware)
+if diagnostics.DIAGNOSTICS_ENABLED:
+    diagnostics.start_tracing()
+    app.include_router(diagnostics.router)
+
+# Enable CORS. Added last so it is the outermost middleware and responses
+# produced by the others (e.g. the upload limit's 413) carry CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -33,17 +73,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_watchdog():
+    if diagnostics.watchdog.max_rss_mb:
+        asyncio.create_task(diagnostics.watchdog.run())
+
 # --- Identity Verification Setup ---
-# Initialize FaceAnalysis with Buffalo_L model
-try:
-    face_analyzer = FaceAnalysis(name='buffalo_l', providers=['CPUExecutionProvider'])
-    face_analyzer.prepare(ctx_id=0, det_size=(640, 640))
-except Exception as e:
-    print(f"Warning: InsightFace initialization failed. Identity verification may not work: {e}")
-    face_analyzer = None
-
-def get_embedding(image_bytes):
-    if face_analyzer is None:
+# With FACE_INFERENCE_WORKERS > 0, InsightFace runs in a process pool fed via
+# shared memory; otherwise Buffalo_L is loaded and run in this process. Both
+# are built on startup rather than at import: spawned pool workers (face and
+# PDF) re-import `python main.py` as __mp_main__, where startup never runs.
+FACE_INFERENCE_WORKERS = int(os.getenv("FACE_INFERENCE_WORKERS", 0))
+face_analyzer = None
+face_pool = None
+
+def init_face_service():
+    global face_analyzer, face_pool
+    try:
+        if FACE_INFERENCE_WORKERS > 0:
+            from utils.face_pool import FaceInferencePool
+            pool = FaceInferencePool(FACE_INFERENCE_WORKERS)
+            try:
+                pool.warm_up()
+            except Exception:
+                pool.close()
+                raise
+            face_pool = pool
+        else:
+            face_analyzer = load_face_analyzer()
+    except Exception as e:
+        print(f"Warning: InsightFace initialization failed. Identity verification may not work: {e}")
+
+@app.on_event("startup")
+async def start_face_service():
+    if FACE_RECOGNITION_AVAILABLE:
+        await asyncio.get_running_loop().run_in_executor(None, init_face_service)
+
+@app.on_event("shutdown")
+def stop_face_pool():
+    if face_pool is not None:
+        face_pool.close()
+
+# Long PDFs are split across worker processes, started here rather than at import
+@app.on_event("startup")
+def start_pdf_workers():
+    start_pdf_pool()
+
+@app.on_event("shutdown")
+def stop_pdf_workers():
+    stop_pdf_pool()
+
+async def get_embedding(image_bytes, single_face=False, quality_gate=True):
+    """
+    Returns (normed_embedding, reason). Blurry, badly exposed, faceless or
+    tiny-face images are rejected with a reason code from REASONS before the
+    recognition model runs; only the largest face is embedded. Without
+    `quality_gate` only images with no detectable face are rejected.
+    """
+    if face_analyzer is None and face_pool is None:
         raise HTTPException(status_code=503, detail="Face analysis service is unavailable.")
         
     nparr = np.frombuffer(image_bytes, np.uint8)
@@ -51,105 +138,206 @@ def get_embedding(image_bytes):
     if img is None:
         raise HTTPException(status_code=400, detail="Could not decode image.")
 
-    faces = face_analyzer.get(img)
-    if not faces:
-        return None
-    
-    # Return embedding of the largest face
-    best_face = max(faces, key=lambda x: (x.bbox[2]-x.bbox[0]) * (x.bbox[3]-x.bbox[1]))
-    return best_face.normed_embedding
+    img = fit_image(img)
+    if face_pool is not None:
+        embedding, reason, timings = await face_pool.embed(img, single_face, quality_gate)
+    else:
+        embedding, reason, timings = embed_image(face_analyzer, img, single_face, quality_gate)
+
+    for name, elapsed_ms in timings.items():
+        metrics.observe(name, elapsed_ms)
+    if reason is not None:
+        record_rejection(reason)
+        return None, reason
+    metrics.increment("face_quality.accepted")
+    return embedding, None
 
 @app.get("/")
 async def root():
     return {"message": "True-Profile AI Unified Backend is running!"}
 
+@app.get("/metrics")
+async def get_metrics():
+    return dict(metrics.snapshot(), scheduler=scheduler.stats(), worker=diagnostics.watchdog.status(),
+                rss_mb=round(diagnostics.rss_mb(), 1), quiz_pools=question_bank.stats())
+
 # --- ATS Endpoints ---
-@app.post("/analyze-resume")
-async def analyze_resume(file: UploadFile = File(...)):
-    extension = os.path.splitext(file.filename)[1]
-    if extension.lower() not in [".pdf", ".docx", ".doc"]:
+@app.on_event("shutdown")
+def persist_state():
+    if SKILL_GRAPH_PATH:
+        skill_graph.save(SKILL_GRAPH_PATH)
+    if DEDUP_INDEX_PATH:
+        try:
+            resume_index.save(DEDUP_INDEX_PATH)
+        except Exception as e:
+            print(f"Warning: Could not save resume index to {DEDUP_INDEX_PATH}: {e}")
+    if analysis_history is not None:
+        analysis_history.flush()
+
+def run_resume_analysis(content, extension):
+    """Full ATS pipeline for one upload; runs in the threadpool."""
+    raw_text, header_hints = extract_resume_layout(content, extension)
+    clean_text = preprocess_text(raw_text)
+
+    # Re-upload or near-duplicate of an already analyzed resume: reuse its analysis
+    resume_id, signature, duplicate = check_duplicate(clean_text)
+    cached = resume_index.cached_result(resume_id)
+    if cached is None and duplicate and duplicate["similarity"] >= DEDUP_REUSE_THRESHOLD:
+        cached = resume_index.cached_result(duplicate["resume_id"])
+    if cached is not None:
+        metrics.increment("dedup.reused")
+        return dict(cached, resume_id=resume_id, near_duplicate=duplicate)
+    if duplicate:
+        metrics.increment("dedup.flagged")
+
+    if INCREMENTAL_ANALYSIS:
+        extracted_data = extract_information_incremental(clean_text, header_hints=header_hints)
+    else:
+        extracted_data = extract_information(clean_text, header_hints)
+    score, sections_found = calculate_ats_score(extracted_data, clean_text)
+    feedback = generate_feedback(score, extracted_data)
+    
+    if isinstance(feedback, str):
+        try:
+            feedback = json.loads(feedback)
+        except:
+            feedback = get_fallback_feedback(score, extracted_data)
+
+    result = {
+        "resume_score": score,
+        "skills_detected": extracted_data.get("skills", []) if "skills" in extracted_data else extracted_data.get("keywords", []),
+        "sections_found": sections_found,
+        "strengths": feedback.get("strengths", []),
+        "weaknesses": feedback.get("weaknesses", []),
+        "suggestions": feedback.get("suggestions", []),
+        "ats_feedback": feedback.get("summary", ""),
+        "experience_years": round(extracted_data.get("experience_months", 0) / 12, 1),
+        "status": "success"
+    }
+    if "error" not in extracted_data:
+        terms = resume_terms(extracted_data)
+        skill_graph.add_resume(terms)
+        if analysis_history is not None:
+            analysis_history.append(score, extract_features(extracted_data, clean_text), terms, resume_id)
+        resume_index.add(resume_id, signature)
+        resume_index.cache_result(resume_id, result)
+    return dict(result, resume_id=resume_id, near_duplicate=duplicate)
+
+@app.post("/analyze-resume", response_model=ATSResponse)
+async def analyze_resume(file: UploadFile = File(...), lane: str = Depends(admission("interactive"))):
+    content = await read_upload(file, UploadBudget())
+    extension = RESUME_TYPES.get(sniff_file_type(content))
+    if extension is None:
         raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported.")
 
     try:
-        content = await file.read()
-        raw_text = extract_resume_text(content, extension)
-        clean_text = preprocess_text(raw_text)
-        extracted_data = extract_information(clean_text)
-        score, sections_found = calculate_ats_score(extracted_data, clean_text)
-        feedback = generate_feedback(score, extracted_data)
-        
-        if isinstance(feedback, str):
-            try:
-                feedback = json.loads(feedback)
-            except:
-                feedback = get_fallback_feedback(score, extracted_data)
-
-        return {
-            "resume_score": score,
-            "skills_detected": extracted_data.get("skills", []) if "skills" in extracted_data else extracted_data.get("keywords", []),
-            "sections_found": sections_found,
-            "strengths": feedback.get("strengths", []),
-            "weaknesses": feedback.get("weaknesses", []),
-            "suggestions": feedback.get("suggestions", []),
-            "ats_feedback": feedback.get("summary", ""),
-            "status": "success"
-        }
+        return FastJSONResponse(await run_in_threadpool(run_resume_analysis, content, extension))
     except Exception as e:
         print(f"ATS Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- Analytics Endpoints ---
+def parse_period_bounds(start, end, period):
+    """ISO dates/datetimes to epoch seconds for the history store."""
+    if period is not None and period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of {', '.join(PERIODS)}.")
+    try:
+        return [to_epoch(v) if v else None for v in (start, end)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be ISO dates, e.g. 2024-01-31.")
+
+@app.get("/analytics/scores")
+async def score_analytics(start: str = None, end: str = None, period: str = None, bins: int = 10):
+    if analysis_history is None:
+        raise HTTPException(status_code=503, detail="Analysis history is not enabled (set ANALYSIS_HISTORY_DIR).")
+    start_ts, end_ts = parse_period_bounds(start, end, period)
+    return await run_in_threadpool(analysis_history.score_distribution, start_ts, end_ts, max(1, min(bins, 100)), period)
+
+@app.get("/analytics/skills")
+async def skill_analytics(start: str = None, end: str = None, period: str = None, top: int = 20):
+    if analysis_history is None:
+        raise HTTPException(status_code=503, detail="Analysis history is not enabled (set ANALYSIS_HISTORY_DIR).")
+    start_ts, end_ts = parse_period_bounds(start, end, period)
+    return await run_in_threadpool(analysis_history.skill_frequencies, start_ts, end_ts, max(1, min(top, 200)), period)
+
 # --- Skills Endpoints ---
+@app.on_event("startup")
+async def start_quiz_pools():
+    await run_in_threadpool(prepare_question_pools)
+
+@app.on_event("shutdown")
+def stop_quiz_pools():
+    pool_builder.stop()
+
 class QuizRequest(BaseModel):
     skill: str
     num_questions: int = 10
 
-@app.post("/generate-quiz")
-async def generate_skill_quiz(request: QuizRequest):
+@app.post("/generate-quiz", response_model=QuizResponse)
+async def generate_skill_quiz(request: QuizRequest, lane: str = Depends(admission("interactive"))):
     try:
         if not request.skill or len(request.skill.strip()) == 0:
             raise HTTPException(status_code=400, detail="Skill name is required")
         
         quiz_data = generate_quiz(request.skill.strip(), request.num_questions)
-        return {
+        return FastJSONResponse({
             "status": "success",
             "skill": quiz_data['skill'],
             "total_questions": quiz_data['total_questions'],
             "passing_score": quiz_data['passing_score'],
             "questions": quiz_data['questions']
-        }
+        })
     except Exception as e:
         print(f"Quiz Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # --- Identity Verification Endpoints ---
-@app.post("/verify-face")
+@app.post("/verify-face", response_model=VerifyFaceResponse)
 async def verify_face(
     selfie: UploadFile = File(...),
-    references: List[UploadFile] = File(...)
+    references: List[UploadFile] = File(...),
+    lane: str = Depends(admission("identity"))
 ):
     if not FACE_RECOGNITION_AVAILABLE:
-        return {"verified": False, "error": "Face Recognition engine not installed on server."}
-        
+        return FastJSONResponse({"verified": False, "error": "Face Recognition engine not installed on server."})
+
+    budget = UploadBudget()
+    selfie_bytes = await read_upload(selfie, budget)
+    reference_bytes = [await read_upload(ref_file, budget) for ref_file in references]
+    for upload, data in zip([selfie] + references, [selfie_bytes] + reference_bytes):
+        if sniff_file_type(data) not in IMAGE_TYPES:
+            raise HTTPException(status_code=400, detail=f"'{upload.filename}' is not a supported image (JPEG, PNG, WebP, BMP).")
+
     try:
-        selfie_emb = get_embedding(await selfie.read())
+        selfie_emb, reason = await get_embedding(selfie_bytes, single_face=True)
         if selfie_emb is None:
-            return {"verified": False, "error": "No face detected in selfie image."}
+            return FastJSONResponse({"verified": False, "error": REASONS[reason], "reason": reason})
 
+        # References are often scans or ID photos, so only the selfie is quality gated
         best_score = 0.0
-        for ref_file in references:
-            ref_emb = get_embedding(await ref_file.read())
-            if ref_emb is not None:
-                score = np.dot(selfie_emb, ref_emb)
-                if score > best_score:
-                    best_score = score
-
-        return {
+        rejected_references = []
+        for index, ref_bytes in enumerate(reference_bytes):
+            ref_emb, ref_reason = await get_embedding(ref_bytes, quality_gate=False)
+            if ref_emb is None:
+                rejected_references.append({"index": index, "filename": references[index].filename, "reason": ref_reason})
+                continue
+            score = np.dot(selfie_emb, ref_emb)
+            if score > best_score:
+                best_score = score
+
+        return FastJSONResponse({
             "verified": float(best_score) >= 0.75,
-            "confidence": float(best_score)
-        }
+            "confidence": float(best_score),
+            "rejected_references": rejected_references
+        })
     except Exception as e:
         print(f"Identity Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
+    # Spawned pool workers (PDF, face) would otherwise re-run this whole script as
+    # __mp_main__; like a package's __main__.py, a "__main__" spec is left alone
+    import importlib.machinery
+    import sys
+    pass
     uvicorn.run(app, host="0.0.0.0", port=8000)
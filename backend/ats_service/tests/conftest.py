@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+# Tests import modules the way main.py does (`from utils.x import ...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the module-level quiz bank off disk and away from the LLM
+os.environ.setdefault("QUIZ_BANK_PATH", ":memory:")
+os.environ.setdefault("QUIZ_LLM_BACKEND", "none")
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    """
+    The analyzer's spaCy pipeline. Falls back to a blank English pipeline when
+    en_core_web_sm is not installed; tests using it do not assert on entities.
+    """
+    import spacy
+    from utils import analyzer
+
+    if analyzer.nlp is None:
+        monkeypatch.setattr(analyzer, "nlp", spacy.blank("en"))
+    return analyzer.nlp
+
+
+def make_pdf(lines, heading_size=14, body_size=10):
+    """One-column PDF; lines given as (text, is_heading)."""
+    import fitz
+
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 50
+    for text, is_heading in lines:
+        size = heading_size if is_heading else body_size
+        y += size + 6
+        if y > page.rect.height - 40:
+            page, y = doc.new_page(), 50 + size
+        page.insert_text((50, y), text, fontsize=size)
+    return doc.tobytes()
+
+
+def make_two_column_pdf(rows, gutter_x=300, size=10):
+    """
+    One page of (left, right) line pairs set side by side, as many resume
+    templates do; a None side leaves that column empty. A row given as a
+    single (text, font size) tuple is one line starting in the left column.
+    """
+    import fitz
+
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 50
+    for row in rows:
+        if isinstance(row[1], (int, float)):
+            text, row_size = row
+            y += row_size + 6
+            page.insert_text((50, y), text, fontsize=row_size)
+            continue
+        y += size + 6
+        left, right = row
+        if left:
+            page.insert_text((50, y), left, fontsize=size)
+        if right:
+            page.insert_text((gutter_x + 20, y), right, fontsize=size)
+    return doc.tobytes()
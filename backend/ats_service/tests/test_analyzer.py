@@ -0,0 +1,11 @@
+from utils.analyzer import resolve_header_hints
+
+
+def test_header_hints_use_sizes_shared_by_two_known_headings():
+    hints = {"Experience": 14, "Education": 14, "Volunteering": 14, "Skills": 18, "Senior Data Engineer": 18}
+    assert resolve_header_hints(hints) == {"Experience": "experience", "Education": "education", "Volunteering": None}
+
+
+def test_header_hints_without_a_repeated_heading_size_are_ignored():
+    assert resolve_header_hints({"Experience": 14, "Education": 13, "Jane Doe": 20}) is None
+    assert resolve_header_hints({}) is None
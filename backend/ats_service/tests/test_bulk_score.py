@@ -0,0 +1,70 @@
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from bulk_score import ParquetWriter
+
+
+def record(i):
+    return {"source": f"resume-{i}", "status": "success", "error": None, "resume_score": 70.0,
+            "skills_detected": ["python"], "sections_found": ["skills"], "strengths": [], "weaknesses": [],
+            "suggestions": [], "ats_feedback": "", "experience_years": 2.5, "elapsed_ms": 1.0}
+
+
+def test_resume_after_crash_keeps_every_column(tmp_path):
+    out = str(tmp_path / "results.parquet")
+    writer = ParquetWriter(out, batch_size=3)
+    writer.open(append=False)
+    for i in range(7):
+        writer.write(record(i))
+    # Crash: the last, unfinished batch is lost, finished part files survive
+
+    resumed = ParquetWriter(out, batch_size=3)
+    assert resumed.completed() == {f"resume-{i}" for i in range(6)}
+    resumed.open(append=True)
+    for i in range(6, 9):
+        resumed.write(record(i))
+    resumed.close()
+
+    table = pq.read_table(out)
+    assert sorted(table.column("source").to_pylist()) == [f"resume-{i}" for i in range(9)]
+    assert table.column("experience_years").to_pylist() == [2.5] * 9
+
+
+def make_archive(path, members):
+    import io
+    import tarfile
+
+    with tarfile.open(path, "w:gz") as tf:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tf.addfile(info, io.BytesIO(content))
+
+
+def test_tar_members_are_streamed_by_the_parent(tmp_path, monkeypatch):
+    import bulk_score
+
+    path = str(tmp_path / "resumes.tar.gz")
+    make_archive(path, {"a.pdf": b"first", "notes.txt": b"skip", "b/c.docx": b"second", "d.pdf": b"third"})
+    monkeypatch.setattr(bulk_score, "read_source", lambda source_id: pytest.fail("tar member reopened"))
+
+    tasks = list(bulk_score.iter_tasks(path, skip={f"{path}::d.pdf"}))
+    assert tasks == [(f"{path}::a.pdf", ".pdf", b"first"), (f"{path}::b/c.docx", ".docx", b"second")]
+
+
+def test_run_scores_every_archive_member(tmp_path):
+    import json
+    import bulk_score
+    from conftest import make_pdf
+
+    pdf = make_pdf([("Experience", True), ("Engineer at Acme, 2019 - 2021", False)])
+    path = str(tmp_path / "resumes.tar.gz")
+    make_archive(path, {f"r{i}.pdf": pdf for i in range(5)})
+    out = str(tmp_path / "results.jsonl")
+
+    bulk_score.run(path, out, workers=2, chunksize=2)
+    with open(out) as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(r["source"] for r in records) == [f"{path}::r{i}.pdf" for i in range(5)]
+    assert all("elapsed_ms" in r for r in records)
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+
+from utils.dedup import (
+    BANDS, NUM_PERM, ROWS, ResumeIndex, check_duplicate, load_resume_index, minhash, resume_id_for
+)
+
+RESUMES = [f"Experience\nEngineer number {i} at company {i * 7}\nSkills\nPython SQL Docker {i}" for i in range(6)]
+
+
+def test_saved_index_finds_duplicates_after_reload(tmp_path):
+    path = str(tmp_path / "resume_index")  # No .npz suffix
+    index = ResumeIndex()
+    for i, text in enumerate(RESUMES):
+        index.add(f"r{i}", minhash(text))
+    index.save(path)
+
+    reloaded = load_resume_index(path)
+    assert os.path.exists(path) and len(reloaded) == len(RESUMES)
+    assert reloaded.query(minhash(RESUMES[3])) == ("r3", 1.0)
+
+
+def test_workers_saving_to_one_file_merge(tmp_path):
+    path = str(tmp_path / "resume_index.npz")
+    first, second = ResumeIndex(), ResumeIndex()
+    for i, text in enumerate(RESUMES):
+        (first if i % 2 else second).add(f"r{i}", minhash(text))
+    first.save(path)
+    second.save(path)
+    first.save(path)
+
+    merged = load_resume_index(path)
+    assert len(merged) == len(RESUMES)
+    assert merged.query(minhash(RESUMES[1]))[0] == "r1"
+    assert merged.query(minhash(RESUMES[4]))[0] == "r4"
+
+
+def test_reupload_is_not_its_own_near_duplicate():
+    text = "\n".join(f"Built data pipeline {i} with Python and SQL for team {i}" for i in range(40))
+    index = ResumeIndex()
+    resume_id, signature, match = check_duplicate(text, index)
+    assert match is None
+    index.add(resume_id, signature)
+    assert check_duplicate(text, index)[2] is None
+
+    edited = text + "\nAwards\nEmployee of the month"
+    index.add(resume_id_for(edited), minhash(edited))
+    assert check_duplicate(text, index)[2]["resume_id"] == resume_id_for(edited)
+
+
+def test_sorted_and_pending_buckets_are_both_searched(monkeypatch):
+    monkeypatch.setattr(ResumeIndex, "MERGE_EVERY", 100)
+    rng = np.random.default_rng(0)
+    signatures = rng.integers(0, 2**32, size=(250, NUM_PERM), dtype=np.uint32)
+    index = ResumeIndex()
+    index.add_many([f"r{i}" for i in range(200)], signatures[:200])
+    for i in range(200, 250):
+        index.add(f"r{i}", signatures[i])
+    assert index._sorted_keys.shape == (200 * BANDS,)
+
+    for i in (3, 150, 240):  # Merged rows and rows still pending
+        near = signatures[i].copy()
+        near[:ROWS] += 1  # One band no longer matches
+        match_id, similarity = index.query(near)
+        assert match_id == f"r{i}" and similarity == 1 - ROWS / NUM_PERM
+    assert index.query(rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint32)) == (None, 0.0)
@@ -0,0 +1,81 @@
+import asyncio
+import importlib
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from utils import diagnostics
+
+
+@pytest.fixture
+def reload_diagnostics(monkeypatch):
+    def reload(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(diagnostics)
+    yield reload
+    monkeypatch.undo()
+    importlib.reload(diagnostics)
+
+
+def test_enabled_without_token_stays_disabled(reload_diagnostics):
+    module = reload_diagnostics(DIAGNOSTICS_ENABLED="1", DIAGNOSTICS_TOKEN="")
+    assert not module.DIAGNOSTICS_ENABLED
+    with pytest.raises(HTTPException):
+        module._authorize("")
+
+
+def test_token_is_required(reload_diagnostics):
+    module = reload_diagnostics(DIAGNOSTICS_ENABLED="1", DIAGNOSTICS_TOKEN="secret")
+    assert module.DIAGNOSTICS_ENABLED
+    module._authorize("secret")
+    with pytest.raises(HTTPException) as e:
+        module._authorize("guess")
+    assert e.value.status_code == 403
+
+
+def test_peak_rss_fallback_units(monkeypatch):
+    def no_procfs(*args):
+        raise OSError("no /proc")
+
+    monkeypatch.setattr(diagnostics, "open", no_procfs, raising=False)
+    usage = type("Usage", (), {"ru_maxrss": 200 * 1024 * 1024})()
+    monkeypatch.setattr(diagnostics.resource, "getrusage", lambda who: usage)
+    monkeypatch.setattr(diagnostics.sys, "platform", "darwin")
+    assert diagnostics.rss_mb() == 200
+    usage.ru_maxrss = 200 * 1024
+    monkeypatch.setattr(diagnostics.sys, "platform", "linux")
+    assert diagnostics.rss_mb() == 200
+
+
+def test_watchdog_stays_off_without_a_supervisor(monkeypatch):
+    kills = []
+    monkeypatch.setattr(diagnostics.os, "kill", lambda pid, sig: kills.append(sig))
+    watchdog = diagnostics.WorkerWatchdog(max_requests=1, max_rss_mb=1, jitter=0, supervised=False)
+    assert not watchdog.enabled
+    watchdog.request_started()
+    watchdog.request_finished()
+    assert kills == [] and not watchdog.recycling
+
+    watchdog = diagnostics.WorkerWatchdog(max_requests=1, jitter=0, supervised=True)
+    watchdog.request_started()
+    watchdog.request_finished()
+    assert kills == [diagnostics.signal.SIGTERM] and watchdog.recycling
+
+
+def test_memory_is_released_off_the_event_loop(monkeypatch):
+    rss = [900.0]
+    threads = []
+
+    def release():
+        threads.append(threading.current_thread())
+        rss[0] = 300.0
+
+    monkeypatch.setattr(diagnostics, "rss_mb", lambda: rss[0])
+    monkeypatch.setattr(diagnostics, "release_free_memory", release)
+    monkeypatch.setattr(diagnostics.os, "kill", lambda pid, sig: pytest.fail("recycled after a successful trim"))
+    watchdog = diagnostics.WorkerWatchdog(max_rss_mb=500, supervised=True)
+    asyncio.run(watchdog.check_memory())
+    assert threads and threads[0] is not threading.main_thread()
+    assert not watchdog.recycling
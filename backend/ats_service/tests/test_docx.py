@@ -0,0 +1,75 @@
+import io
+import zipfile
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from utils.extractor import extract_resume_text, extract_text_from_docx_fast, iter_docx_part_lines
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def build_docx():
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | Data Engineer"
+    doc.add_heading("Experience", level=1)
+    run = doc.add_paragraph().add_run("Acme Corp")
+    run.add_tab()
+    run.add_text("2019 - 2023")
+    run.add_break()
+    run.add_text("Built pipelines")
+    table = doc.add_table(rows=2, cols=2)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"skill {r}{c}"
+    doc.add_paragraph("Education")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_fast_extraction_keeps_headers_tables_tabs_and_breaks():
+    lines = extract_text_from_docx_fast(build_docx()).split("\n")
+    assert lines[0] == "Jane Doe | Data Engineer"
+    assert lines[1:5] == ["Experience", "Acme Corp\t2019 - 2023", "Built pipelines", "skill 00"]
+    assert lines[5:] == ["skill 01", "skill 10", "skill 11", "Education"]
+
+
+def test_text_box_fallback_copy_is_skipped():
+    xml = f"""<w:document {W} {MC}><w:body>
+      <w:p><w:r><w:t>Summary</w:t></w:r><w:r><mc:AlternateContent>
+        <mc:Choice><w:txbxContent><w:p><w:r><w:t>Text box</w:t></w:r></w:p></w:txbxContent></mc:Choice>
+        <mc:Fallback><w:txbxContent><w:p><w:r><w:t>Text box</w:t></w:r></w:p></w:txbxContent></mc:Fallback>
+      </mc:AlternateContent></w:r></w:p>
+      <w:p><w:r><w:t>After</w:t></w:r></w:p>
+    </w:body></w:document>"""
+    assert list(iter_docx_part_lines(io.BytesIO(xml.encode()))) == ["Text box", "Summary", "After"]
+
+
+def test_long_tables_are_released_while_streaming():
+    rows = "".join(f"<w:tr><w:tc><w:p><w:r><w:t>row {i}</w:t></w:r></w:p></w:tc></w:tr>" for i in range(50))
+    xml = f"<w:document {W}><w:body><w:tbl>{rows}</w:tbl><w:p><w:r><w:t>end</w:t></w:r></w:p></w:body></w:document>"
+    lines = list(iter_docx_part_lines(io.BytesIO(xml.encode())))
+    assert lines == [f"row {i}" for i in range(50)] + ["end"]
+
+
+def rename_main_part(data):
+    """A valid DOCX whose main part is not at word/document.xml (the fast path assumes it is)."""
+    source, out = zipfile.ZipFile(io.BytesIO(data)), io.BytesIO()
+    with zipfile.ZipFile(out, "w") as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename in ("_rels/.rels", "[Content_Types].xml"):
+                content = content.replace(b"word/document.xml", b"word/main.xml")
+            name = "word/main.xml" if item.filename == "word/document.xml" else item.filename
+            if name == "word/_rels/document.xml.rels":
+                name = "word/_rels/main.xml.rels"
+            target.writestr(name, content)
+    return out.getvalue()
+
+
+def test_falls_back_to_python_docx():
+    text = extract_resume_text(rename_main_part(build_docx()), ".docx")
+    assert text.split("\n")[:3] == ["Experience", "Acme Corp\t2019 - 2023", "Built pipelines"]
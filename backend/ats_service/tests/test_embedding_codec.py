@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from utils.embedding_codec import EmbeddingGallery
+
+
+def unit(rng, dim=512):
+    v = rng.standard_normal(dim).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+@pytest.mark.parametrize("codec", ["float32", "float16", "int8"])
+def test_best_match_restricted_to_owner(codec):
+    rng = np.random.default_rng(0)
+    gallery = EmbeddingGallery(codec)
+    query = unit(rng)
+    gallery.add("alice", query)
+    gallery.add("bob", unit(rng))
+
+    assert gallery.best_match(query)[0] == "alice"
+    owner, score = gallery.best_match(query, owner_id="bob")
+    assert owner == "bob" and score < 0.5
+
+
+def test_best_match_for_owner_without_vectors():
+    rng = np.random.default_rng(1)
+    gallery = EmbeddingGallery()
+    assert gallery.best_match(unit(rng)) == (None, 0.0)
+    gallery.add("alice", unit(rng))
+    assert gallery.best_match(unit(rng), owner_id="carol") == (None, 0.0)
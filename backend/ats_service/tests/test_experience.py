@@ -0,0 +1,34 @@
+import time
+
+import pytest
+
+from utils.experience import experience_months, parse_ranges
+from utils.preprocessor import preprocess_text
+
+NOW = time.strptime("2024-06", "%Y-%m")
+
+
+def test_year_and_month_ranges():
+    assert experience_months(["Engineer, Acme (2017-2020)"], NOW) == 36
+    assert experience_months(["Engineer 2019 - 2019"], NOW) == 12
+    assert experience_months(["Jan 2019 - Mar 2019", "Feb 2019 to Apr 2019"], NOW) == 4
+    assert experience_months(["03/2023 - Present"], NOW) == 16
+
+
+def test_reversed_ranges_are_rejected():
+    assert parse_ranges(["Engineer 2020 - 2018"], NOW) == []
+    assert parse_ranges(["Engineer Mar 2020 - Jan 2018"], NOW) == []
+    assert parse_ranges(["Engineer Mar 2020 - Jan 2020"], NOW) == []
+
+
+def test_ranges_survive_phone_scrubbing():
+    text = preprocess_text("Data Engineer, Globex\n2015 - 2018\nAnalyst 2012-2014 2014-2015\nCall +1 555 123 4567")
+    assert text.split("\n")[1:3] == ["2015 - 2018", "Analyst 2012-2014 2014-2015"]
+    assert experience_months(text.split("\n"), NOW) == 36 + 24 + 12
+
+
+@pytest.mark.parametrize("phone", [
+    "+1 555 123 4567", "(555) 123-4567", "555.123.4567", "+92 300 1234567", "0300-1234567", "+44 20 7946 0958",
+])
+def test_phone_numbers_are_scrubbed(phone):
+    assert preprocess_text(f"Phone: {phone}\nLahore") == "Phone: [PHONE_REMOVED]\nLahore"
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+pytest.importorskip("insightface")
+
+from utils import face_engine
+
+
+class FakeModel:
+    def __init__(self, model_file):
+        self.model_file = model_file
+        self.prepared = None
+
+    def prepare(self, **kwargs):
+        self.prepared = kwargs
+
+
+class FakeFaceAnalysis:
+    def __init__(self, name, providers, allowed_modules):
+        self.name, self.allowed_modules = name, allowed_modules
+        self.models = {"detection": FakeModel("det.onnx"),
+                       "recognition": FakeModel(os.path.join("models", name, "w600k_r50.onnx"))}
+
+    def prepare(self, ctx_id, det_size):
+        self.det_size = det_size
+
+
+@pytest.fixture
+def fake_insightface(monkeypatch):
+    import insightface.model_zoo
+
+    quantized = []
+    monkeypatch.setattr(face_engine, "FaceAnalysis", FakeFaceAnalysis)
+    monkeypatch.setattr(insightface.model_zoo, "get_model", lambda path, providers: FakeModel(path))
+    monkeypatch.setattr(face_engine, "quantize_recognition_model",
+                        lambda path: quantized.append(path) or "cache/int8.onnx")
+    return quantized
+
+
+def test_loads_only_detection_and_recognition(fake_insightface):
+    analyzer = face_engine.load_face_analyzer(pack="buffalo_s", int8=False, det_size=320)
+    assert analyzer.name == "buffalo_s"
+    assert analyzer.allowed_modules == ["detection", "recognition"]
+    assert analyzer.det_size == (320, 320)
+    assert analyzer.models["recognition"].model_file.endswith("w600k_r50.onnx")
+    assert fake_insightface == []
+
+
+def test_int8_swaps_in_the_quantized_recognition_model(fake_insightface):
+    analyzer = face_engine.load_face_analyzer(pack="buffalo_l", int8=True)
+    assert fake_insightface == [os.path.join("models", "buffalo_l", "w600k_r50.onnx")]
+    recognition = analyzer.models["recognition"]
+    assert recognition.model_file == "cache/int8.onnx"
+    assert recognition.prepared == {"ctx_id": 0}
+
+
+def test_quantized_model_is_written_to_the_cache_dir(tmp_path, monkeypatch):
+    quantization = pytest.importorskip("onnxruntime.quantization")
+    model_dir = tmp_path / "models" / "buffalo_l"
+    model_dir.mkdir(parents=True)
+    model_file = model_dir / "w600k_r50.onnx"
+    model_file.write_bytes(b"onnx")
+    calls = []
+    monkeypatch.setattr(quantization, "quantize_dynamic",
+                        lambda src, dst, weight_type: calls.append(src) or open(dst, "wb").close())
+
+    cache_dir = tmp_path / "cache"
+    path = face_engine.quantize_recognition_model(str(model_file), cache_dir=str(cache_dir))
+    assert path == str(cache_dir / "buffalo_l-w600k_r50.int8.onnx")
+    assert os.listdir(model_dir) == ["w600k_r50.onnx"]
+    assert face_engine.quantize_recognition_model(str(model_file), cache_dir=str(cache_dir)) == path
+    assert len(calls) == 1
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from utils import face_pool
+from utils.face_quality import fit_image
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A one-slot pool whose workers are threads reading the real shared-memory ring."""
+    monkeypatch.setattr(face_pool, "ProcessPoolExecutor",
+                        lambda max_workers, **_: ThreadPoolExecutor(max_workers))
+    pool = face_pool.FaceInferencePool(workers=1, slots=1, max_side=64)
+    pool.release = threading.Event()
+    pool.release.set()
+
+    def embed_slot(offset, shape, single_face, quality_gate):
+        pool.release.wait(5)
+        img = np.ndarray(shape, dtype=np.uint8, buffer=pool._shm.buf, offset=offset)
+        return float(img.mean()), None, {}
+
+    monkeypatch.setattr(face_pool, "_embed_slot", embed_slot)
+    yield pool
+    pool.release.set()
+    pool.close()
+
+
+def test_frames_go_through_shared_memory_downscaled(pool):
+    img = np.full((256, 128, 3), 7, dtype=np.uint8)
+    assert fit_image(img, 64).shape == (64, 32, 3)
+    assert asyncio.run(pool.embed(img)) == (7.0, None, {})
+
+
+def test_cancelled_request_releases_slot_when_worker_finishes(pool):
+    async def scenario():
+        pool.release.clear()
+        first = asyncio.create_task(pool.embed(np.full((8, 8, 3), 1, dtype=np.uint8)))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.sleep(0.05)
+        # The worker may still be reading the slot, so it stays taken
+        assert pool._free.qsize() == 0
+        second = asyncio.create_task(pool.embed(np.full((8, 8, 3), 2, dtype=np.uint8)))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+        pool.release.set()
+        result = await asyncio.wait_for(second, 5)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    assert asyncio.run(scenario()) == (2.0, None, {})
+    assert pool._free.qsize() == 1
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from utils.face_quality import MIN_FACE_PIXELS, check_image_quality, select_face
+
+
+def image(values, size=(480, 640)):
+    return np.broadcast_to(np.asarray(values, dtype=np.uint8)[..., None], size + (3,)).copy()
+
+
+def textured(size=(480, 640), low=60, high=200, seed=0):
+    return image(np.random.default_rng(seed).integers(low, high, size), size)
+
+
+def test_sharp_well_exposed_image_passes():
+    assert check_image_quality(textured()) is None
+    assert check_image_quality(textured((2000, 3000))) is None  # Checked on a downscaled copy
+
+
+@pytest.mark.parametrize("img, reason", [
+    (image(np.full((480, 640), 15)), "too_dark"),
+    (image(np.full((480, 640), 245)), "too_bright"),
+    (image(np.tile(np.linspace(80, 170, 640), (480, 1))), "too_blurry"),
+])
+def test_bad_images_are_rejected(img, reason):
+    assert check_image_quality(img) == reason
+
+
+def test_mostly_clipped_image_is_too_dark():
+    img = textured()
+    img[:300] = 0
+    assert check_image_quality(img) == "too_dark"
+
+
+def box(x, y, size, score=0.9):
+    return [x, y, x + size, y + size, score]
+
+
+def test_select_face_picks_the_largest_face():
+    bboxes = np.array([box(10, 10, 80), box(200, 50, 150), box(400, 40, 20)], dtype=np.float32)
+    assert select_face(bboxes) == (1, None)
+    assert select_face(bboxes, single_face=True) == (1, None)  # Other faces are far smaller
+
+
+def test_select_face_rejects_missing_small_and_multiple_faces():
+    assert select_face(None) == (None, "no_face")
+    assert select_face(np.empty((0, 5), dtype=np.float32)) == (None, "no_face")
+
+    small = np.array([box(10, 10, MIN_FACE_PIXELS - 1)], dtype=np.float32)
+    assert select_face(small) == (None, "face_too_small")
+    assert select_face(small, min_face_pixels=0) == (0, None)
+
+    two_people = np.array([box(10, 10, 150), box(300, 10, 120)], dtype=np.float32)
+    assert select_face(two_people, single_face=True) == (None, "multiple_faces")
+    assert select_face(two_people) == (0, None)
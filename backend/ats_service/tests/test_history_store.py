@@ -0,0 +1,63 @@
+import numpy as np
+
+from utils.history_store import AnalysisHistory
+from utils.scoring import FEATURES
+
+FEATURE_ROW = [0] * len(FEATURES)
+
+
+def test_two_workers_share_one_directory(tmp_path):
+    path = str(tmp_path / "history")
+    first, second = AnalysisHistory(path, flush_every=2), AnalysisHistory(path, flush_every=2)
+    first.append(70, FEATURE_ROW, ["python", "docker"], "a1", timestamp=1000)
+    second.append(60, FEATURE_ROW, ["java", "python"], "b1", timestamp=1005)
+    second.append(65, FEATURE_ROW, ["java"], "b2", timestamp=1010)   # Second flushes first
+    first.append(80, FEATURE_ROW, ["docker", "sql"], "a2", timestamp=1001)
+
+    for history in (first, second, AnalysisHistory(path)):
+        result = history.skill_frequencies()
+        assert result["count"] == 4
+        assert {s["skill"]: s["resumes"] for s in result["skills"]} == {"python": 2, "java": 2, "docker": 2, "sql": 1}
+        # Records keep their own timestamps although second's flush landed first
+        assert sorted(np.asarray(history._column("timestamp"))) == [1000, 1001, 1005, 1010]
+        assert history.score_distribution(start=1010)["count"] == 1
+        assert history.score_distribution(start=1000, end=1002)["p50"] == 75
+        assert {s["skill"] for s in history.skill_frequencies(end=1002)["skills"]} == {"python", "docker", "sql"}
+
+
+def test_periods_bucket_interleaved_flushes_by_true_time(tmp_path):
+    path = str(tmp_path / "history")
+    day = 86400
+    first, second = AnalysisHistory(path, flush_every=3), AnalysisHistory(path, flush_every=3)
+    for i in range(3):  # Day 2, flushed first
+        second.append(90, FEATURE_ROW, ["go"], f"b{i}", timestamp=2 * day + i)
+    for i in range(3):  # Day 0 and day 1, buffered longer
+        first.append(50, FEATURE_ROW, ["python"], f"a{i}", timestamp=i * day // 2)
+
+    reader = AnalysisHistory(path)
+    scores = reader.score_distribution(period="day")["periods"]
+    assert [(p["period"], p["count"], p["mean"]) for p in scores] == [
+        ("1970-01-01", 2, 50.0), ("1970-01-02", 1, 50.0), ("1970-01-03", 3, 90.0)]
+    skills = reader.skill_frequencies(period="day")["periods"]
+    assert [p["skills"] for p in skills] == [{"python": 2, "go": 0}, {"python": 1, "go": 0}, {"python": 0, "go": 3}]
+    assert reader.skill_frequencies(start=day, end=2 * day + 1)["count"] == 2
+
+    first.append(70, FEATURE_ROW, ["python"], "a3", timestamp=day + 5)
+    first.flush()
+    assert reader.score_distribution(start=day, end=2 * day)["count"] == 2  # Merged into the index
+
+
+def test_interrupted_flush_is_repaired(tmp_path):
+    path = str(tmp_path / "history")
+    history = AnalysisHistory(path, flush_every=1)
+    history.append(70, FEATURE_ROW, ["python"], "a1", timestamp=1000)
+    with open(history._file("score"), "ab") as f:
+        f.write(b"\0" * 4)   # Column written, offsets not yet
+    with open(f"{path}/terms.txt", "a") as f:
+        f.write("half-written")
+
+    reopened = AnalysisHistory(path, flush_every=1)
+    reopened.append(50, FEATURE_ROW, ["rust"], "a2", timestamp=1001)
+    assert reopened.size == 2
+    assert reopened.terms == ["python", "rust"]
+    assert reopened.skill_frequencies()["count"] == 2
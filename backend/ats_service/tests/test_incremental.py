@@ -0,0 +1,76 @@
+import pytest
+
+from conftest import make_pdf
+from utils.analyzer import extract_information
+from utils.extractor import extract_resume_layout
+from utils.incremental import ChunkCache, extract_information_incremental, split_chunks
+from utils.preprocessor import preprocess_text
+
+RESUME = [
+    ("Jane Doe", True),
+    ("Summary", True),
+    ("Data engineer with eight years of experience building pipelines.", False),
+    ("Experience", True),
+    ("Senior Data Engineer, Acme Corp", False),
+    ("Jan 2019 - Present", False),
+    ("- Developed streaming pipelines in Python and Kafka", False),
+    ("- Managed a team of four engineers", False),
+    ("- Reduced warehouse costs by 30% with Spark", False),
+    ("Data Engineer, Globex", False),
+    ("2015 - 2018", False),
+    ("- Built ETL jobs with Airflow and SQL", False),
+    ("- Implemented CI with Jenkins and Docker", False),
+    ("- Created dashboards in Tableau", False),
+    ("Education", True),
+    ("B.Sc. Computer Science, University of Lahore, 2015", False),
+    ("Skills", True),
+    ("Python, SQL, Spark, Kafka, Docker, AWS", False),
+    ("Projects", True),
+    ("- Open-source Airflow plugin for data quality checks", False),
+]
+
+
+def pdf_text(lines):
+    text, hints = extract_resume_layout(make_pdf(lines), ".pdf", parallel=False)
+    return preprocess_text(text), hints
+
+
+def test_pdf_text_is_split_at_headers_and_line_windows():
+    text, hints = pdf_text(RESUME)
+    assert "\n\n" not in text  # No paragraph breaks to split on
+    chunks = split_chunks(text, hints, max_lines=4)
+    assert len(chunks) > 5
+    assert all(len(chunk.split("\n")) <= 4 for chunk in chunks)
+    starts = {chunk.split("\n")[0] for chunk in chunks}
+    assert {"Summary", "Experience", "Education", "Skills", "Projects"} <= starts
+
+
+@pytest.mark.usefixtures("nlp")
+def test_one_line_pdf_edit_reuses_every_other_chunk():
+    cache = ChunkCache()
+    text, hints = pdf_text(RESUME)
+    extract_information_incremental(text, cache=cache, header_hints=hints)
+    chunk_count = len(split_chunks(text, hints))
+    assert cache.stats()["misses"] == chunk_count
+
+    edited = list(RESUME)
+    edited[8] = ("- Reduced warehouse costs by 45% with Spark", False)
+    edited_text, edited_hints = pdf_text(edited)
+    before = cache.stats()
+    extract_information_incremental(edited_text, cache=cache, header_hints=edited_hints)
+    after = cache.stats()
+
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == chunk_count - 1
+
+
+@pytest.mark.usefixtures("nlp")
+def test_incremental_sections_match_full_analysis():
+    text, hints = pdf_text(RESUME)
+    assert "\n2015 - 2018\n" in text  # Not taken for a phone number
+    full = extract_information(text, hints)
+    incremental = extract_information_incremental(text, cache=ChunkCache(), header_hints=hints)
+    for section in ("education", "experience", "projects", "certifications"):
+        assert incremental[section] == full[section]
+    assert sorted(incremental["skills"]) == sorted(full["skills"])
+    assert incremental["experience_months"] == full["experience_months"] >= 36 + 60
@@ -0,0 +1,27 @@
+from conftest import make_two_column_pdf
+from utils.extractor import extract_pdf_layout
+
+LEFT = ["Contact", "Lahore, Pakistan", "Skills", "Python", "SQL", "Docker"]
+RIGHT = ["Experience", "Senior Data Engineer, Acme", "Built streaming pipelines",
+         "Data Engineer, Globex", "Built ETL jobs", "Created dashboards"]
+
+
+def layout_lines(rows):
+    text, _ = extract_pdf_layout(make_two_column_pdf(rows), parallel=False)
+    return text.split("\n")
+
+
+def test_columns_are_read_one_after_the_other():
+    assert layout_lines(list(zip(LEFT, RIGHT))) == LEFT + RIGHT
+
+
+def test_large_title_crossing_the_gutter_keeps_the_columns():
+    # 18pt name and title on one line, reaching well past the gutter
+    rows = [("JANE DOE  Senior Data Engineer", 18)] + list(zip(LEFT, RIGHT))
+    assert layout_lines(rows) == ["JANE DOE Senior Data Engineer"] + LEFT + RIGHT
+
+
+def test_crossing_line_mid_page_splits_the_band():
+    banner = "Certified Cloud Architect, AWS and GCP (2021), Kubernetes"
+    rows = list(zip(LEFT[:3], RIGHT[:3])) + [(banner, 12)] + list(zip(LEFT[3:], RIGHT[3:]))
+    assert layout_lines(rows) == LEFT[:3] + RIGHT[:3] + [banner] + LEFT[3:] + RIGHT[3:]
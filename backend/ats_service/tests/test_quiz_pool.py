@@ -0,0 +1,54 @@
+from utils.quiz_pool import PoolBuilder, QuestionBank, StubQuestionSource, validate_question
+
+VALID = {"question": "What does a Python list comprehension return?", "options": ["A list", "A set", "A dict", "None"],
+         "answer": "0"}
+
+
+def test_validation_rejects_malformed_questions():
+    assert validate_question(VALID) == dict(VALID, answer=0)
+    assert validate_question(dict(VALID, options=["A", "B", "C"])) is None
+    assert validate_question(dict(VALID, options=["A", "a", "B", "C"])) is None
+    assert validate_question(dict(VALID, answer=4)) is None
+    assert validate_question(dict(VALID, answer=True)) is None
+    assert validate_question(dict(VALID, question="Short?")) is None
+    assert validate_question("not a question") is None
+
+
+def test_duplicates_are_dropped_and_pools_survive_reload(tmp_path):
+    path = str(tmp_path / "bank.db")
+    bank = QuestionBank(path)
+    reworded = dict(VALID, question="  what does a python LIST comprehension return ")
+    assert bank.add("python", "Python", [VALID, reworded, dict(VALID, answer=9)], source="test") == 1
+    assert bank.add("python", "Python", StubQuestionSource().generate("Python", 5), source="stub") == 5
+
+    reloaded = QuestionBank(path)
+    assert reloaded.stats() == {"python": 6}
+    assert reloaded.add("python", "Python", [VALID], source="test") == 0
+    assert all(q["skill"] == "Python" for q in reloaded.sample("python", 10))
+
+
+def test_refill_runs_only_below_the_watermark():
+    bank = QuestionBank(":memory:")
+    builder = PoolBuilder(bank, StubQuestionSource(), target=20, low_watermark=10, batch_size=5)
+    bank.add("docker", "Docker", StubQuestionSource(seed=1).generate("Docker", 12), source="stub")
+    assert not builder.request_refill("docker", "Docker")
+
+    assert builder.request_refill("kubernetes", "Kubernetes")
+    assert not builder.request_refill("kubernetes", "Kubernetes")  # Already pending
+    builder.stop()
+    assert bank.size("kubernetes") >= 20
+
+
+def test_unknown_skills_wait_for_demand_and_budget_caps_generation():
+    bank = QuestionBank(":memory:")
+    builder = PoolBuilder(bank, StubQuestionSource(), target=20, low_watermark=10, batch_size=5,
+                          min_requests=3, generations_per_hour=3)
+    builder._thread = object()  # Keep refills queued instead of running them
+    assert not builder.request_refill("cobol", "COBOL")
+    assert not builder.request_refill("cobol", "COBOL")
+    assert builder.request_refill("cobol", "COBOL")
+    assert builder.request_refill("data structures", "Data Structures", known=True)
+
+    builder.refill("cobol", "COBOL")
+    assert bank.size("cobol") == 15  # Budget of 3 batches spent before the target of 20
+    assert not builder.request_refill("rust", "Rust")
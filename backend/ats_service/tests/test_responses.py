@@ -0,0 +1,103 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from utils import responses
+from utils.responses import CompressionMiddleware, negotiate_encoding
+
+BIG = {"items": [f"skill-{i}" for i in range(200)]}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0.0, deflate", None),
+    ("GZIP; q=0.5", "gzip"),
+    ("*", "gzip"),
+    ("*;q=0", None),
+    ("*, gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+    ("gzip;q=bogus", None),
+])
+def test_negotiate_encoding_without_brotli(monkeypatch, header, expected):
+    monkeypatch.setattr(responses, "brotli", None)
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*, br;q=0", "gzip"),
+])
+def test_negotiate_encoding_prefers_brotli(header, expected):
+    pytest.importorskip("brotli")
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+    app = FastAPI(default_response_class=responses.FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/big")
+    def big():
+        return BIG
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b'{"chunk": 1}' * 100, b'{"chunk": 2}' * 100]), media_type="application/json")
+
+    @app.get("/encoded")
+    def encoded():
+        return PlainTextResponse(gzip.compress(b"x" * 4096), headers={"Content-Encoding": "gzip"})
+
+    @app.get("/binary")
+    def binary():
+        return PlainTextResponse(b"\0" * 4096, media_type="application/octet-stream")
+
+    return TestClient(app)
+
+
+def get(client, path, accept="gzip"):
+    # Raw bytes and headers as sent, without httpx decoding the body
+    with client.stream("GET", path, headers={"Accept-Encoding": accept}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_compressed_with_vary(client):
+    response, body = get(client, "/big")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-length"] == str(len(body))
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert responses.dumps(BIG) == gzip.decompress(body)
+
+
+def test_small_bodies_and_unwilling_clients_pass_through(client):
+    response, body = get(client, "/small")
+    assert "content-encoding" not in response.headers and body == b'{"ok":true}'
+    response, body = get(client, "/big", accept="identity")
+    assert "content-encoding" not in response.headers and body == responses.dumps(BIG)
+
+
+def test_streaming_responses_pass_through(client):
+    response, body = get(client, "/stream")
+    assert "content-encoding" not in response.headers
+    assert body == b'{"chunk": 1}' * 100 + b'{"chunk": 2}' * 100
+
+
+def test_existing_encoding_and_binary_types_are_left_alone(client):
+    response, body = get(client, "/encoded")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == b"x" * 4096  # Not compressed twice
+    response, body = get(client, "/binary")
+    assert "content-encoding" not in response.headers and body == b"\0" * 4096
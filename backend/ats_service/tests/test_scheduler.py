@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from utils import scheduler
+from utils.scheduler import LaneScheduler, MemoryRateLimitStore, admission, client_identity, parse_api_keys
+
+
+def make_request(host="10.0.0.1", headers=()):
+    headers = [(name.lower().encode(), value.encode()) for name, value in headers]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "query_string": b"",
+                    "client": (host, 1234)})
+
+
+def admit(request, default_lane="interactive"):
+    async def run():
+        dependency = admission(default_lane)(request)
+        lane = await dependency.__anext__()
+        await dependency.aclose()
+        return lane
+    return asyncio.run(run())
+
+
+def test_client_supplied_ids_do_not_get_fresh_buckets(monkeypatch):
+    monkeypatch.setattr(scheduler, "rate_limit_store", MemoryRateLimitStore())
+    burst = scheduler.LANES["interactive"]["burst"]
+    for i in range(burst):
+        admit(make_request(headers=[("X-Client-Id", f"client-{i}")]))
+    with pytest.raises(scheduler.HTTPException) as e:
+        admit(make_request(headers=[("X-Client-Id", "client-new")]))
+    assert e.value.status_code == 429
+    assert admit(make_request(host="10.0.0.2")) == "interactive"
+
+
+def test_lane_comes_from_server_side_key_mapping(monkeypatch):
+    monkeypatch.setattr(scheduler, "rate_limit_store", MemoryRateLimitStore())
+    keys = parse_api_keys("batch-key:bulk, partner-key:identity, other:nope")
+    assert keys == {"batch-key": "bulk", "partner-key": "identity"}
+    monkeypatch.setattr(scheduler, "API_KEY_LANES", keys)
+
+    assert admit(make_request(headers=[("X-Priority", "bulk")])) == "interactive"
+    assert admit(make_request(headers=[("X-Api-Key", "unknown")])) == "interactive"
+    assert admit(make_request(headers=[("X-Api-Key", "batch-key")])) == "bulk"
+    identity, lane = client_identity(make_request(host="10.0.0.9", headers=[("X-Api-Key", "batch-key")]), keys)
+    assert identity.startswith("key:") and "batch-key" not in identity and lane == "bulk"
+
+
+def take(store, key, rate, burst):
+    return asyncio.run(store.take(key, rate, burst))
+
+
+def test_refilled_buckets_are_evicted(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(scheduler.time, "monotonic", lambda: clock[0])
+    store = MemoryRateLimitStore(sweep_seconds=0)
+    for i in range(100):
+        take(store, f"interactive:ip:{i}", 2.0, 10)  # Full again after 0.5s
+    take(store, "interactive:ip:busy", 2.0, 1)
+    assert len(store) == 101
+
+    clock[0] += 0.4
+    allowed, retry_after = take(store, "interactive:ip:busy", 2.0, 1)
+    assert not allowed and abs(retry_after - 0.1) < 1e-9
+    assert len(store) == 101
+    clock[0] += 0.2
+    assert take(store, "interactive:ip:busy", 2.0, 1) == (True, 0.0)
+    assert len(store) == 1
+
+
+def lanes(max_queue=64):
+    return {lane: dict(config, max_queue=max_queue) for lane, config in scheduler.LANES.items()}
+
+
+def test_contended_slots_are_shared_by_weight():
+    async def run():
+        sched = LaneScheduler(lanes(), concurrency=1, max_wait=5)
+        await sched.acquire("bulk")  # Hold the only slot while every lane queues up
+        order = []
+
+        async def request(lane):
+            await sched.acquire(lane)
+            order.append(lane)
+            await asyncio.sleep(0)
+            sched.release(lane)
+
+        tasks = [asyncio.create_task(request(lane)) for lane in ("interactive", "identity", "bulk") for _ in range(26)]
+        await asyncio.sleep(0)
+        sched.release("bulk")
+        await asyncio.gather(*tasks)
+        return order
+
+    grants = ["bulk"] + asyncio.run(run())  # The request holding the slot counts as a bulk grant
+    first = grants[:26]
+    assert (first.count("interactive"), first.count("identity"), first.count("bulk")) == (16, 8, 2)
+
+
+def test_full_queue_is_rejected_with_503():
+    async def main():
+        sched = LaneScheduler(lanes(max_queue=1), concurrency=1, max_wait=5)
+        await sched.acquire("interactive")
+        queued = asyncio.create_task(sched.acquire("bulk"))
+        await asyncio.sleep(0)
+        with pytest.raises(scheduler.HTTPException) as e:
+            await sched.acquire("bulk")
+        assert e.value.status_code == 503 and e.value.headers["Retry-After"] == "1"
+        assert sched.stats()["lanes"]["bulk"]["rejected_queue_full"] == 1
+        sched.release("interactive")
+        await queued
+        assert sched.stats()["lanes"]["bulk"]["active"] == 1
+
+    asyncio.run(main())
+
+
+def test_timed_out_waiters_give_back_their_place():
+    async def run():
+        sched = LaneScheduler(lanes(), concurrency=1, max_wait=0.05)
+        await sched.acquire("interactive")
+        with pytest.raises(scheduler.HTTPException) as e:
+            await sched.acquire("bulk")
+        assert e.value.status_code == 503
+        stats = sched.stats()
+        assert stats["lanes"]["bulk"]["rejected_timeout"] == 1
+        assert stats["lanes"]["bulk"]["queue_depth"] == 0
+
+        sched.release("interactive")
+        assert sched.stats()["active"] == 0
+        await asyncio.wait_for(sched.acquire("bulk"), 1)  # The stale queue entry holds no slot
+        assert sched.stats()["active"] == 1
+
+    asyncio.run(run())
+
+
+def test_slot_granted_as_waiter_gives_up_is_released():
+    async def run():
+        sched = LaneScheduler(lanes(), concurrency=1, max_wait=5)
+        await sched.acquire("interactive")
+        waiter = asyncio.create_task(sched.acquire("bulk"))
+        await asyncio.sleep(0)
+        waiter.cancel()  # Cancelled, but not yet resumed...
+        sched.release("interactive")  # ...when its queued future is granted the slot
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert sched.stats()["active"] == 0
+        await asyncio.wait_for(sched.acquire("bulk"), 1)
+
+    asyncio.run(run())
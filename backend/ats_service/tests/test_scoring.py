@@ -0,0 +1,49 @@
+import random
+
+from utils.analyzer import calculate_ats_score
+from utils.scoring import ACTION_VERBS, COL, EDU_INDICATORS, batch_ats_scores, build_feature_matrix, score_matrix
+
+FILLER = ["team", "service", "users", "data", "platform", "report", "12", "35%", "2019", "api"]
+
+
+def synthetic_resume(rng):
+    """A random extract_information() result and raw text, including error rows and short texts."""
+    if rng.random() < 0.05:
+        return {"error": "Invalid Document"}, "not a resume"
+
+    def lines(vocab, n):
+        return [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 8))) for _ in range(n)]
+
+    data = {
+        "skills": [f"skill{i}" for i in range(rng.randint(0, 12))],
+        "education": lines(EDU_INDICATORS + FILLER, rng.choice([0, 0, 1, 2, 3])),
+        "experience": lines(ACTION_VERBS + FILLER, rng.choice([0, 1, 3, 6])),
+        "projects": lines(ACTION_VERBS + FILLER, rng.choice([0, 0, 2])),
+        "certifications": lines(FILLER, rng.choice([0, 1])),
+        "summary": lines(FILLER, rng.choice([0, 1])),
+        "experience_months": rng.randint(0, 120),
+    }
+    raw_text = " ".join(rng.choice(FILLER) for _ in range(rng.choice([10, 49, 50, 300])))
+    return data, raw_text
+
+
+def test_batch_scores_match_calculate_ats_score():
+    rng = random.Random(7)
+    records = [synthetic_resume(rng) for _ in range(20_000)]
+    expected = [calculate_ats_score(data, text)[0] for data, text in records]
+
+    assert batch_ats_scores(records) == expected
+    assert any("error" in data for data, _ in records)
+    assert any(len(text.split()) < 50 and "error" not in data for data, text in records)
+
+
+def test_custom_weights_only_change_what_they_weigh():
+    rng = random.Random(3)
+    records = [synthetic_resume(rng) for _ in range(500)]
+    features = build_feature_matrix(records)
+    base = score_matrix(features)
+    with_experience = score_matrix(features, {"experience": 10})
+
+    errors = features[:, COL["is_error"]] > 0
+    assert (with_experience[errors] == 0).all()
+    assert (with_experience >= base).all() and (with_experience > base).any()
@@ -0,0 +1,50 @@
+from utils.skill_graph import SkillGraph, TAXONOMY, load_skill_graph
+
+KEYWORDS = [f"keyword {i}" for i in range(40)]
+
+
+def test_rows_only_count_taxonomy_neighbours():
+    graph = SkillGraph()
+    graph.add_resume(set(KEYWORDS) | {"python", "docker"})
+    keyword_ids = {graph.ids[k] for k in KEYWORDS}
+    assert sum(len(row) for row in graph.rows) == 2 * (len(KEYWORDS) + 1)
+    assert all(not keyword_ids & row.keys() for row in graph.rows)
+    assert graph.rows[graph.ids["keyword 0"]] == {graph.ids["python"]: 1, graph.ids["docker"]: 1}
+
+
+def test_suggestions_survive_save_and_load(tmp_path, monkeypatch):
+    monkeypatch.setattr("utils.skill_graph.MIN_RESUMES", 1)
+    graph = SkillGraph()
+    for _ in range(5):
+        graph.add_resume({"machine learning", "python", "pytorch"})
+    for i in range(5):
+        graph.add_resume({TAXONOMY[i], "java"})
+    assert graph.related_missing({"machine learning", "python"}) == ["pytorch"]
+
+    path = str(tmp_path / "skill_graph")  # No .npz suffix
+    graph.save(path)
+    reloaded = load_skill_graph(path)
+    assert reloaded.resumes == graph.resumes
+    assert reloaded.related_missing({"machine learning", "python"}) == ["pytorch"]
+
+
+def test_workers_saving_to_one_file_merge_counts(tmp_path):
+    path = str(tmp_path / "skill_graph.npz")
+    seed = SkillGraph()
+    seed.add_resume({"python", "docker"})
+    seed.save(path)
+
+    first, second = load_skill_graph(path), load_skill_graph(path)
+    first.add_resume({"python", "docker", "keyword a"})
+    second.add_resume({"python", "kubernetes", "keyword b"})
+    second.add_resume({"python", "docker"})
+    first.save(path)
+    second.save(path)
+    first.save(path)  # Nothing new: must not count its resumes twice
+
+    merged = load_skill_graph(path)
+    python, docker = merged.ids["python"], merged.ids["docker"]
+    assert merged.resumes == 4 and first.resumes == 4
+    assert merged.doc_freq[python] == 4 and merged.rows[python][docker] == 3
+    assert merged.rows[merged.ids["keyword a"]] == {python: 1, docker: 1}
+    assert merged.rows[merged.ids["keyword b"]] == {python: 1, merged.ids["kubernetes"]: 1}
@@ -0,0 +1,88 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+from utils.uploads import UploadBudget, UploadLimitMiddleware, read_upload, sniff_file_type
+
+
+def ooxml(*parts):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")
+        for part in parts:
+            zf.writestr(part, "<xml/>")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("data, kind", [
+    (b"%PDF-1.7\n...", "pdf"),
+    (b"\x89PNG\r\n\x1a\n" + b"\0" * 8, "png"),
+    (b"\xff\xd8\xff\xe0" + b"\0" * 8, "jpeg"),
+    (b"RIFF\0\0\0\0WEBPVP8 ", "webp"),
+    (b"BM" + b"\0" * 14, "bmp"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 8, "ole"),
+    (ooxml("word/document.xml"), "docx"),
+    (ooxml("xl/workbook.xml"), "zip"),
+    (ooxml("ppt/presentation.xml"), "zip"),
+    (b"PK\x03\x04 truncated", "zip"),
+    (b"plain text resume", None),
+])
+def test_sniff_file_type(data, kind):
+    assert sniff_file_type(data) == kind
+
+
+def upload(data, name="resume.pdf"):
+    return UploadFile(io.BytesIO(data), filename=name)
+
+
+def test_read_upload_enforces_file_and_request_limits():
+    assert asyncio.run(read_upload(upload(b"x" * 100), limit=100)) == b"x" * 100
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(read_upload(upload(b"x" * 101), limit=100))
+    assert e.value.status_code == 413 and "resume.pdf" in e.value.detail
+
+    budget = UploadBudget(limit=150)
+    asyncio.run(read_upload(upload(b"x" * 100), budget, limit=100))
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(read_upload(upload(b"x" * 100, "reference.png"), budget, limit=100))
+    assert e.value.status_code == 413 and budget.used == 200
+
+
+def limited_app(max_bytes):
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def receive(request: Request):
+        return {"received": len(await request.body())}
+
+    app.add_middleware(UploadLimitMiddleware, max_bytes=max_bytes)
+    return TestClient(app)
+
+
+def test_middleware_rejects_large_and_chunked_bodies():
+    client = limited_app(1000)
+    assert client.post("/upload", content=b"x" * 1000).json() == {"received": 1000}
+    assert client.post("/upload", content=b"x" * 1001).status_code == 413
+
+    chunks = (b"x" * 300 for _ in range(4))   # No Content-Length: sent chunked
+    response = client.post("/upload", content=chunks)
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body too large."}
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_upload_limit_response_carries_cors_headers(chunked):
+    import main
+
+    size = main.MAX_REQUEST_BYTES + 1
+    body = (b"x" * 65536 for _ in range(size // 65536 + 1)) if chunked else b"x" * size
+    response = TestClient(main.app).post("/analyze-resume", content=body,
+                                         headers={"Origin": "https://app.example.com",
+                                                  "Content-Type": "multipart/form-data; boundary=limit"})
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] in ("*", "https://app.example.com")
@@ -4,6 +4,8 @@ import json
 import nltk
 import re
 from collections import Counter
+from .scoring import EDU_INDICATORS, ACTION_VERBS
+from .experience import experience_months
 
 # Download NLTK data
 try:
@@ -51,7 +53,64 @@ def is_resume(text):
         
     return True
 
-def extract_information(text):
+# Identifies headers with more flexibility (allows numbering, special chars, leading space)
+SECTION_MAP = {
+    "education": re.compile(r"(?i)^\s*(\d\.|[•\-\*])?\s*(education|academic|studies|qualification|background|scholastic)"),
+    "experience": re.compile(r"(?i)^\s*(\d\.|[•\-\*])?\s*(experience|work history|employment|career|internship|professional experience|work experience)"),
+    "projects": re.compile(r"(?i)^\s*(\d\.|[•\-\*])?\s*(projects|academic projects|technical projects|personal projects|portfolio)"),
+    "skills": re.compile(r"(?i)^\s*(\d\.|[•\-\*])?\s*(skills|technologies|proficiencies|expertise|competencies|technical skills|core competencies)"),
+    "certifications": re.compile(r"(?i)^\s*(\d\.|[•\-\*])?\s*(certifications|awards|honors|licenses|achievements|credentials)")
+}
+SENTENCE_PATTERN = re.compile(r'(have|was|is|are|developed|worked)')
+
+# Improved regex to catch skills with versions or variations (e.g., Python 3)
+# and prevent matching within words (e.g. "go" in "good")
+SKILL_PATTERNS = [
+    (skill, re.compile(r'(?<!\w)' + re.escape(skill) + r'(?!\w)'))
+    for skills in TECH_SKILLS.values() for skill in skills
+]
+
+def classify_header(clean_line):
+    """Returns the section a stripped line opens, or None if it is content."""
+    # Heuristic: Headers are usually short
+    if len(clean_line) >= 50:
+        return None
+    for section, pattern in SECTION_MAP.items():
+        if pattern.search(clean_line):
+            # Also check it doesn't look like a sentence
+            if not SENTENCE_PATTERN.search(clean_line.lower()):
+                return section
+            return None
+    return None
+
+def section_for_heading(clean_line):
+    """Section a known heading names, or None for other headings (Summary, Interests...)."""
+    for section, pattern in SECTION_MAP.items():
+        if pattern.search(clean_line):
+            return section
+    return None
+
+def resolve_header_hints(header_hints):
+    """
+    Turns layout heading hints ({line: font size}) into {line: section or None}.
+    Only lines in the font size(s) used by at least two known section headings
+    count, so a larger job title is not mistaken for a heading. Returns None
+    when the layout does not mark headings clearly; regex detection is used then.
+    """
+    if not header_hints:
+        return None
+    sections = {line: section_for_heading(line) for line in header_hints}
+    per_size = Counter(header_hints[line] for line, section in sections.items() if section)
+    heading_sizes = {size for size, count in per_size.items() if count >= 2}
+    if not heading_sizes:
+        return None
+    return {line: section for line, section in sections.items() if header_hints[line] in heading_sizes}
+
+def match_skills(text_lower):
+    """Returns taxonomy skills mentioned in lowercased text."""
+    return [skill for skill, pattern in SKILL_PATTERNS if pattern.search(text_lower)]
+
+def extract_information(text, header_hints=None):
     if not nlp: return {"error": "Natural Language Processing engine (spaCy) not loaded"}
     
     if not is_resume(text):
@@ -75,69 +134,55 @@ def extract_information(text):
         elif ent.label_ == "DATE":
             extracted_data["entities"]["dates"].append(ent.text)
 
-    # Identifies headers with more flexibility (allows numbering, special chars, leading space)
-    section_map = {
-        "education": r"(?i)^\s*(\d\.|[•\-\*])?\s*(education|academic|studies|qualification|background|scholastic)",
-        "experience": r"(?i)^\s*(\d\.|[•\-\*])?\s*(experience|work history|employment|career|internship|professional experience|work experience)",
-        "projects": r"(?i)^\s*(\d\.|[•\-\*])?\s*(projects|academic projects|technical projects|personal projects|portfolio)",
-        "skills": r"(?i)^\s*(\d\.|[•\-\*])?\s*(skills|technologies|proficiencies|expertise|competencies|technical skills|core competencies)",
-        "certifications": r"(?i)^\s*(\d\.|[•\-\*])?\s*(certifications|awards|honors|licenses|achievements|credentials)"
-    }
-    
     current_section = None
     lines = text.split('\n')
+    # Headings marked by the PDF layout replace regex guessing when available
+    hint_sections = resolve_header_hints(header_hints)
     
-    # Pre-scan lines to identify indices of headers
-    section_indices = {}
-    
-    for i, line in enumerate(lines):
+    for line in lines:
         clean_line = line.strip()
         if not clean_line: continue
         
-        # Heuristic: Headers are usually short
-        if len(clean_line) < 50: 
-            found_header = False
-            for section, pattern in section_map.items():
-                if re.search(pattern, clean_line):
-                    # Also check it doesn't look like a sentence
-                    if not re.search(r'(have|was|is|are|developed|worked)', clean_line.lower()):
-                        current_section = section
-                        found_header = True
-                        break
-            
-            if found_header:
+        if hint_sections is not None:
+            if clean_line in hint_sections:
+                current_section = hint_sections[clean_line]
+                continue
+        else:
+            header = classify_header(clean_line)
+            if header:
+                current_section = header
                 continue # Don't add header itself to content
         
         if current_section:
             extracted_data[current_section].append(clean_line)
 
     # 3. Explicit Skill Identification via Taxonomy
-    text_lower = text.lower()
-    for category, skills in TECH_SKILLS.items():
-        for skill in skills:
-            # Improved regex to catch skills with versions or variations (e.g., Python 3)
-            # and prevent matching within words (e.g. "go" in "good")
-            pattern = r'(?<!\w)' + re.escape(skill) + r'(?!\w)'
-            if re.search(pattern, text_lower):
-                extracted_data["skills"].append(skill)
-    
+    extracted_data["skills"].extend(match_skills(text.lower()))
     extracted_data["skills"] = list(set(extracted_data["skills"]))
 
-    # 4. Keyword extraction (Fall back to simple frequency if RAKE fails or finds nothing)
+    # 4. Keyword extraction
+    extracted_data["keywords"] = extract_keywords(text, extracted_data["skills"])
+
+    # 5. Total experience from date ranges in the Experience section
+    extracted_data["experience_months"] = experience_months(extracted_data["experience"])
+    
+    return extracted_data
+
+def extract_keywords(text, fallback):
+    """Keyword extraction (Fall back to simple frequency if RAKE fails or finds nothing)"""
     try:
         r = Rake()
         r.extract_keywords_from_text(text)
-        extracted_data["keywords"] = r.get_ranked_phrases()[:30]
+        return r.get_ranked_phrases()[:30]
     except:
-        extracted_data["keywords"] = extracted_data["skills"] # Fallback to skills
-    
-    return extracted_data
+        return fallback # Fallback to skills
 
 def calculate_ats_score(extracted_data, raw_text):
     if "error" in extracted_data:
         return 0, []
 
     # Weights based on JustScreen Fair Screening Methodology
+    # (utils/scoring.py mirrors this function for vectorized batch re-scoring)
     weights = {
         "structure": 25,     # Transparency & Completeness
         "skills": 35,        # Relevant Taxonomy Match
@@ -172,8 +217,7 @@ def calculate_ats_score(extracted_data, raw_text):
     
     # --- 3. Education Merit (15 pts) ---
     edu_text = " ".join(extracted_data.get("education", [])).lower()
-    edu_indicators = ["degree", "bachelor", "master", "phd", "university", "college", "gpa", "graduate", "b.tech", "m.tech", "b.e", "b.s", "diploma", "certified"]
-    found_indicators = [i for i in edu_indicators if i in edu_text]
+    found_indicators = [i for i in EDU_INDICATORS if i in edu_text]
     
     # If education section exists but no specific degree found, still give points for section existence
     base_edu = 5 if len(extracted_data.get("education", [])) > 0 else 0
@@ -185,8 +229,7 @@ def calculate_ats_score(extracted_data, raw_text):
     exp_text = " ".join(exp_lines).lower()
     
     # Action Verbs (JustScreen: Evidence of action)
-    action_verbs = ["developed", "led", "managed", "built", "implemented", "scaled", "optimized", "increased", "decreased", "saved", "launched", "automated", "mentored", "created", "designed", "performed", "achieved"]
-    found_verbs = [v for v in action_verbs if v in exp_text]
+    found_verbs = [v for v in ACTION_VERBS if v in exp_text]
     verb_points = min((len(found_verbs) / 5) * 15, 15)
     
     # Quantifiable results (Detect numbers/percentages)
@@ -0,0 +1,231 @@
+"""
+Near-Duplicate Resume Detection
+MinHash signatures over word shingles of the cleaned resume text, indexed with
+LSH banding so each upload is compared only against resumes sharing a bucket.
+Buckets are one sorted uint64 array of band keys (binary-searched), so the
+index stays compact and fast at millions of resumes.
+Analysis results of indexed resumes are cached so a near-identical re-upload
+can be answered without re-running the pipeline.
+"""
+
+import hashlib
+import os
+import re
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves from several workers are not serialized
+    fcntl = None
+
+NUM_PERM = 128
+BANDS = 16                      # 16 bands x 8 rows: candidates from ~0.7 Jaccard up
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = float(os.getenv("DEDUP_FLAG_THRESHOLD", 0.8))
+REUSE_THRESHOLD = float(os.getenv("DEDUP_REUSE_THRESHOLD", 0.95))
+RESULT_CACHE_SIZE = int(os.getenv("DEDUP_RESULT_CACHE_SIZE", 10000))
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", "")
+
+_PRIME = np.uint64(4294967291)  # Largest prime < 2**32, so a*x + b fits in uint64
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 2**32 - 5, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2**32 - 5, size=NUM_PERM, dtype=np.uint64)
+_BAND_MIX = _rng.randint(0, 2**63, size=(BANDS, ROWS), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def shingle_hashes(text):
+    """CRC32 hashes of overlapping word n-grams of the normalized text."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        tokens = tokens + [""] * (SHINGLE_SIZE - len(tokens))
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash(text):
+    """Returns a (NUM_PERM,) uint32 MinHash signature."""
+    hashes = shingle_hashes(text) % _PRIME
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signatures):
+    """
+    (N, BANDS) uint64 bucket keys of (N, NUM_PERM) signatures: a multiply-add
+    hash of each band's rows, with different multipliers per band.
+    """
+    bands = signatures.reshape(-1, BANDS, ROWS).astype(np.uint64)
+    return (bands * _BAND_MIX).sum(axis=2, dtype=np.uint64)  # Wraps mod 2**64
+
+
+class ResumeIndex:
+    """
+    In-process LSH index of resume signatures plus an LRU of their analyses.
+    Band keys of all rows are kept in one sorted array alongside their row
+    numbers; rows added since the last merge are scanned directly until
+    MERGE_EVERY accumulate.
+    """
+
+    MERGE_EVERY = 4096
+
+    def __init__(self, result_cache_size=RESULT_CACHE_SIZE):
+        self._lock = Lock()
+        self._ids = []
+        self._positions = {}
+        self._signatures = np.empty((1024, NUM_PERM), dtype=np.uint32)
+        self._keys = np.empty((1024, BANDS), dtype=np.uint64)
+        self._merged = 0
+        self._sorted_keys = np.empty(0, dtype=np.uint64)
+        self._sorted_rows = np.empty(0, dtype=np.uint32)
+        self._results = OrderedDict()
+        self.result_cache_size = result_cache_size
+
+    def __len__(self):
+        return len(self._ids)
+
+    def query(self, signature, exclude=None):
+        """
+        Returns (resume_id, estimated_jaccard) of the closest candidate other
+        than `exclude`, or (None, 0.0).
+        """
+        keys = band_keys(signature)[0]
+        with self._lock:
+            lo = self._sorted_keys.searchsorted(keys, side="left")
+            hi = self._sorted_keys.searchsorted(keys, side="right")
+            parts = [self._sorted_rows[a:b] for a, b in zip(lo, hi) if a < b]
+            pending = self._keys[self._merged:len(self._ids)]
+            parts.append(np.flatnonzero((pending == keys).any(axis=1)) + self._merged)
+            rows = np.unique(np.concatenate(parts).astype(np.int64))
+            if exclude in self._positions:
+                rows = rows[rows != self._positions[exclude]]
+            if not len(rows):
+                return None, 0.0
+            similarity = (self._signatures[rows] == signature).mean(axis=1)
+            best = int(np.argmax(similarity))
+            return self._ids[rows[best]], float(similarity[best])
+
+    def add(self, resume_id, signature):
+        self.add_many([resume_id], np.asarray(signature)[None])
+
+    def add_many(self, resume_ids, signatures):
+        """Adds (N, NUM_PERM) signatures; ids already indexed are skipped."""
+        with self._lock:
+            new = []
+            for i, resume_id in enumerate(resume_ids):
+                if resume_id not in self._positions:
+                    self._positions[resume_id] = len(self._ids)
+                    self._ids.append(resume_id)
+                    new.append(i)
+            if not new:
+                return
+            stop = len(self._ids)
+            start = stop - len(new)
+            if stop > len(self._signatures):
+                capacity = max(stop, 2 * len(self._signatures))
+                self._signatures = np.resize(self._signatures, (capacity, NUM_PERM))
+                self._keys = np.resize(self._keys, (capacity, BANDS))
+            self._signatures[start:stop] = signatures[new]
+            self._keys[start:stop] = band_keys(self._signatures[start:stop])
+            if stop - self._merged >= self.MERGE_EVERY:
+                self._merge()
+
+    def _merge(self):
+        """Folds the pending rows into the sorted key array."""
+        stop = len(self._ids)
+        new_keys = self._keys[self._merged:stop].ravel()
+        order = np.argsort(new_keys, kind="stable")
+        new_rows = np.repeat(np.arange(self._merged, stop, dtype=np.uint32), BANDS)
+        keys = np.concatenate([self._sorted_keys, new_keys[order]])
+        rows = np.concatenate([self._sorted_rows, new_rows[order]])
+        order = np.argsort(keys, kind="stable")  # Two sorted runs: linear time
+        self._sorted_keys, self._sorted_rows = keys[order], rows[order]
+        self._merged = stop
+
+    def cache_result(self, resume_id, result):
+        with self._lock:
+            self._results[resume_id] = result
+            self._results.move_to_end(resume_id)
+            while len(self._results) > self.result_cache_size:
+                self._results.popitem(last=False)
+
+    def cached_result(self, resume_id):
+        with self._lock:
+            result = self._results.get(resume_id)
+            if result is not None:
+                self._results.move_to_end(resume_id)
+            return result
+
+    def save(self, path):
+        """
+        Persists ids and signatures; buckets are rebuilt on load. Entries other
+        workers saved to the same file are merged in rather than overwritten.
+        """
+        with _locked(path):
+            merged = ResumeIndex.load(path) if os.path.exists(path) else ResumeIndex()
+            with self._lock:
+                ids, signatures = list(self._ids), self._signatures[:len(self._ids)].copy()
+            merged.add_many(ids, signatures)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:  # A file object keeps np.savez from appending .npz
+                np.savez(f, ids=np.array(merged._ids, dtype=str), signatures=merged._signatures[:len(merged._ids)])
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with np.load(path) as data:
+            index.add_many([str(resume_id) for resume_id in data["ids"]], data["signatures"])
+        with index._lock:
+            index._merge()
+        return index
+
+
+@contextmanager
+def _locked(path):
+    """Exclusive lock on `<path>.lock` across processes."""
+    with open(f"{path}.lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_resume_index(path=DEDUP_INDEX_PATH):
+    if path and os.path.exists(path):
+        try:
+            return ResumeIndex.load(path)
+        except Exception as e:
+            print(f"Warning: Could not load resume index from {path}: {e}")
+    return ResumeIndex()
+
+
+def resume_id_for(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+resume_index = load_resume_index()
+
+
+def check_duplicate(clean_text, index=resume_index):
+    """
+    Returns (resume_id, signature, match) for a cleaned resume, where match is
+    {"resume_id", "similarity"} of the closest other indexed resume above
+    DUPLICATE_THRESHOLD, or None. A re-upload of the same text is never its
+    own match; its cached analysis is looked up by resume_id instead.
+    """
+    signature = minhash(clean_text)
+    resume_id = resume_id_for(clean_text)
+    match_id, similarity = index.query(signature, exclude=resume_id)
+    if match_id is None or similarity < DUPLICATE_THRESHOLD:
+        return resume_id, signature, None
+    return resume_id, signature, {"resume_id": match_id, "similarity": round(similarity, 3)}
@@ -0,0 +1,247 @@
+"""
+Worker Diagnostics
+Opt-in memory visibility (RSS, tracemalloc top allocators, heap snapshot diffs)
+and a watchdog that recycles the worker after N requests or once RSS crosses a
+ceiling. Recycling sends SIGTERM to the worker itself: it stops accepting
+connections, drains in-flight requests and exits, and the process manager
+starts a fresh worker. Without a process manager nothing would replace it, so
+the watchdog only arms itself under gunicorn or with WORKER_SUPERVISED=1.
+"""
+
+import asyncio
+import ctypes
+import gc
+import hmac
+import os
+import random
+import resource
+import signal
+import sys
+import time
+import tracemalloc
+
+from fastapi import APIRouter, Header, HTTPException
+
+from . import metrics
+
+DIAGNOSTICS_ENABLED = os.getenv("DIAGNOSTICS_ENABLED", "0") == "1"
+DIAGNOSTICS_TOKEN = os.getenv("DIAGNOSTICS_TOKEN", "")
+if DIAGNOSTICS_ENABLED and not DIAGNOSTICS_TOKEN:
+    # The endpoints expose allocation sites and can force GCs; never serve them unauthenticated
+    print("Warning: DIAGNOSTICS_ENABLED=1 but DIAGNOSTICS_TOKEN is not set, /diagnostics stays disabled")
+    DIAGNOSTICS_ENABLED = False
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", 1))
+WORKER_MAX_REQUESTS = int(os.getenv("WORKER_MAX_REQUESTS", 0))
+WORKER_MAX_REQUESTS_JITTER = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", 50))
+WORKER_MAX_RSS_MB = float(os.getenv("WORKER_MAX_RSS_MB", 0))
+WATCHDOG_INTERVAL_SECONDS = float(os.getenv("WATCHDOG_INTERVAL_SECONDS", 15))
+# Set when another process manager (systemd, a container restart policy, ...)
+# replaces exited workers; gunicorn is detected on its own
+WORKER_SUPERVISED = os.getenv("WORKER_SUPERVISED", "0") == "1"
+
+
+def running_under_supervisor():
+    """True when an exited worker will be replaced, e.g. inside a gunicorn worker."""
+    return WORKER_SUPERVISED or "gunicorn" in sys.modules
+
+
+def rss_mb():
+    """Current resident set size in MB (falls back to peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def release_free_memory():
+    """Runs a full GC and asks glibc to return freed arenas to the OS."""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _package_of(filename):
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1].split(os.sep, 1)[0]
+    return os.path.relpath(filename) if filename.startswith(os.getcwd()) else filename
+
+
+def _take_snapshot():
+    # Leave out the profiler's own bookkeeping
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def top_allocators(limit=20, group="package"):
+    """Largest live allocations grouped by package, file or line."""
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = _take_snapshot()
+    if group == "line":
+        return [{"location": str(s.traceback), "size_kb": round(s.size / 1024, 1), "count": s.count}
+                for s in snapshot.statistics("lineno")[:limit]]
+
+    totals = {}
+    for stat in snapshot.statistics("filename"):
+        key = _package_of(stat.traceback[0].filename) if group == "package" else stat.traceback[0].filename
+        size, count = totals.get(key, (0, 0))
+        totals[key] = (size + stat.size, count + stat.count)
+    ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+    return [{"location": key, "size_kb": round(size / 1024, 1), "count": count} for key, (size, count) in ranked]
+
+
+class WorkerWatchdog:
+    """Counts requests and watches RSS; triggers a graceful recycle on either limit."""
+
+    def __init__(self, max_requests=WORKER_MAX_REQUESTS, max_rss_mb=WORKER_MAX_RSS_MB,
+                 interval=WATCHDOG_INTERVAL_SECONDS, jitter=WORKER_MAX_REQUESTS_JITTER, supervised=None):
+        supervised = running_under_supervisor() if supervised is None else supervised
+        if (max_requests or max_rss_mb) and not supervised:
+            print("Warning: WORKER_MAX_REQUESTS/WORKER_MAX_RSS_MB ignored: no process manager would restart "
+                  "a recycled worker. Run under gunicorn or set WORKER_SUPERVISED=1.")
+            max_requests = max_rss_mb = 0
+        # Jitter keeps workers started together from recycling at the same time
+        self.max_requests = max_requests + random.randint(0, jitter) if max_requests else 0
+        self.max_rss_mb = max_rss_mb
+        self.interval = interval
+        self.requests = 0
+        self.in_flight = 0
+        self.recycling = False
+        self.started = time.time()
+
+    @property
+    def enabled(self):
+        return bool(self.max_requests or self.max_rss_mb)
+
+    def request_started(self):
+        self.in_flight += 1
+
+    def request_finished(self):
+        self.in_flight -= 1
+        self.requests += 1
+        if self.max_requests and self.requests >= self.max_requests:
+            self.recycle(f"served {self.requests} requests")
+
+    async def check_memory(self):
+        if not self.max_rss_mb:
+            return
+        if rss_mb() > self.max_rss_mb:
+            # Fragmentation after large PDFs is often reclaimable without a restart;
+            # the full GC and malloc_trim run in a thread, off the event loop
+            await asyncio.to_thread(release_free_memory)
+            current = rss_mb()
+            if current > self.max_rss_mb:
+                self.recycle(f"RSS {current:.0f}MB over {self.max_rss_mb:.0f}MB ceiling")
+
+    async def run(self):
+        while not self.recycling:
+            await asyncio.sleep(self.interval)
+            await self.check_memory()
+
+    def recycle(self, reason):
+        if self.recycling:
+            return
+        self.recycling = True
+        metrics.increment("worker.recycled")
+        print(f"Recycling worker {os.getpid()}: {reason} ({self.in_flight} requests in flight will be drained)")
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_requests": self.max_requests,
+            "max_rss_mb": self.max_rss_mb,
+            "recycling": self.recycling,
+        }
+
+
+watchdog = WorkerWatchdog()
+
+
+class RequestTrackingMiddleware:
+    """ASGI middleware feeding request counts to the watchdog."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        watchdog.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            watchdog.request_finished()
+
+
+# --- Opt-in endpoints (DIAGNOSTICS_ENABLED=1) ---
+router = APIRouter(prefix="/diagnostics")
+_baseline = {}
+
+
+def _authorize(token):
+    if not DIAGNOSTICS_TOKEN or not hmac.compare_digest(token.encode(), DIAGNOSTICS_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid diagnostics token.")
+
+
+def start_tracing():
+    if DIAGNOSTICS_ENABLED and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+
+@router.get("/memory")
+async def memory(limit: int = 20, group: str = "package", x_diagnostics_token: str = Header("")):
+    _authorize(x_diagnostics_token)
+    traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        "rss_mb": round(rss_mb(), 1),
+        "tracemalloc_current_mb": round(traced / (1024 * 1024), 1),
+        "tracemalloc_peak_mb": round(peak / (1024 * 1024), 1),
+        "gc_counts": gc.get_count(),
+        "worker": watchdog.status(),
+        "top_allocators": top_allocators(limit, group),
+    }
+
+
+@router.post("/heap-snapshot")
+async def heap_snapshot(x_diagnostics_token: str = Header("")):
+    """Stores a baseline snapshot for /diagnostics/heap-diff."""
+    _authorize(x_diagnostics_token)
+    if not tracemalloc.is_tracing():
+        raise HTTPException(status_code=409, detail="tracemalloc is not running.")
+    _baseline["snapshot"] = _take_snapshot()
+    _baseline["taken_at"] = time.time()
+    return {"status": "success", "rss_mb": round(rss_mb(), 1)}
+
+
+@router.get("/heap-diff")
+async def heap_diff(limit: int = 20, x_diagnostics_token: str = Header("")):
+    """Allocation growth by line since the last /diagnostics/heap-snapshot."""
+    _authorize(x_diagnostics_token)
+    if "snapshot" not in _baseline:
+        raise HTTPException(status_code=409, detail="Take a baseline with POST /diagnostics/heap-snapshot first.")
+    diff = _take_snapshot().compare_to(_baseline["snapshot"], "lineno")
+    return {
+        "seconds_since_baseline": round(time.time() - _baseline["taken_at"], 1),
+        "top_growth": [
+            {"location": str(d.traceback), "size_diff_kb": round(d.size_diff / 1024, 1),
+             "size_kb": round(d.size / 1024, 1), "count_diff": d.count_diff}
+            for d in diff[:limit]
+        ],
+    }
+
+
+@router.post("/gc")
+async def collect(x_diagnostics_token: str = Header("")):
+    _authorize(x_diagnostics_token)
+    before = rss_mb()
+    await asyncio.to_thread(release_free_memory)
+    return {"rss_before_mb": round(before, 1), "rss_after_mb": round(rss_mb(), 1)}
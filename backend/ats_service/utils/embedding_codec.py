@@ -0,0 +1,116 @@
+"""
+Embedding Codec
+Compact storage for 512-d InsightFace `normed_embedding` vectors and cosine
+similarity kernels that score a float32 query against the compressed gallery
+without decompressing it as a whole.
+
+Codecs:
+    float32  2048 bytes/vector (reference)
+    float16  1024 bytes/vector
+    int8      516 bytes/vector (int8 codes + one float32 scale per vector)
+"""
+
+import numpy as np
+
+CODECS = ("float32", "float16", "int8")
+BLOCK_ROWS = 4096  # Rows upcast at a time while scoring
+
+
+def encode(embeddings, codec="int8"):
+    """
+    Encodes an (N, D) float array. Returns (codes, scales); scales is None
+    except for int8, where each vector keeps its own max-abs / 127 scale.
+    """
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    if codec == "float32":
+        return embeddings.copy(), None
+    if codec == "float16":
+        return embeddings.astype(np.float16), None
+    if codec == "int8":
+        scales = np.abs(embeddings).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(embeddings / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"Unsupported codec: {codec}")
+
+
+def decode(codes, scales=None):
+    """Reconstructs float32 vectors from encode() output."""
+    if scales is not None:
+        return codes.astype(np.float32) * scales[:, None]
+    return codes.astype(np.float32)
+
+
+def similarity(codes, scales, query):
+    """
+    Dot-product similarity of one float32 query against every encoded vector.
+    Blocks of rows are upcast on the fly, so peak extra memory is bounded by
+    BLOCK_ROWS rather than the gallery size. For int8 the per-vector scale is
+    applied to the dot product instead of to the codes.
+    """
+    query = np.asarray(query, dtype=np.float32).ravel()
+    scores = np.empty(len(codes), dtype=np.float32)
+    for start in range(0, len(codes), BLOCK_ROWS):
+        block = codes[start:start + BLOCK_ROWS]
+        scores[start:start + len(block)] = block.astype(np.float32) @ query
+    if scales is not None:
+        scores *= scales
+    return scores
+
+
+def bytes_per_vector(codec, dim=512):
+    return {"float32": 4 * dim, "float16": 2 * dim, "int8": dim + 4}[codec]
+
+
+class EmbeddingGallery:
+    """Append-only store of encoded embeddings with their owner ids."""
+
+    def __init__(self, codec="int8", dim=512):
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported codec: {codec}")
+        self.codec = codec
+        self.dim = dim
+        self.owners = []
+        self._codes = []
+        self._scales = []
+        self._packed = None
+
+    def add(self, owner_id, embedding):
+        codes, scales = encode(embedding, self.codec)
+        self._codes.append(codes)
+        if scales is not None:
+            self._scales.append(scales)
+        self.owners.append(owner_id)
+        self._packed = None
+
+    def _pack(self):
+        if self._packed is None:
+            codes = np.concatenate(self._codes) if self._codes else np.empty((0, self.dim), dtype=np.float32)
+            scales = np.concatenate(self._scales) if self._scales else None
+            self._codes = [codes]
+            self._scales = [scales] if scales is not None else []
+            self._packed = (codes, scales)
+        return self._packed
+
+    def scores(self, query):
+        codes, scales = self._pack()
+        return similarity(codes, scales, query)
+
+    def best_match(self, query, owner_id=None):
+        """Highest similarity, optionally restricted to one owner's references."""
+        scores = self.scores(query)
+        candidates = np.arange(len(scores))
+        if owner_id is not None:
+            mask = np.fromiter((o == owner_id for o in self.owners), dtype=bool, count=len(self.owners))
+            candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return None, 0.0
+        best = int(candidates[np.argmax(scores[candidates])])
+        return self.owners[best], float(scores[best])
+
+    def nbytes(self):
+        codes, scales = self._pack()
+        return codes.nbytes + (scales.nbytes if scales is not None else 0)
+
+    def __len__(self):
+        return len(self.owners)
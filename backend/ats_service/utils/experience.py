@@ -0,0 +1,103 @@
+"""
+Experience Duration
+Finds date ranges such as "Jan 2019 - Present", "03/2018 to 06/2020" or
+"2017-2020" in experience lines with one precompiled pattern and a month
+lookup table, then merges overlapping roles into total months of experience.
+
+Year-only ranges count whole years ("2017-2020" is 3 years, "2019-2019" one),
+month ranges are inclusive ("Jan 2019 - Mar 2019" is 3 months).
+"""
+
+import re
+import time
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10, "october": 10,
+    "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+MIN_YEAR = 1950
+
+_MONTH_NAME = "|".join(sorted(MONTHS, key=len, reverse=True))
+_MONTH = r"(?:(?P<{p}name>" + _MONTH_NAME + r")\.?\s*,?\s*'?|(?P<{p}num>0?[1-9]|1[0-2])\s*[/.]\s*)"
+
+# Lines are lowercased once and scanned for year tokens first; the range is
+# then matched forward from the year and its month backward from it, which is
+# far cheaper than trying a month-name alternation at every character.
+_YEAR = re.compile(r"(?:19|20)\d{2}")
+_START_MONTH = re.compile(_MONTH.format(p="") + r"$")
+_RANGE_TAIL = re.compile(
+    r"(?:19|20)\d{2}\s*(?:-|–|—|~|to|until|till)\s*"
+    r"(?:(?P<present>present|current|now|today|date|ongoing)|" + _MONTH.format(p="e") + r"?(?P<eyear>(?:19|20)\d{2}))(?!\d)"
+)
+_NOT_BEFORE = set("abcdefghijklmnopqrstuvwxyz0123456789/.-")
+
+
+def _month(match, prefix):
+    name, num = match.group(prefix + "name"), match.group(prefix + "num")
+    if name:
+        return MONTHS[name]
+    return int(num) if num else None
+
+
+def parse_ranges(lines, now=None):
+    """Returns (start, end) month indices (year * 12 + month - 1, inclusive) for each range found."""
+    now = now or time.localtime()
+    current = now.tm_year * 12 + now.tm_mon - 1
+    ranges = []
+    for line in lines:
+        text = line.lower()
+        pos = 0
+        while True:
+            year = _YEAR.search(text, pos)
+            if year is None:
+                break
+            tail = _RANGE_TAIL.match(text, year.start())
+            if tail is None:
+                pos = year.end()
+                continue
+            pos = tail.end()
+
+            start_month = None
+            begin = year.start()
+            prefix = _START_MONTH.search(text, max(0, begin - 16), begin)
+            if prefix and (prefix.start() == 0 or text[prefix.start() - 1] not in _NOT_BEFORE):
+                start_month, begin = _month(prefix, ""), prefix.start()
+            if begin > 0 and text[begin - 1] in _NOT_BEFORE:
+                continue  # Part of a longer number, date or word (e.g. 12/03/2019, 555-2019)
+
+            start_year = int(year.group())
+            start = start_year * 12 + (start_month or 1) - 1
+            if tail.group("present"):
+                end = current
+            else:
+                end_year = int(tail.group("eyear"))
+                end_month = _month(tail, "e")
+                if end_month is None and start_month is None:
+                    if end_year < start_year:
+                        continue  # Reversed (2020 - 2018); the clamp below would turn it into a year
+                    # Whole years: 2017-2020 -> Jan 2017 to Dec 2019; 2019-2019 -> all of 2019
+                    end = max(end_year * 12 - 1, start + 11)
+                else:
+                    end = end_year * 12 + (end_month or 12) - 1
+
+            if start_year < MIN_YEAR or start > end or start > current:
+                continue
+            ranges.append((start, min(end, current)))
+    return ranges
+
+
+def total_months(ranges):
+    """Months covered by the union of ranges; overlapping roles count once. O(n + span)."""
+    if not ranges:
+        return 0
+    first = min(start for start, _ in ranges)
+    covered = bytearray(max(end for _, end in ranges) - first + 1)
+    for start, end in ranges:
+        covered[start - first:end - first + 1] = b"\x01" * (end - start + 1)
+    return covered.count(1)
+
+
+def experience_months(experience_lines, now=None):
+    return total_months(parse_ranges(experience_lines, now))
@@ -2,6 +2,8 @@ import os
 import openai
 import json
 
+from .skill_graph import skill_graph, resume_terms
+
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
 def generate_feedback(score, extracted_data):
@@ -70,11 +72,18 @@ def get_fallback_feedback(score, extracted_data):
 
     # --- Analyze Skills ---
     skill_count = len(extracted_data.get("skills", []))
+    # Skills that similar resumes list alongside the detected ones
+    related = skill_graph.related_missing(resume_terms(extracted_data), k=3)
     if skill_count > 5:
         strengths.append(f"Detected {skill_count} relevant technical skills")
+        if related:
+            suggestions.append(f"Skills often listed alongside yours: {', '.join(related)}. Add any you have used.")
     elif skill_count > 0:
          weaknesses.append("Low count of recognized technical skills")
-         suggestions.append("Add more specific technical skills (e.g., specific languages, tools, frameworks) to the Skills section.")
+         if related:
+             suggestions.append(f"Add related technical skills you have used, e.g. {', '.join(related)}, to the Skills section.")
+         else:
+             suggestions.append("Add more specific technical skills (e.g., specific languages, tools, frameworks) to the Skills section.")
     else:
         weaknesses.append("No technical skills detected")
         suggestions.append("Create a dedicated Skills section and list your top technical competencies.")
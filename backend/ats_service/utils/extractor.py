@@ -1,6 +1,33 @@
 import fitz  # PyMuPDF
 import docx
 import io
+import os
+import re
+import zipfile
+import multiprocessing as mp
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+HEADER_PART = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PART = re.compile(r"^word/footer\d*\.xml$")
+# Elements whose finished children are dropped while streaming: the blocks of
+# the body, headers and footers, and the rows of (possibly nested) tables
+BLOCK_CONTAINERS = {W_NS + "body", W_NS + "hdr", W_NS + "ftr", W_NS + "tbl"}
+
+# "layout" orders PDF text by column and tags headings; "plain" is page.get_text()
+PDF_EXTRACTION_MODE = os.getenv("PDF_EXTRACTION_MODE", "layout")
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 8))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+FULL_WIDTH_RATIO = 0.6       # Blocks wider than this share of the page span all columns
+MIN_GUTTER_PT = 12           # Narrowest vertical gap treated as a column gutter
+MAX_GUTTER_CROSSINGS = 2     # Widest lines of a band allowed to cross a gutter (name + title lines)
+HEADING_SIZE_RATIO = 1.15    # Lines this much larger than the body font are headings
+_WHITESPACE = re.compile(r"\s+")
+_pdf_pool = None
+_pdf_pool_workers = 0
 
 def extract_text_from_pdf(file_bytes):
     text = ""
@@ -9,15 +36,264 @@ def extract_text_from_pdf(file_bytes):
             text += page.get_text()
     return text
 
+def normalize_line(line):
+    """Whitespace-collapsed line, matching what preprocess_text leaves."""
+    return _WHITESPACE.sub(" ", line).strip()
+
+def _is_column(segments):
+    """Left-aligned text (a column) rather than right-aligned dates or locations."""
+    left = min(seg["bbox"][0] for seg in segments)
+    right = max(seg["bbox"][2] for seg in segments)
+    left_aligned = sum(1 for seg in segments if seg["bbox"][0] - left < 3)
+    right_aligned = sum(1 for seg in segments if right - seg["bbox"][2] < 3)
+    return left_aligned >= right_aligned
+
+def _projection_gutters(segments, page_width):
+    """x positions splitting segments into columns, from gaps in their x-projection."""
+    spans = sorted(segments, key=lambda seg: seg["bbox"][0])
+    gutters, group = [], [spans[0]]
+    reach = spans[0]["bbox"][2]
+    for seg in spans[1:]:
+        x0 = seg["bbox"][0]
+        if x0 - reach >= MIN_GUTTER_PT and 0.15 * page_width < x0 < 0.85 * page_width:
+            gutters.append(((reach + x0) / 2, len(gutters)))
+        reach = max(reach, seg["bbox"][2])
+    if not gutters:
+        return []
+    # Keep a gutter only if the text to its right reads as its own column
+    columns = [[] for _ in range(len(gutters) + 1)]
+    for seg in segments:
+        columns[sum(1 for g, _ in gutters if seg["bbox"][0] >= g)].append(seg)
+    return [g for (g, i) in gutters if _is_column(columns[i + 1])]
+
+def _column_gutters(segments, page_width):
+    """
+    x positions splitting narrow segments into columns. A few of the widest
+    lines (e.g. a large name set beside a job title) may cross a gutter
+    without hiding it; _ordered_segments splits the band at them.
+    """
+    widest_first = sorted(segments, key=lambda seg: seg["bbox"][2] - seg["bbox"][0], reverse=True)
+    for skipped in range(min(MAX_GUTTER_CROSSINGS, len(segments) // 4) + 1):
+        gutters = _projection_gutters(widest_first[skipped:], page_width)
+        if gutters:
+            return gutters
+    return []
+
+def _ordered_segments(segments, page_width):
+    """
+    Reading order for one page: full-width lines split the page into bands;
+    inside a band, columns are read left to right, each top to bottom. Lines
+    crossing a gutter split the band again where they sit.
+    """
+    ordered, band = [], []
+
+    def flush_band():
+        if not band:
+            return
+        gutters = _column_gutters(band, page_width)
+        column = lambda seg: sum(1 for g in gutters if seg["bbox"][0] >= g)
+        part = []
+        for seg in band + [None]:  # The band is in top-to-bottom order
+            if seg is not None and not any(seg["bbox"][0] < g < seg["bbox"][2] for g in gutters):
+                part.append(seg)
+                continue
+            ordered.extend(sorted(part, key=lambda seg: (column(seg), seg["bbox"][1], seg["bbox"][0])))
+            part.clear()
+            if seg is not None:
+                ordered.append(seg)
+        band.clear()
+
+    for seg in sorted(segments, key=lambda seg: (seg["bbox"][1], seg["bbox"][0])):
+        if seg["bbox"][2] - seg["bbox"][0] > FULL_WIDTH_RATIO * page_width:
+            flush_band()
+            ordered.append(seg)
+        else:
+            band.append(seg)
+    flush_band()
+    return ordered
+
+def _line_segments(line):
+    """Splits a PyMuPDF line where its spans are a gutter apart (row-ordered multi-column PDFs)."""
+    segments, current = [], []
+    for span in line["spans"]:
+        if current and span["bbox"][0] - current[-1]["bbox"][2] >= MIN_GUTTER_PT:
+            segments.append(current)
+            current = []
+        current.append(span)
+    if current:
+        segments.append(current)
+    for spans in segments:
+        yield {
+            "bbox": (spans[0]["bbox"][0], min(s["bbox"][1] for s in spans), spans[-1]["bbox"][2], max(s["bbox"][3] for s in spans)),
+            "spans": spans,
+        }
+
+def _layout_page_lines(page):
+    """Returns ([(text, max_font_size)], Counter of characters per font size) for one page."""
+    segments = [
+        seg
+        for block in page.get_text("dict")["blocks"] if block.get("type") == 0
+        for line in block.get("lines", [])
+        for seg in _line_segments(line)
+    ]
+    lines, sizes = [], Counter()
+    if not segments:
+        return lines, sizes
+    for seg in _ordered_segments(segments, page.rect.width):
+        spans = [s for s in seg["spans"] if s["text"].strip()]
+        text = normalize_line("".join(s["text"] for s in seg["spans"]))
+        if not spans or not text:
+            continue
+        for s in spans:
+            sizes[round(s["size"], 1)] += len(s["text"])
+        lines.append((text, max(s["size"] for s in spans)))
+    return lines, sizes
+
+def _layout_page_range(file_bytes, start, stop):
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        return [_layout_page_lines(doc[i]) for i in range(start, stop)]
+
+def start_pdf_pool(workers=None):
+    """
+    Starts the worker processes long PDFs are split across; until then
+    extraction stays in the calling process. Start it from the serving process
+    (e.g. a startup hook), never at import: spawned workers re-import the
+    launching script.
+    """
+    global _pdf_pool, _pdf_pool_workers
+    workers = workers or PDF_EXTRACT_WORKERS
+    if _pdf_pool is None and workers > 1:
+        # spawn: the API process runs threads, which fork does not copy safely
+        _pdf_pool = ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"))
+        _pdf_pool_workers = workers
+    return _pdf_pool
+
+def stop_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown()
+        _pdf_pool = None
+_pdf_pool_workers = 0
+
+def extract_pdf_layout(file_bytes, parallel=True):
+    """
+    Returns (text, header_hints): text in column reading order, and
+    {line: font size} for short lines set noticeably larger than the body
+    font, for the section classifier. Long documents are split across worker
+    processes once start_pdf_pool() has run.
+    """
+    pool = _pdf_pool if parallel else None
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if pool is None or page_count < PDF_PARALLEL_MIN_PAGES:
+            pages = [_layout_page_lines(page) for page in doc]
+    if pool is not None and page_count >= PDF_PARALLEL_MIN_PAGES:
+        step = -(-page_count // _pdf_pool_workers)
+        futures = [pool.submit(_layout_page_range, file_bytes, i, min(i + step, page_count))
+                   for i in range(0, page_count, step)]
+        pages = [page for future in futures for page in future.result()]
+
+    sizes = Counter()
+    for _, page_sizes in pages:
+        sizes.update(page_sizes)
+    body_size = sizes.most_common(1)[0][0] if sizes else 0
+
+    text_lines, header_hints = [], {}
+    for page_lines, _ in pages:
+        for text, size in page_lines:
+            text_lines.append(text)
+            if len(text) < 50 and size >= body_size * HEADING_SIZE_RATIO:
+                header_hints[text] = round(size, 1)
+    return "\n".join(text_lines), header_hints
+
 def extract_text_from_docx(file_bytes):
     doc = docx.Document(io.BytesIO(file_bytes))
     text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
     return text
 
+def iter_docx_part_lines(stream):
+    """
+    Streams paragraphs out of a WordprocessingML part with iterparse, without
+    building an object tree. Table cells and text boxes are regular w:p
+    elements, so they come out in document order; the legacy mc:Fallback copy
+    of each text box is skipped to avoid duplicates. Finished top-level blocks
+    and table rows are detached from the tree, so memory stays flat however
+    long the document or its tables are.
+    """
+    buffers = []
+    ancestors = []
+    fallback_depth = 0
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            ancestors.append(elem)
+            if tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif tag == W_NS + "p" and not fallback_depth:
+                buffers.append([])
+            continue
+
+        ancestors.pop()
+        if tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth or not buffers:
+            pass
+        elif tag == W_NS + "t":
+            buffers[-1].append(elem.text or "")
+        elif tag == W_NS + "tab":
+            buffers[-1].append("\t")
+        elif tag in (W_NS + "br", W_NS + "cr"):
+            buffers[-1].append("\n")
+        elif tag == W_NS + "p":
+            yield "".join(buffers.pop())
+        if ancestors and ancestors[-1].tag in BLOCK_CONTAINERS:
+            ancestors[-1].remove(elem)  # Release the finished top-level block
+
+def extract_text_from_docx_fast(file_bytes):
+    """
+    Reads word/document.xml plus headers and footers straight from the zip.
+    Unlike python-docx's `doc.paragraphs`, this keeps tables and text boxes.
+    """
+    lines = []
+    with zipfile.ZipFile(io.BytesIO(file_bytes)) as zf:
+        names = zf.namelist()
+        parts = sorted(n for n in names if HEADER_PART.match(n))
+        parts.append("word/document.xml")
+        parts += sorted(n for n in names if FOOTER_PART.match(n))
+
+        seen_repeated = set()
+        for part in parts:
+            with zf.open(part) as stream:
+                part_lines = list(iter_docx_part_lines(stream))
+            if part != "word/document.xml":
+                # First-page/even/default headers often repeat the same text
+                key = tuple(part_lines)
+                if key in seen_repeated:
+                    continue
+                seen_repeated.add(key)
+            lines.extend(part_lines)
+    return "\n".join(lines)
+
+def extract_resume_layout(file_bytes, file_extension, parallel=True):
+    """
+    Returns (text, header_hints). Hints are only available for PDFs in layout
+    mode; otherwise None and sections are detected from the text alone.
+    """
+    if file_extension.lower() == ".pdf" and PDF_EXTRACTION_MODE == "layout":
+        try:
+            return extract_pdf_layout(file_bytes, parallel)
+        except Exception as e:
+            print(f"Layout PDF extraction failed, falling back to plain text: {e}")
+    return extract_resume_text(file_bytes, file_extension), None
+
 def extract_resume_text(file_bytes, file_extension):
     if file_extension.lower() == ".pdf":
         return extract_text_from_pdf(file_bytes)
     elif file_extension.lower() in [".docx", ".doc"]:
-        return extract_text_from_docx(file_bytes)
+        try:
+            return extract_text_from_docx_fast(file_bytes)
+        except (KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            print(f"Fast DOCX extraction failed, falling back to python-docx: {e}")
+            return extract_text_from_docx(file_bytes)
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
@@ -0,0 +1,91 @@
+"""
+Face Engine
+Loads the InsightFace models and turns a decoded image into a face embedding.
+Used both in the API process and inside face-inference pool workers.
+
+Only the detection and recognition modules are loaded; /verify-face never uses
+the landmark or gender/age models. The model pack and an optional INT8
+(ONNX Runtime dynamic quantization) recognition model are configurable:
+
+    FACE_MODEL_PACK=buffalo_l | buffalo_m | buffalo_s | buffalo_sc
+    FACE_RECOGNITION_INT8=1
+    FACE_MODEL_CACHE_DIR=~/.cache/true-profile
+    FACE_DET_SIZE=640
+"""
+
+import os
+import time
+from insightface.app import FaceAnalysis
+from insightface.app.common import Face
+
+from .face_quality import MIN_FACE_PIXELS, check_image_quality, select_face
+
+FACE_MODEL_PACK = os.getenv("FACE_MODEL_PACK", "buffalo_l")
+FACE_RECOGNITION_INT8 = os.getenv("FACE_RECOGNITION_INT8", "0") == "1"
+FACE_DET_SIZE = int(os.getenv("FACE_DET_SIZE", 640))
+# Derived models (the INT8 recognition model) go here, not into the model pack
+# directory, which may be read-only or shared between deployments
+FACE_MODEL_CACHE_DIR = os.path.expanduser(os.getenv("FACE_MODEL_CACHE_DIR", "~/.cache/true-profile"))
+PROVIDERS = ['CPUExecutionProvider']
+
+
+def quantize_recognition_model(model_file, cache_dir=None):
+    """
+    Writes a dynamically INT8-quantized copy of an ONNX recognition model to
+    the cache directory (once) and returns its path.
+    """
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    cache_dir = cache_dir or FACE_MODEL_CACHE_DIR
+    pack = os.path.basename(os.path.dirname(os.path.abspath(model_file)))
+    name = os.path.splitext(os.path.basename(model_file))[0]
+    int8_file = os.path.join(cache_dir, f"{pack}-{name}.int8.onnx")
+    if not os.path.exists(int8_file):
+        print(f"Quantizing {model_file} to INT8...")
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = f"{int8_file}.{os.getpid()}.tmp"
+        quantize_dynamic(model_file, tmp_file, weight_type=QuantType.QInt8)
+        os.replace(tmp_file, int8_file)
+    return int8_file
+
+
+def load_face_analyzer(pack=None, int8=None, det_size=None):
+    pack = pack or FACE_MODEL_PACK
+    int8 = FACE_RECOGNITION_INT8 if int8 is None else int8
+    det_size = det_size or FACE_DET_SIZE
+
+    analyzer = FaceAnalysis(name=pack, providers=PROVIDERS, allowed_modules=['detection', 'recognition'])
+    analyzer.prepare(ctx_id=0, det_size=(det_size, det_size))
+
+    if int8:
+        from insightface.model_zoo import get_model
+
+        recognition = get_model(quantize_recognition_model(analyzer.models['recognition'].model_file), providers=PROVIDERS)
+        recognition.prepare(ctx_id=0)
+        analyzer.models['recognition'] = recognition
+    return analyzer
+
+
+def embed_image(analyzer, img, single_face=False, quality_gate=True):
+    """
+    Returns (normed_embedding, reason, timings_ms). The quality pre-filter and
+    detection run first; recognition only runs on the largest usable face.
+    Without `quality_gate` (reference photos, which may be scans or ID
+    pictures) only a missing face is rejected.
+    """
+    timings = {}
+    started = time.perf_counter()
+    reason = check_image_quality(img) if quality_gate else None
+    if reason is None:
+        bboxes, kpss = analyzer.det_model.detect(img, max_num=0, metric='default')
+        best, reason = select_face(bboxes, single_face=single_face,
+                                   min_face_pixels=MIN_FACE_PIXELS if quality_gate else 0)
+    timings["face.prefilter"] = (time.perf_counter() - started) * 1000
+    if reason is not None:
+        return None, reason, timings
+
+    started = time.perf_counter()
+    face = Face(bbox=bboxes[best, 0:4], kps=kpss[best] if kpss is not None else None, det_score=bboxes[best, 4])
+    analyzer.models['recognition'].get(img, face)
+    timings["face.recognition"] = (time.perf_counter() - started) * 1000
+    return face.normed_embedding, None, timings
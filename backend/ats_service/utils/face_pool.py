@@ -0,0 +1,100 @@
+"""
+Face Inference Pool
+Runs InsightFace in worker processes so identity verification can use every
+core without holding the event loop or the GIL. Decoded frames are copied
+into a shared-memory ring buffer and workers receive only the slot offset and
+shape, so no image data is pickled between processes.
+"""
+
+import asyncio
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .face_quality import MAX_IMAGE_SIDE, fit_image
+
+# Per-worker state, populated by _init_worker
+_worker = {}
+
+
+def _init_worker(shm_name):
+    from .face_engine import load_face_analyzer
+
+    _worker["shm"] = shared_memory.SharedMemory(name=shm_name)
+    _worker["analyzer"] = load_face_analyzer()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _embed_slot(offset, shape, single_face, quality_gate):
+    from .face_engine import embed_image
+
+    img = np.ndarray(shape, dtype=np.uint8, buffer=_worker["shm"].buf, offset=offset)
+    try:
+        return embed_image(_worker["analyzer"], img, single_face, quality_gate)
+    finally:
+        del img  # Drop the buffer export before the next task reuses the slot
+
+
+class FaceInferencePool:
+    """
+    Process pool where each worker holds one FaceAnalysis instance and reads
+    frames from a shared ring of `slots` buffers sized for `max_side` images.
+    Build it from the serving process only (e.g. a startup hook): spawned
+    workers re-import the launching script as __mp_main__, and a pool built at
+    import time there would start its own workers and shared memory.
+    """
+
+    def __init__(self, workers, slots=None, max_side=MAX_IMAGE_SIDE):
+        self.workers = workers
+        self.slots = slots or workers * 2
+        self.max_side = max_side
+        self.slot_bytes = max_side * max_side * 3
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.slots)
+        # spawn: forking a process that already runs onnxruntime/asyncio threads is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._shm.name,),
+        )
+        self._free = None
+
+    def warm_up(self):
+        """Starts every worker (and loads its models) ahead of the first request."""
+        for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    async def embed(self, img, single_face=False, quality_gate=True):
+        """Returns (normed_embedding, reason, timings_ms) computed in a worker."""
+        if self._free is None:
+            self._free = asyncio.Queue()
+            for slot in range(self.slots):
+                self._free.put_nowait(slot)
+
+        img = fit_image(img, self.max_side)
+        loop = asyncio.get_running_loop()
+        slot = await self._free.get()
+        try:
+            offset = slot * self.slot_bytes
+            view = np.ndarray(img.shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+            view[...] = img
+            del view
+            future = self._executor.submit(_embed_slot, offset, img.shape, single_face, quality_gate)
+        except BaseException:
+            self._free.put_nowait(slot)
+            raise
+        # The slot is released only when the worker is done with it, even if
+        # the awaiting request is cancelled first
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._free.put_nowait, slot))
+        return await asyncio.wrap_future(future)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._shm.close()
+        self._shm.unlink()
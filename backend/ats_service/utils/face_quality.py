@@ -0,0 +1,91 @@
+"""
+Face Image Quality Pre-filter
+Cheap checks run on the decoded image (blur, exposure) and on detector output
+(face count, face size) so unusable selfies are rejected before the
+recognition model runs.
+"""
+
+import os
+import cv2
+import numpy as np
+
+from . import metrics
+
+BLUR_THRESHOLD = float(os.getenv("FACE_BLUR_THRESHOLD", 40.0))
+DARK_THRESHOLD = float(os.getenv("FACE_DARK_THRESHOLD", 40.0))
+BRIGHT_THRESHOLD = float(os.getenv("FACE_BRIGHT_THRESHOLD", 225.0))
+CLIPPED_FRACTION = float(os.getenv("FACE_CLIPPED_FRACTION", 0.5))
+MIN_FACE_PIXELS = int(os.getenv("FACE_MIN_SIZE_PX", 64))
+# A second face at least this fraction of the largest face's area counts as another person
+SECOND_FACE_RATIO = float(os.getenv("FACE_SECOND_FACE_RATIO", 0.4))
+QUALITY_MAX_SIDE = 640
+# Frames are downscaled to this longest side before detection, in process and
+# in the inference pool alike, so face sizes are always measured at one scale
+MAX_IMAGE_SIDE = int(os.getenv("FACE_MAX_SIDE", 1280))
+
+# Reason codes returned to clients
+REASONS = {
+    "too_blurry": "Image is too blurry. Hold the camera steady and retake the photo.",
+    "too_dark": "Image is too dark. Move to a brighter place and retake the photo.",
+    "too_bright": "Image is overexposed. Avoid direct light and retake the photo.",
+    "no_face": "No face detected in image.",
+    "face_too_small": "Face is too small. Move closer to the camera.",
+    "multiple_faces": "More than one face detected. Make sure you are alone in the photo.",
+}
+
+
+def fit_image(img, max_side=MAX_IMAGE_SIDE):
+    """Downscales a BGR image whose longest side exceeds `max_side`."""
+    h, w = img.shape[:2]
+    if max(h, w) > max_side:
+        scale = max_side / max(h, w)
+        img = cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    return img
+
+
+def check_image_quality(img):
+    """
+    Returns a reason code if the decoded BGR image is too blurry or badly
+    exposed to verify, otherwise None. Runs on a downscaled grayscale copy.
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    scale = QUALITY_MAX_SIDE / max(gray.shape[:2])
+    if scale < 1:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+    total = hist.sum()
+    mean = float(np.dot(hist, np.arange(256)) / total)
+    if mean < DARK_THRESHOLD or hist[:16].sum() / total > CLIPPED_FRACTION:
+        return "too_dark"
+    if mean > BRIGHT_THRESHOLD or hist[240:].sum() / total > CLIPPED_FRACTION:
+        return "too_bright"
+
+    if cv2.Laplacian(gray, cv2.CV_64F).var() < BLUR_THRESHOLD:
+        return "too_blurry"
+    return None
+
+
+def select_face(bboxes, single_face=False, min_face_pixels=MIN_FACE_PIXELS):
+    """
+    Picks the largest detection from an (N, 5) detector output. Returns
+    (index, reason); reason is set when no usable face is present.
+    """
+    if bboxes is None or len(bboxes) == 0:
+        return None, "no_face"
+
+    widths = bboxes[:, 2] - bboxes[:, 0]
+    heights = bboxes[:, 3] - bboxes[:, 1]
+    areas = widths * heights
+    best = int(np.argmax(areas))
+
+    if min(widths[best], heights[best]) < min_face_pixels:
+        return None, "face_too_small"
+    if single_face and np.count_nonzero(areas >= areas[best] * SECOND_FACE_RATIO) > 1:
+        return None, "multiple_faces"
+    return best, None
+
+
+def record_rejection(reason):
+    metrics.increment("face_quality.rejected")
+    metrics.increment(f"face_quality.rejected.{reason}")
@@ -0,0 +1,302 @@
+"""
+Analysis History Store
+Append-only columnar storage for analysis results. Every column is a flat
+binary file read back through np.memmap, so scans touch only the columns and
+records a query needs and memory stays flat at millions of records.
+
+Per record (68 bytes + 4 per term, instead of a multi-KB JSON blob):
+    timestamp.i8     epoch seconds when the analysis ran
+    score.f4         ATS score
+    features.i4      scoring.FEATURES row, so history can be re-scored with new weights
+    resume_id.u8     dedup resume id
+    term_offsets.i8  end offset of the record's terms in term_ids (CSR layout)
+    term_ids.u4      interned skill/keyword ids; terms.txt holds one term per line
+
+Several worker processes may share one directory: flushes hold an exclusive
+lock on the directory and first pick up the terms and records other workers
+wrote, so term ids and offsets stay consistent. Records keep their true
+timestamps, so workers' flushes interleave in time; queries binary-search an
+in-memory time-sorted index of the records (16 bytes each), which is extended
+by merging in the newly flushed records rather than rebuilt.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only one process may write a history directory
+    fcntl = None
+
+from .scoring import FEATURES, score_matrix
+
+ANALYSIS_HISTORY_DIR = os.getenv("ANALYSIS_HISTORY_DIR", "")
+FLUSH_EVERY = int(os.getenv("ANALYSIS_HISTORY_FLUSH_EVERY", 256))
+
+COLUMNS = {
+    "timestamp": (np.int64, 1),
+    "score": (np.float32, 1),
+    "features": (np.int32, len(FEATURES)),
+    "resume_id": (np.uint64, 1),
+    "term_offsets": (np.int64, 1),
+}
+PERIODS = {"day": "D", "week": "W", "month": "M", "year": "Y"}
+
+
+def to_epoch(value):
+    """ISO date/datetime string (e.g. 2024-01-31) to epoch seconds; raises ValueError."""
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+
+class AnalysisHistory:
+    def __init__(self, path, flush_every=FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = Lock()
+        self._pending = []
+        self._sorted_ts = np.empty(0, np.int64)    # Timestamps in time order...
+        self._order = np.empty(0, np.int64)        # ...and the records they belong to
+        os.makedirs(path, exist_ok=True)
+
+        meta_file = os.path.join(path, "meta.json")
+        if os.path.exists(meta_file):
+            with open(meta_file) as f:
+                if json.load(f)["features"] != FEATURES:
+                    raise ValueError(f"{path} was written with a different feature layout")
+        else:
+            with open(meta_file, "w") as f:
+                json.dump({"features": FEATURES}, f)
+
+        self.terms = []
+        self.term_ids = {}
+        self._terms_bytes = 0
+        self.size = 0
+        with self._locked():
+            self._repair()
+            self._sync()
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock on the directory across worker processes."""
+        with open(os.path.join(self.path, "history.lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rows_on_disk(self, name):
+        dtype, width = COLUMNS[name]
+        file = self._file(name)
+        return os.path.getsize(file) // (np.dtype(dtype).itemsize * width) if os.path.exists(file) else 0
+
+    def _repair(self):
+        """Truncates columns to the last complete record after an interrupted flush."""
+        self.size = min(self._rows_on_disk(name) for name in COLUMNS)
+        for name, (dtype, width) in COLUMNS.items():
+            if os.path.exists(self._file(name)):
+                os.truncate(self._file(name), self.size * np.dtype(dtype).itemsize * width)
+        terms_end = int(self._column("term_offsets")[-1]) if self.size else 0
+        with open(self._file("term_ids"), "ab") as f:
+            f.truncate(terms_end * np.dtype(np.uint32).itemsize)
+        with open(os.path.join(self.path, "terms.txt"), "ab+") as f:
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)  # Drop a partly written last term
+
+    def _sync(self):
+        """Picks up terms and records flushed by other processes (under the lock)."""
+        with open(os.path.join(self.path, "terms.txt"), "rb") as f:
+            f.seek(self._terms_bytes)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]
+        for term in data.decode("utf-8").split("\n")[:-1]:
+            self.term_ids[term] = len(self.terms)
+            self.terms.append(term)
+        self._terms_bytes += len(data)
+        self.size = min(self._rows_on_disk(name) for name in COLUMNS)
+
+    def _column(self, name, n=None):
+        n = self.size if n is None else n
+        if name == "term_ids":
+            return np.memmap(self._file(name), dtype=np.uint32, mode="r", shape=(n,)) if n else np.empty(0, np.uint32)
+        dtype, width = COLUMNS[name]
+        if n == 0:
+            return np.empty((0, width) if width > 1 else 0, dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(n, width) if width > 1 else (n,))
+
+    def append(self, score, features, terms, resume_id, timestamp=None):
+        with self._lock:
+            ts = int(timestamp if timestamp is not None else time.time())
+            # Terms get their ids at flush time, once other workers' terms are known
+            terms = [term.replace("\n", " ") for term in terms]
+            self._pending.append((ts, score, features, int(resume_id, 16) if resume_id else 0, terms))
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def flush(self):
+        """Writes pending records and picks up those of other workers."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        with self._locked():
+            self._sync()
+            if self._pending:
+                self._write(self._pending)
+            self._pending = []
+
+    def _write(self, pending):
+        new_terms = []
+        records = []
+        for ts, score, features, resume_id, terms in sorted(pending, key=lambda p: p[0]):
+            ids = []
+            for term in terms:
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = self.term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                    new_terms.append(term)
+                ids.append(term_id)
+            records.append((ts, score, features, resume_id, ids))
+        pending = records
+        if new_terms:
+            data = "".join(t + "\n" for t in new_terms).encode("utf-8")
+            with open(os.path.join(self.path, "terms.txt"), "ab") as f:
+                f.write(data)
+            self._terms_bytes += len(data)
+
+        lengths = np.array([len(p[4]) for p in pending], dtype=np.int64)
+        base = int(self._column("term_offsets")[-1]) if self.size else 0
+        columns = {
+            "term_ids": np.array([i for p in pending for i in p[4]], dtype=np.uint32),
+            "timestamp": np.array([p[0] for p in pending], dtype=np.int64),
+            "score": np.array([p[1] for p in pending], dtype=np.float32),
+            "features": np.array([p[2] for p in pending], dtype=np.int32).reshape(len(pending), len(FEATURES)),
+            "resume_id": np.array([p[3] for p in pending], dtype=np.uint64),
+            # Offsets last: a record only counts once its offset is written
+            "term_offsets": base + np.cumsum(lengths),
+        }
+        for name, values in columns.items():
+            with open(self._file(name), "ab") as f:
+                f.write(values.tobytes())
+        self.size += len(pending)
+
+    # --- Queries ---
+    def _time_index(self):
+        """Merges records flushed since the last query into the time-sorted index (under the lock)."""
+        indexed = len(self._order)
+        if indexed == self.size:
+            return
+        new_ts = np.asarray(self._column("timestamp")[indexed:])
+        new_order = np.argsort(new_ts, kind="stable")
+        ts = np.concatenate([self._sorted_ts, new_ts[new_order]])
+        order = np.concatenate([self._order, new_order + indexed])
+        merge = np.argsort(ts, kind="stable")  # Two sorted runs: linear time
+        self._sorted_ts, self._order = ts[merge], order[merge]
+
+    def _range(self, start=None, end=None):
+        """(record indices, timestamps) in time order with start <= timestamp < end (epoch seconds)."""
+        with self._lock:
+            self._flush()
+            self._time_index()
+            ts, order = self._sorted_ts, self._order
+        lo = int(np.searchsorted(ts, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(ts, end, side="left")) if end is not None else len(ts)
+        return order[lo:hi], ts[lo:hi]
+
+    def _buckets(self, ts, period):
+        labels, inverse = np.unique(ts.astype("datetime64[s]").astype(f"datetime64[{PERIODS[period]}]"), return_inverse=True)
+        return [str(label) for label in labels], inverse
+
+    def score_distribution(self, start=None, end=None, bins=10, period=None, weights=None):
+        """
+        Histogram and percentiles of scores in [start, end), optionally split by
+        period. With `weights`, stored features are re-scored instead.
+        """
+        rows, ts = self._range(start, end)
+        n = int(rows.max()) + 1 if len(rows) else 0
+        if weights is not None:
+            scores = score_matrix(np.asarray(self._column("features", n)[rows], dtype=np.float64), weights)
+        else:
+            scores = np.asarray(self._column("score", n)[rows], dtype=np.float64)
+        edges = np.linspace(0, 100, bins + 1)
+
+        def summarize(values):
+            if len(values) == 0:
+                return {"count": 0}
+            p25, p50, p75, p90 = np.percentile(values, [25, 50, 75, 90])
+            return {
+                "count": int(len(values)),
+                "mean": round(float(values.mean()), 2),
+                "p25": round(float(p25), 1), "p50": round(float(p50), 1),
+                "p75": round(float(p75), 1), "p90": round(float(p90), 1),
+                "histogram": np.histogram(values, bins=edges)[0].tolist(),
+            }
+
+        result = dict(summarize(scores), bin_edges=edges.tolist())
+        if period and len(scores):
+            labels, inverse = self._buckets(ts, period)
+            order = np.argsort(inverse, kind="stable")
+            splits = np.cumsum(np.bincount(inverse))[:-1]
+            result["periods"] = [dict(summarize(group), period=label)
+                                 for label, group in zip(labels, np.split(scores[order], splits))]
+        return result
+
+    def skill_frequencies(self, start=None, end=None, top=20, period=None):
+        """Most frequent terms in [start, end), with the share of resumes listing them."""
+        rows, ts = self._range(start, end)
+        if not len(rows):
+            return {"count": 0, "skills": []}
+        offsets = self._column("term_offsets", int(rows.max()) + 1)
+        ends = np.asarray(offsets[rows])
+        starts = np.where(rows > 0, np.asarray(offsets[np.maximum(rows - 1, 0)]), 0)
+        lengths = ends - starts
+        # Term positions of every selected record, in the order of `rows`
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        ids = np.asarray(self._column("term_ids", int(ends.max()))[positions])
+        counts = np.bincount(ids, minlength=len(self.terms))
+        best = np.argsort(counts)[::-1][:top]
+        total = len(rows)
+        result = {
+            "count": total,
+            "skills": [{"skill": self.terms[i], "resumes": int(counts[i]), "share": round(float(counts[i]) / total, 4)}
+                       for i in best if counts[i] > 0],
+        }
+        if period:
+            labels, inverse = self._buckets(ts, period)
+            # Map each term occurrence back to its record's period
+            occurrence_bucket = np.repeat(inverse, lengths)
+            per_period = np.zeros((len(labels), len(best)), dtype=np.int64)
+            for col, term_id in enumerate(best):
+                per_period[:, col] = np.bincount(occurrence_bucket[ids == term_id], minlength=len(labels))
+            records = np.bincount(inverse, minlength=len(labels))
+            result["periods"] = [
+                {"period": label, "count": int(records[b]),
+                 "skills": {self.terms[term_id]: int(per_period[b, col]) for col, term_id in enumerate(best) if counts[term_id] > 0}}
+                for b, label in enumerate(labels)
+            ]
+        return result
+
+
+def open_history(path=ANALYSIS_HISTORY_DIR):
+    if not path:
+        return None
+    try:
+        return AnalysisHistory(path)
+    except Exception as e:
+        print(f"Warning: Analysis history disabled: {e}")
+        return None
+
+
+analysis_history = open_history()
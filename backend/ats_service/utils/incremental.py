@@ -0,0 +1,155 @@
+"""
+Incremental Resume Analysis
+Splits a resume into chunks and caches NER entities, header classification
+and skill matches per chunk hash, so re-uploading a lightly edited resume
+only re-runs spaCy on the chunks that actually changed.
+
+PDF text has no blank lines, so chunks are not paragraphs: a chunk starts at
+every section header and after every CHUNK_LINES lines within a section. An
+edited line invalidates only its own chunk; an inserted or deleted line only
+the rest of its section.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock
+
+from . import analyzer
+
+CHUNK_CACHE_SIZE = int(os.getenv("ATS_CHUNK_CACHE_SIZE", 4096))
+CHUNK_LINES = int(os.getenv("ATS_CHUNK_LINES", 8))
+
+
+class ChunkCache:
+    """Thread-safe LRU cache of per-chunk analysis results."""
+
+    def __init__(self, max_entries=CHUNK_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+chunk_cache = ChunkCache()
+
+
+def split_chunks(text, header_hints=None, max_lines=CHUNK_LINES):
+    """
+    Splits text into chunks of non-empty lines, keeping line order. A chunk
+    ends before a section header (regex or layout hint), at a blank line, or
+    after `max_lines` lines.
+    """
+    chunks, current = [], []
+    for line in text.split('\n'):
+        clean_line = line.strip()
+        if not clean_line:
+            if current:
+                chunks.append('\n'.join(current))
+                current = []
+            continue
+        is_header = (header_hints is not None and clean_line in header_hints) or analyzer.classify_header(clean_line)
+        if current and (is_header or len(current) >= max_lines):
+            chunks.append('\n'.join(current))
+            current = []
+        current.append(clean_line)
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+def analyze_chunk(chunk):
+    """Runs the per-chunk parts of extract_information on one chunk."""
+    orgs, dates = [], []
+    for ent in analyzer.nlp(chunk).ents:
+        if ent.label_ == "ORG":
+            orgs.append(ent.text)
+        elif ent.label_ == "DATE":
+            dates.append(ent.text)
+
+    lines = []
+    for line in chunk.split('\n'):
+        clean_line = line.strip()
+        if clean_line:
+            lines.append((clean_line, analyzer.classify_header(clean_line)))
+
+    return {
+        "orgs": orgs,
+        "dates": dates,
+        "lines": lines,
+        "skills": analyzer.match_skills(chunk.lower()),
+    }
+
+
+def extract_information_incremental(text, cache=chunk_cache, header_hints=None):
+    """
+    Drop-in replacement for extract_information. Section and skill results are
+    identical; NER runs per chunk rather than over the whole document.
+    """
+    if not analyzer.nlp: return {"error": "Natural Language Processing engine (spaCy) not loaded"}
+
+    if not analyzer.is_resume(text):
+        return {"error": "Invalid Document: This does not appear to be a professional Resume or CV. Please ensure you upload a document with clear sections like Education, Experience, and Skills."}
+
+    extracted_data = {
+        "skills": [],
+        "education": [],
+        "experience": [],
+        "projects": [],
+        "certifications": [],
+        "entities": {"orgs": [], "dates": [], "titles": []},
+        "keywords": []
+    }
+
+    current_section = None
+    taxonomy_skills = []
+    hint_sections = analyzer.resolve_header_hints(header_hints)
+    for chunk in split_chunks(text, header_hints):
+        key = hashlib.sha1(chunk.encode("utf-8")).hexdigest()
+        result = cache.get(key)
+        if result is None:
+            result = analyze_chunk(chunk)
+            cache.put(key, result)
+
+        extracted_data["entities"]["orgs"].extend(result["orgs"])
+        extracted_data["entities"]["dates"].extend(result["dates"])
+        taxonomy_skills.extend(result["skills"])
+
+        # Section state carries across chunks, so it is replayed in order
+        for clean_line, header in result["lines"]:
+            if hint_sections is not None:
+                if clean_line in hint_sections:
+                    current_section = hint_sections[clean_line]
+                    continue
+                header = None
+            if header:
+                current_section = header
+            elif current_section:
+                extracted_data[current_section].append(clean_line)
+
+    extracted_data["skills"] = list(set(extracted_data["skills"] + taxonomy_skills))
+    extracted_data["keywords"] = analyzer.extract_keywords(text, extracted_data["skills"])
+    extracted_data["experience_months"] = analyzer.experience_months(extracted_data["experience"])
+
+    return extracted_data
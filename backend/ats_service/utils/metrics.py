@@ -0,0 +1,55 @@
+"""
+Service Metrics
+Minimal in-process counters and timing summaries, exposed as JSON at /metrics.
+"""
+
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+_lock = Lock()
+_counters = {}
+_timings = {}
+
+
+def increment(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name, value):
+    """Records one sample (e.g. a latency in ms) for `name`."""
+    with _lock:
+        stats = _timings.get(name)
+        if stats is None:
+            _timings[name] = {"count": 1, "total": value, "max": value}
+        else:
+            stats["count"] += 1
+            stats["total"] += value
+            stats["max"] = max(stats["max"], value)
+
+
+@contextmanager
+def timer(name):
+    """Observes the elapsed milliseconds of the wrapped block under `name`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - started) * 1000)
+
+
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "timings_ms": {
+                name: {
+                    "count": s["count"],
+                    "avg": round(s["total"] / s["count"], 3),
+                    "max": round(s["max"], 3),
+                    "total": round(s["total"], 3),
+                }
+                for name, s in _timings.items()
+            },
+        }
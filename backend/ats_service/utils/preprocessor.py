@@ -1,14 +1,21 @@
 import re
 
+# 9-15 digits, at most two separator characters apart ("+1 (555) 123-4567",
+# "0300-1234567"). It never starts inside a number or date, and never at a
+# year range, so "2015 - 2018" or "2015-2018 2019-2021" stay for experience parsing.
+PHONE_PATTERN = re.compile(
+    r'(?<![\w/.-])(?!(?:19|20)\d{2}\s*[-–]\s*(?:19|20)\d{2}\b)\+?\(?\d(?:[ ().-]{0,2}\d){8,14}(?!\w)'
+)
+
 def preprocess_text(text):
     """Bias Reduction: Removes Emails/Phone to focus on merit while preserving structure."""
     text = re.sub(r'\S+@\S+', '[EMAIL_REMOVED]', text)
-    text = re.sub(r'\+?\d[\d -]{8,12}\d', '[PHONE_REMOVED]', text)
+    text = PHONE_PATTERN.sub('[PHONE_REMOVED]', text)
     # Clean up horizontal whitespace but preserve newlines
     text = re.sub(r'[ \t]+', ' ', text)
     return text.strip()
 
 def clean_for_nlp(text):
     text = re.sub(r'\S+@\S+', '', text)
-    text = re.sub(r'\+?\d[\d -]{8,12}\d', '', text)
+    text = PHONE_PATTERN.sub('', text)
     return text.strip()
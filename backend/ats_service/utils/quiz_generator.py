@@ -1,63 +1,78 @@
 """
 Quiz Question Generator
 This module generates skill-specific quiz questions for various technical domains.
+Questions are served from the per-skill pools in quiz_pool; the built-in
+questions seed those pools and the background builder tops them up.
 """
 
 import random
 from typing import List, Dict, Any
-import os
+
+from .quiz_pool import question_bank, pool_builder
 
 class QuizGenerator:
     """Generate quiz questions for skill verification"""
     
-    def __init__(self):
+    def __init__(self, bank=None, builder=None):
         """Initialize the quiz generator"""
-        self.api_key = os.getenv('OPENAI_API_KEY', '')
+        self.bank = bank or question_bank
+        self.builder = builder or pool_builder
+        self.skill_map = {
+            'python': self._get_python_questions,
+            'javascript': self._get_javascript_questions,
+            'js': self._get_javascript_questions,
+            'java': self._get_java_questions,
+            'flutter': self._get_flutter_questions,
+            'react': self._get_react_questions,
+            'node.js': self._get_nodejs_questions,
+            'nodejs': self._get_nodejs_questions,
+            'data science': self._get_datascience_questions,
+            'machine learning': self._get_ml_questions,
+            'artificial intelligence': self._get_ai_questions,
+            'ai': self._get_ai_questions,
+            'sql': self._get_sql_questions,
+            'aws': self._get_aws_questions,
+            'data structures': self._get_ds_questions,
+            'algorithms': self._get_algo_questions,
+            'operating systems': self._get_os_questions,
+            'computer networks': self._get_networks_questions,
+            'cybersecurity': self._get_cyber_questions,
+            'c++': self._get_cpp_questions,
+            'cpp': self._get_cpp_questions,
+            'c#': self._get_csharp_questions,
+            'php': self._get_php_questions,
+            'go': self._get_go_questions,
+            'rust': self._get_rust_questions,
+            'devops': self._get_devops_questions,
+            'software testing': self._get_testing_questions,
+        }
+        # Aliases share one pool, keyed by the first name listed for them
+        self.canonical = {}
+        for name, getter in self.skill_map.items():
+            self.canonical.setdefault(getter.__func__, name)
         
+    def _pool_key(self, skill_lower: str) -> str:
+        getter = self.skill_map.get(skill_lower)
+        return self.canonical[getter.__func__] if getter else skill_lower
+
     def generate_questions(self, skill: str, num_questions: int = 10) -> List[Dict[str, Any]]:
         """
-        Generate questions for the requested skill
+        Generate questions for the requested skill from its pool; never waits on the LLM
         """
         try:
-            skill_map = {
-                'python': self._get_python_questions,
-                'javascript': self._get_javascript_questions,
-                'js': self._get_javascript_questions,
-                'java': self._get_java_questions,
-                'flutter': self._get_flutter_questions,
-                'react': self._get_react_questions,
-                'node.js': self._get_nodejs_questions,
-                'nodejs': self._get_nodejs_questions,
-                'data science': self._get_datascience_questions,
-                'machine learning': self._get_ml_questions,
-                'artificial intelligence': self._get_ai_questions,
-                'ai': self._get_ai_questions,
-                'sql': self._get_sql_questions,
-                'aws': self._get_aws_questions,
-                'data structures': self._get_ds_questions,
-                'algorithms': self._get_algo_questions,
-                'operating systems': self._get_os_questions,
-                'computer networks': self._get_networks_questions,
-                'cybersecurity': self._get_cyber_questions,
-                'c++': self._get_cpp_questions,
-                'cpp': self._get_cpp_questions,
-                'c#': self._get_csharp_questions,
-                'php': self._get_php_questions,
-                'go': self._get_go_questions,
-                'rust': self._get_rust_questions,
-                'devops': self._get_devops_questions,
-                'software testing': self._get_testing_questions,
-            }
-            
             skill_lower = skill.lower().strip()
+            key = self._pool_key(skill_lower)
+            label = skill
             
-            if skill_lower in skill_map:
-                questions = skill_map[skill_lower]()
-            else:
-                questions = self._get_generic_questions(skill)
+            if skill_lower in self.skill_map:
+                builtin = self.skill_map[skill_lower]()
+                label = builtin[0]['skill']
+                if self.bank.size(key) == 0:
+                    self.bank.add(key, label, builtin, source='builtin')
             
-            # CRITICAL: Shuffle the pool before picking
-            random.shuffle(questions)
+            # Random picks from the pool (already de-duplicated)
+            questions = [dict(q) for q in self.bank.sample(key, num_questions)]
+            self.builder.request_refill(key, label, known=skill_lower in self.skill_map)
             
             # If we have less than num_questions, fill with generic ones to ensure pool size
             if len(questions) < num_questions:
@@ -311,6 +326,15 @@ class QuizGenerator:
             {'question': f'Version control in {skill} is for?', 'options': ['Privacy', 'Tracking changes', 'Speed', 'Formatting'], 'answer': 1, 'skill': skill},
         ]
 
+def prepare_question_pools() -> None:
+    """Seeds every built-in skill pool and queues background refills for low ones"""
+    generator = QuizGenerator()
+    for getter, key in generator.canonical.items():
+        builtin = getter(generator)
+        if generator.bank.size(key) == 0:
+            generator.bank.add(key, builtin[0]['skill'], builtin, source='builtin')
+        generator.builder.request_refill(key, builtin[0]['skill'], known=True)
+
 def generate_quiz(skill: str, num_questions: int = 10) -> Dict[str, Any]:
     """Main function to generate quiz questions"""
     generator = QuizGenerator()
@@ -0,0 +1,302 @@
+"""
+Quiz Question Pools
+A persistent bank of validated, de-duplicated quiz questions per skill, served
+from memory, and a background builder that tops pools up through an LLM when
+they run low. The request path only samples from the in-memory pool and never
+waits on the LLM.
+
+Generation is spent only on skills with built-in questions, TECH_SKILLS
+entries, and other skills once they have been asked for
+QUIZ_POOL_MIN_REQUESTS times, and never beyond QUIZ_GENERATIONS_PER_HOUR
+LLM batches per process.
+
+    QUIZ_LLM_BACKEND=openai | stub | none   (default: openai if OPENAI_API_KEY is set)
+    QUIZ_BANK_PATH=quiz_bank.db
+"""
+
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from threading import Lock
+
+from . import metrics
+from .analyzer import TECH_SKILLS
+
+QUIZ_BANK_PATH = os.getenv("QUIZ_BANK_PATH", "quiz_bank.db")
+QUIZ_LLM_BACKEND = os.getenv("QUIZ_LLM_BACKEND", "openai" if os.getenv("OPENAI_API_KEY") else "none")
+QUIZ_LLM_MODEL = os.getenv("QUIZ_LLM_MODEL", "gpt-3.5-turbo")
+POOL_TARGET = int(os.getenv("QUIZ_POOL_TARGET", 60))
+POOL_LOW_WATERMARK = int(os.getenv("QUIZ_POOL_LOW_WATERMARK", 30))
+BATCH_SIZE = int(os.getenv("QUIZ_POOL_BATCH", 10))
+MIN_REQUESTS = int(os.getenv("QUIZ_POOL_MIN_REQUESTS", 3))
+GENERATIONS_PER_HOUR = int(os.getenv("QUIZ_GENERATIONS_PER_HOUR", 120))
+MAX_EMPTY_BATCHES = 3           # Give up on a refill after this many batches add nothing new
+MAX_PENDING_REFILLS = 100
+MAX_TRACKED_SKILLS = 10_000     # Request counts kept for skills outside the taxonomy
+
+_SKILL_NAME = re.compile(r"^[a-z0-9][a-z0-9 .+#/-]{0,39}$")
+_NORMALIZE = re.compile(r"[^a-z0-9+#]+")
+
+
+def question_key(question):
+    """Hash of the normalized question text, used to de-duplicate."""
+    return hashlib.sha1(_NORMALIZE.sub(" ", question.lower()).strip().encode("utf-8")).hexdigest()[:16]
+
+
+def validate_question(item):
+    """Returns a clean question dict, or None if the item is malformed."""
+    if not isinstance(item, dict):
+        return None
+    question, options, answer = item.get("question"), item.get("options"), item.get("answer")
+    if not isinstance(question, str) or not 10 <= len(question.strip()) <= 300:
+        return None
+    if not isinstance(options, list) or len(options) != 4:
+        return None
+    options = [o.strip() for o in options if isinstance(o, str) and o.strip() and len(o) <= 150]
+    if len(options) != 4 or len({o.lower() for o in options}) != 4:
+        return None
+    if isinstance(answer, str) and answer.strip().isdigit():
+        answer = int(answer)
+    if not isinstance(answer, int) or isinstance(answer, bool) or not 0 <= answer < 4:
+        return None
+    return {"question": question.strip(), "options": options, "answer": answer}
+
+
+class QuestionBank:
+    """SQLite-backed question store with per-skill pools kept in memory."""
+
+    def __init__(self, path=QUIZ_BANK_PATH):
+        self.path = path
+        self._lock = Lock()
+        self._pools = {}
+        self._keys = {}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            " skill TEXT, qkey TEXT, label TEXT, question TEXT, options TEXT, answer INTEGER,"
+            " source TEXT, created REAL, PRIMARY KEY (skill, qkey))"
+        )
+        for skill, qkey, label, question, options, answer in self._db.execute(
+                "SELECT skill, qkey, label, question, options, answer FROM questions"):
+            self._append(skill, qkey, {"question": question, "options": json.loads(options), "answer": answer, "skill": label})
+
+    def _append(self, skill, qkey, question):
+        self._pools.setdefault(skill, []).append(question)
+        self._keys.setdefault(skill, set()).add(qkey)
+
+    def size(self, skill):
+        return len(self._pools.get(skill, ()))
+
+    def sample(self, skill, k):
+        """Up to k distinct random questions; O(k) regardless of pool size."""
+        pool = self._pools.get(skill, [])
+        return random.sample(pool, min(k, len(pool)))
+
+    def add(self, skill, label, questions, source):
+        """Validates and stores new questions; returns how many were added."""
+        rows = []
+        with self._lock:
+            for item in questions:
+                question = validate_question(item)
+                if question is None:
+                    metrics.increment("quiz_pool.rejected_invalid")
+                    continue
+                qkey = question_key(question["question"])
+                if qkey in self._keys.get(skill, ()):
+                    metrics.increment("quiz_pool.rejected_duplicate")
+                    continue
+                question["skill"] = label
+                self._append(skill, qkey, question)
+                rows.append((skill, qkey, label, question["question"], json.dumps(question["options"]),
+                             question["answer"], source, time.time()))
+            if rows:
+                self._db.executemany("INSERT OR IGNORE INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.commit()
+        return len(rows)
+
+    def stats(self):
+        return {skill: len(pool) for skill, pool in self._pools.items()}
+
+
+class OpenAIQuestionSource:
+    def __init__(self, model=QUIZ_LLM_MODEL):
+        import openai
+
+        self._client = openai
+        self.model = model
+
+    def generate(self, skill, n):
+        prompt = f"""
+        Write {n} distinct multiple-choice questions that test practical knowledge of {skill}.
+        Mix difficulty levels and avoid trivia about history or people.
+
+        Return a JSON object {{"questions": [...]}} where each question has:
+        - "question": the question text
+        - "options": exactly 4 distinct answer options
+        - "answer": the 0-based index of the single correct option
+        """
+        response = self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a technical interviewer writing skill assessment quizzes."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.9,
+        )
+        return json.loads(response.choices[0].message.content).get("questions", [])
+
+
+class StubQuestionSource:
+    """Deterministic offline stand-in for the LLM, for local runs and tests."""
+
+    def __init__(self, seed=0):
+        self._rng = random.Random(seed)
+
+    def generate(self, skill, n):
+        questions = []
+        for _ in range(n):
+            topic = self._rng.randint(1, 10_000)
+            answer = self._rng.randint(0, 3)
+            questions.append({
+                "question": f"Which statement about {skill} topic #{topic} is correct?",
+                "options": [f"Statement {topic}-{i}" for i in range(4)],
+                "answer": answer,
+            })
+        return questions
+
+
+def create_question_source(backend=QUIZ_LLM_BACKEND):
+    if backend == "openai":
+        try:
+            return OpenAIQuestionSource()
+        except ImportError:
+            print("Warning: openai package not installed. Quiz pools will not be refilled.")
+            return None
+    if backend == "stub":
+        return StubQuestionSource()
+    return None
+
+
+class PoolBuilder:
+    """
+    Background thread refilling skill pools. `request_refill` is cheap and
+    non-blocking, so it can be called from the request path.
+    """
+
+    def __init__(self, bank, source, target=POOL_TARGET, low_watermark=POOL_LOW_WATERMARK, batch_size=BATCH_SIZE,
+                 known_skills=None, min_requests=MIN_REQUESTS, generations_per_hour=GENERATIONS_PER_HOUR):
+        self.bank = bank
+        self.source = source
+        self.target = target
+        self.low_watermark = low_watermark
+        self.batch_size = batch_size
+        if known_skills is None:
+            known_skills = [skill for skills in TECH_SKILLS.values() for skill in skills]
+        self.known_skills = frozenset(known_skills)
+        self.min_requests = min_requests
+        self.generations_per_hour = generations_per_hour
+        self._queue = queue.Queue(maxsize=MAX_PENDING_REFILLS)
+        self._pending = set()
+        self._demand = {}
+        self._generations = deque()
+        self._lock = Lock()
+        self._thread = None
+
+    def start(self):
+        if self.source is None or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="quiz-pool-builder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _in_demand(self, skill):
+        """Counts a request for a skill outside the taxonomy; True once it has enough."""
+        count = self._demand.get(skill, 0) + 1
+        if skill not in self._demand and len(self._demand) >= MAX_TRACKED_SKILLS:
+            del self._demand[next(iter(self._demand))]
+        self._demand[skill] = count
+        return count >= self.min_requests
+
+    def _budget_left(self):
+        cutoff = time.monotonic() - 3600
+        while self._generations and self._generations[0] < cutoff:
+            self._generations.popleft()
+        return len(self._generations) < self.generations_per_hour
+
+    def _spend(self):
+        """Reserves one LLM batch from the hourly budget; False when it is used up."""
+        with self._lock:
+            if not self._budget_left():
+                metrics.increment("quiz_pool.budget_exhausted")
+                return False
+            self._generations.append(time.monotonic())
+            return True
+
+    def request_refill(self, skill, label, known=False):
+        """
+        Queues a refill if the pool is below the low watermark. Skills that are
+        neither `known` (have built-in questions) nor in the taxonomy only
+        qualify after `min_requests` requests.
+        """
+        if self.source is None or self.bank.size(skill) >= self.low_watermark or not _SKILL_NAME.match(skill):
+            return False
+        with self._lock:
+            if skill in self._pending or not self._budget_left():
+                return False
+            if not known and skill not in self.known_skills and not self._in_demand(skill):
+                return False
+            try:
+                self._queue.put_nowait((skill, label))
+            except queue.Full:
+                return False
+            self._pending.add(skill)
+        self.start()
+        return True
+
+    def refill(self, skill, label):
+        """Generates batches until the pool reaches its target (runs in the builder thread)."""
+        empty_batches = 0
+        while self.bank.size(skill) < self.target and empty_batches < MAX_EMPTY_BATCHES:
+            if not self._spend():
+                print(f"Quiz pool generation budget of {self.generations_per_hour}/hour used up, {label} not refilled")
+                return
+            started = time.perf_counter()
+            try:
+                generated = self.source.generate(label, self.batch_size)
+            except Exception as e:
+                print(f"Quiz pool generation failed for {label}: {e}")
+                metrics.increment("quiz_pool.generation_errors")
+                return
+            metrics.observe("quiz_pool.generation", (time.perf_counter() - started) * 1000)
+            added = self.bank.add(skill, label, generated, source=type(self.source).__name__)
+            metrics.increment("quiz_pool.added", added)
+            empty_batches = 0 if added else empty_batches + 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            skill, label = item
+            try:
+                self.refill(skill, label)
+            finally:
+                with self._lock:
+                    self._pending.discard(skill)
+
+
+question_bank = QuestionBank()
+pool_builder = PoolBuilder(question_bank, create_question_source())
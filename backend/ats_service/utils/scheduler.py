@@ -0,0 +1,259 @@
+"""
+Request Scheduler
+Separates interactive traffic from bulk screening: requests wait in per-lane
+queues for a limited number of execution slots, lanes share slots by weight
+(weighted fair queuing), and each client is rate limited per lane with a token
+bucket held in a pluggable store.
+
+Clients are identified by their API key (`X-Api-Key`, when it is one of
+`SCHEDULER_API_KEYS`) or else by peer address, never by a header they can
+change freely. Only the server-side key mapping moves a client to another lane.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import deque
+from threading import Lock
+
+from fastapi import HTTPException, Request
+
+from . import metrics
+
+MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", os.cpu_count() or 2))
+MAX_WAIT_SECONDS = float(os.getenv("SCHEDULER_MAX_WAIT_SECONDS", 30))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SWEEP_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", 60))
+
+# weight: share of slots under contention; max_queue: admission limit;
+# rate/burst: per-client token bucket (requests per second / bucket size)
+LANES = {
+    "interactive": {"weight": 8, "max_queue": 64, "rate": 2.0, "burst": 10},
+    "identity": {"weight": 4, "max_queue": 32, "rate": 1.0, "burst": 5},
+    "bulk": {"weight": 1, "max_queue": 256, "rate": 10.0, "burst": 100},
+}
+
+
+def parse_api_keys(value):
+    """`key:lane,key:lane` -> {key: lane}; entries naming an unknown lane are skipped."""
+    keys = {}
+    for entry in value.split(","):
+        key, _, lane = entry.strip().rpartition(":")
+        if not key:
+            continue
+        if lane not in LANES:
+            print(f"Warning: Ignoring SCHEDULER_API_KEYS entry for unknown lane '{lane}'")
+            continue
+        keys[key] = lane
+    return keys
+
+
+# Server-side lane assignment, e.g. SCHEDULER_API_KEYS=recruiter-batch-key:bulk
+API_KEY_LANES = parse_api_keys(os.getenv("SCHEDULER_API_KEYS", ""))
+
+
+class MemoryRateLimitStore:
+    """
+    Token buckets in a local dict. Also the stand-in for shared stores in tests.
+    Buckets that have refilled completely are indistinguishable from new ones,
+    so a sweep every `sweep_seconds` drops them and the dict only holds clients
+    seen within the last burst/rate seconds.
+    """
+
+    def __init__(self, sweep_seconds=RATE_LIMIT_SWEEP_SECONDS):
+        self._buckets = {}
+        self._lock = Lock()
+        self.sweep_seconds = sweep_seconds
+        self._last_sweep = time.monotonic()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _sweep(self, now):
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[2] > now}
+        self._last_sweep = now
+
+    async def take(self, key, rate, burst):
+        """Takes one token. Returns (allowed, retry_after_seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_seconds:
+                self._sweep(now)
+            tokens, updated, _ = self._buckets.get(key, (burst, now, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # (tokens, updated, time at which the bucket is full again)
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            return (True, 0.0) if allowed else (False, (1 - tokens) / rate)
+
+
+class RedisRateLimitStore:
+    """
+    Token buckets shared by every worker and instance through Redis, using the
+    asyncio client so a slow Redis never blocks the event loop.
+    """
+
+    SCRIPT = """
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then tokens = tokens - 1; allowed = 1 end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url):
+        from redis import asyncio as redis
+
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(self.SCRIPT)
+
+    async def take(self, key, rate, burst):
+        allowed, tokens = await self._take(keys=[f"ratelimit:{key}"], args=[rate, burst, time.time()])
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate
+
+
+def create_rate_limit_store(backend=RATE_LIMIT_BACKEND):
+    if backend == "redis":
+        return RedisRateLimitStore(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    return MemoryRateLimitStore()
+
+
+class LaneScheduler:
+    """
+    Grants up to `concurrency` execution slots. When slots are contended, the
+    waiting lane with the lowest virtual time (slots served / weight) goes
+    next, so a flood of bulk work cannot starve interactive requests.
+    """
+
+    def __init__(self, lanes=LANES, concurrency=MAX_CONCURRENCY, max_wait=MAX_WAIT_SECONDS):
+        self.lanes = lanes
+        self.concurrency = concurrency
+        self.max_wait = max_wait
+        self._active = 0
+        self._waiters = {lane: deque() for lane in lanes}
+        self._virtual = {lane: 0.0 for lane in lanes}
+        self._clock = 0.0
+        self._active_by_lane = {lane: 0 for lane in lanes}
+        self._stats = {lane: {"admitted": 0, "rejected_queue_full": 0, "rejected_timeout": 0} for lane in lanes}
+
+    def _grant(self, lane):
+        self._active += 1
+        self._active_by_lane[lane] += 1
+        self._clock = self._virtual[lane]
+        self._virtual[lane] += 1 / self.lanes[lane]["weight"]
+        self._stats[lane]["admitted"] += 1
+
+    def _dispatch(self):
+        while self._active < self.concurrency:
+            waiting = [lane for lane, queue in self._waiters.items() if queue]
+            if not waiting:
+                return
+            lane = min(waiting, key=lambda l: self._virtual[l])
+            future, _ = self._waiters[lane].popleft()
+            if future.done():
+                continue  # Timed out or cancelled while queued
+            self._grant(lane)
+            future.set_result(lane)
+
+    async def acquire(self, lane):
+        queue = self._waiters[lane]
+        if self._active < self.concurrency and not any(self._waiters.values()):
+            self._grant(lane)
+            metrics.observe(f"scheduler.wait.{lane}", 0.0)
+            return
+
+        if len(queue) >= self.lanes[lane]["max_queue"]:
+            self._stats[lane]["rejected_queue_full"] += 1
+            raise HTTPException(status_code=503, detail="Server is busy, please retry shortly.", headers={"Retry-After": "1"})
+
+        if not queue:
+            # A lane returning from idle starts at the current virtual time
+            # instead of spending credit it built up while idle
+            self._virtual[lane] = max(self._virtual[lane], self._clock)
+        future = asyncio.get_running_loop().create_future()
+        queue.append((future, time.perf_counter()))
+        self._dispatch()  # Slots may be free if the queues only held stale entries
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                self.release(lane)  # Slot was granted as we gave up
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._stats[lane]["rejected_timeout"] += 1
+            raise HTTPException(status_code=503, detail="Request timed out waiting in queue.", headers={"Retry-After": "5"})
+        finally:
+            metrics.observe(f"scheduler.wait.{lane}", (time.perf_counter() - started) * 1000)
+
+    def release(self, lane):
+        self._active -= 1
+        self._active_by_lane[lane] -= 1
+        self._dispatch()
+
+    def stats(self):
+        now = time.perf_counter()
+        lanes = {}
+        for lane, queue in self._waiters.items():
+            pending = [queued_at for future, queued_at in queue if not future.done()]
+            lanes[lane] = dict(
+                self._stats[lane],
+                weight=self.lanes[lane]["weight"],
+                queue_depth=len(pending),
+                active=self._active_by_lane[lane],
+                oldest_wait_ms=round((now - min(pending)) * 1000, 1) if pending else 0.0,
+            )
+        return {"concurrency": self.concurrency, "active": self._active, "lanes": lanes}
+
+
+scheduler = LaneScheduler()
+rate_limit_store = create_rate_limit_store()
+
+
+def client_identity(request, api_keys=None):
+    """
+    (rate limit identity, assigned lane or None). A configured API key is the
+    identity (hashed, so keys never reach the store); anything else is keyed
+    on the peer address. Behind a reverse proxy, run uvicorn with
+    `--proxy-headers --forwarded-allow-ips` so that is the client's address.
+    """
+    api_keys = API_KEY_LANES if api_keys is None else api_keys
+    key = request.headers.get("x-api-key")
+    if key and key in api_keys:
+        return f"key:{hashlib.sha256(key.encode()).hexdigest()[:16]}", api_keys[key]
+    return f"ip:{request.client.host if request.client else 'unknown'}", None
+
+
+def admission(default_lane):
+    """
+    FastAPI dependency: rate-limits the client, then holds a scheduler slot in
+    the request's lane for the duration of the endpoint. Clients whose API key
+    is mapped to a lane in `SCHEDULER_API_KEYS` always run in that lane.
+    """
+    async def dependency(request: Request):
+        identity, assigned_lane = client_identity(request)
+        lane = assigned_lane or default_lane
+        config = LANES[lane]
+        allowed, retry_after = await rate_limit_store.take(f"{lane}:{identity}", config["rate"], config["burst"])
+        if not allowed:
+            metrics.increment(f"scheduler.rate_limited.{lane}")
+            raise HTTPException(status_code=429, detail="Rate limit exceeded.", headers={"Retry-After": str(max(1, round(retry_after)))})
+
+        await scheduler.acquire(lane)
+        try:
+            yield lane
+        finally:
+            scheduler.release(lane)
+    return dependency
@@ -0,0 +1,58 @@
+"""
+Response Models
+Pydantic models for the API responses. They document the schema in OpenAPI
+and their serializers are compiled once at import; endpoints return
+FastJSONResponse directly so responses are not re-validated per request.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class NearDuplicate(BaseModel):
+    resume_id: str
+    similarity: float
+
+
+class ATSResponse(BaseModel):
+    resume_score: float
+    skills_detected: List[str]
+    sections_found: List[str]
+    strengths: List[str]
+    weaknesses: List[str]
+    suggestions: List[str]
+    ats_feedback: str
+    experience_years: float = 0.0
+    status: str
+    resume_id: Optional[str] = None
+    near_duplicate: Optional[NearDuplicate] = None
+
+
+class QuizQuestion(BaseModel):
+    question: str
+    options: List[str]
+    answer: int
+    skill: str
+
+
+class QuizResponse(BaseModel):
+    status: str
+    skill: str
+    total_questions: int
+    passing_score: int
+    questions: List[QuizQuestion]
+
+
+class RejectedReference(BaseModel):
+    index: int
+    filename: Optional[str] = None
+    reason: str
+
+
+class VerifyFaceResponse(BaseModel):
+    verified: bool
+    confidence: Optional[float] = None
+    error: Optional[str] = None
+    reason: Optional[str] = None
+    rejected_references: List[RejectedReference] = []
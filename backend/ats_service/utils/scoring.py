@@ -0,0 +1,132 @@
+"""
+Batch ATS Scoring
+Columnar version of `calculate_ats_score`: extracted resumes are turned into a
+NumPy feature matrix once, then any weight configuration can be scored over
+thousands of resumes in a single vectorized pass.
+"""
+
+import re
+import numpy as np
+
+REQUIRED_SECTIONS = ["education", "experience", "skills"]
+OPTIONAL_SECTIONS = ["projects", "certifications", "summary"]
+EDU_INDICATORS = ["degree", "bachelor", "master", "phd", "university", "college", "gpa", "graduate", "b.tech", "m.tech", "b.e", "b.s", "diploma", "certified"]
+ACTION_VERBS = ["developed", "led", "managed", "built", "implemented", "scaled", "optimized", "increased", "decreased", "saved", "launched", "automated", "mentored", "created", "designed", "performed", "achieved"]
+
+# Points and targets used by calculate_ats_score (JustScreen methodology)
+DEFAULT_WEIGHTS = {
+    "structure_base": 5,        # Any section found
+    "structure_required": 15,   # Share of required sections
+    "structure_optional": 5,    # Share of optional sections
+    "skills": 35,
+    "skills_target": 8,
+    "education_base": 5,
+    "education_content": 10,
+    "education_target": 2,
+    "verbs": 15,
+    "verbs_target": 5,
+    "metrics": 10,
+    "metrics_fallback": 5,
+    "short_penalty": 0.8,
+    "short_word_limit": 50,
+    "experience": 0,            # Points for total experience (off in calculate_ats_score)
+    "experience_target_months": 60,
+}
+
+# Feature matrix columns
+FEATURES = [
+    "required_found",
+    "optional_found",
+    "skill_count",
+    "has_education",
+    "edu_indicator_count",
+    "has_experience",
+    "verb_count",
+    "has_metrics",
+    "word_count",
+    "is_error",
+    "experience_months",
+]
+COL = {name: i for i, name in enumerate(FEATURES)}
+
+_PERCENT_RE = re.compile(r'\d+%')
+_NUMBER_RE = re.compile(r'\d+')
+
+
+def extract_features(extracted_data, raw_text):
+    """Reduces one extract_information() result to a row of FEATURES."""
+    if "error" in extracted_data:
+        row = [0.0] * len(FEATURES)
+        row[COL["is_error"]] = 1.0
+        return row
+
+    edu_text = " ".join(extracted_data.get("education", [])).lower()
+    exp_lines = extracted_data.get("experience", []) + extracted_data.get("projects", [])
+    exp_text = " ".join(exp_lines).lower()
+    has_metrics = _PERCENT_RE.search(exp_text) is not None or len(_NUMBER_RE.findall(exp_text)) > 2
+
+    return [
+        sum(1 for s in REQUIRED_SECTIONS if len(extracted_data.get(s, [])) > 0),
+        sum(1 for s in OPTIONAL_SECTIONS if len(extracted_data.get(s, [])) > 0),
+        len(extracted_data.get("skills", [])),
+        1 if len(extracted_data.get("education", [])) > 0 else 0,
+        sum(1 for i in EDU_INDICATORS if i in edu_text),
+        1 if len(exp_lines) > 0 else 0,
+        sum(1 for v in ACTION_VERBS if v in exp_text),
+        1 if has_metrics else 0,
+        len(raw_text.split()),
+        0,
+        extracted_data.get("experience_months", 0),
+    ]
+
+
+def build_feature_matrix(records):
+    """
+    Builds a (n_resumes, len(FEATURES)) float64 matrix from an iterable of
+    (extracted_data, raw_text) pairs.
+    """
+    rows = [extract_features(data, text) for data, text in records]
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(FEATURES))
+
+
+def score_matrix(features, weights=None):
+    """
+    Scores every row of a feature matrix. The arithmetic follows
+    calculate_ats_score step by step, so default weights give identical scores.
+    """
+    w = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    f = features
+
+    required = f[:, COL["required_found"]]
+    optional = f[:, COL["optional_found"]]
+
+    score = np.where((required > 0) | (optional > 0), float(w["structure_base"]), 0.0)
+    structure = (required / len(REQUIRED_SECTIONS)) * w["structure_required"]
+    structure = structure + (optional / len(OPTIONAL_SECTIONS)) * w["structure_optional"]
+    score = score + structure
+
+    score = score + np.minimum((f[:, COL["skill_count"]] / w["skills_target"]) * w["skills"], w["skills"])
+
+    base_edu = f[:, COL["has_education"]] * w["education_base"]
+    edu_content = np.minimum((f[:, COL["edu_indicator_count"]] / w["education_target"]) * w["education_content"], w["education_content"])
+    score = score + (base_edu + edu_content)
+
+    verb_points = np.minimum((f[:, COL["verb_count"]] / w["verbs_target"]) * w["verbs"], w["verbs"])
+    metric_points = np.where(f[:, COL["has_metrics"]] > 0, float(w["metrics"]), float(w["metrics_fallback"]))
+    metric_points = np.where(f[:, COL["has_experience"]] > 0, metric_points, 0.0)
+    score = score + (verb_points + metric_points)
+    score = score + np.minimum((f[:, COL["experience_months"]] / w["experience_target_months"]) * w["experience"], w["experience"])
+
+    score = np.where(f[:, COL["word_count"]] < w["short_word_limit"], score * w["short_penalty"], score)
+    score = np.minimum(score, 100)
+    return np.where(f[:, COL["is_error"]] > 0, 0.0, score)
+
+
+def round_scores(scores):
+    """Rounds like Python's round(x, 1); np.round can differ on .x5 ties."""
+    return [round(float(s), 1) for s in scores]
+
+
+def batch_ats_scores(records, weights=None):
+    """Convenience wrapper: feature extraction + vectorized scoring + rounding."""
+    return round_scores(score_matrix(build_feature_matrix(records), weights))
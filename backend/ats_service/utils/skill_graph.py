@@ -0,0 +1,201 @@
+"""
+Skill Co-occurrence Graph
+Sparse counts of how often a term (TECH_SKILLS entry or RAKE keyword) appears
+in the same analyzed resume as a TECH_SKILLS entry, updated as resumes arrive.
+Rows only hold suggestable (taxonomy) columns, so memory grows with
+terms x taxonomy size rather than terms squared. Each term keeps
+a cached list of its strongest neighbours, so "which related skills are
+missing" is answered by merging a handful of short rows.
+
+Only TECH_SKILLS entries are suggested; keywords add context (e.g. "machine
+learning" pointing to pytorch) but are too noisy to recommend.
+
+Workers sharing SKILL_GRAPH_PATH merge their counts into the file under an
+exclusive lock instead of overwriting each other's.
+"""
+
+import os
+import re
+from contextlib import contextmanager
+from threading import Lock
+
+import numpy as np
+
+from .analyzer import TECH_SKILLS
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves from several workers are not serialized
+    fcntl = None
+
+SKILL_GRAPH_PATH = os.getenv("SKILL_GRAPH_PATH", "")
+MAX_TERMS = int(os.getenv("SKILL_GRAPH_MAX_TERMS", 5000))
+MIN_RESUMES = int(os.getenv("SKILL_GRAPH_MIN_RESUMES", 20))   # No suggestions before this many resumes
+MIN_COOCCURRENCE = 3
+NEIGHBOURS_PER_TERM = 10
+
+TAXONOMY = [skill for skills in TECH_SKILLS.values() for skill in skills]
+_TAXONOMY_SET = frozenset(TAXONOMY)
+_KEYWORD = re.compile(r"^[a-z][a-z0-9+#. -]{1,38}[a-z0-9+#]$")
+
+
+def resume_terms(extracted_data):
+    """Distinct graph terms of one analysis: taxonomy skills plus short keywords."""
+    terms = {s for s in extracted_data.get("skills", []) if s in _TAXONOMY_SET}
+    for keyword in extracted_data.get("keywords", []):
+        keyword = keyword.lower().strip()
+        if _KEYWORD.match(keyword) and len(keyword.split()) <= 3:
+            terms.add(keyword)
+    return terms
+
+
+class SkillGraph:
+    def __init__(self, max_terms=MAX_TERMS):
+        self._lock = Lock()
+        self.max_terms = max_terms
+        self.ids = {}
+        self.terms = []
+        self.doc_freq = []
+        self.rows = []              # term id -> {suggestable neighbour id: co-occurrence count}
+        self._neighbours = {}       # term id -> [(neighbour id, confidence)], rebuilt lazily
+        self.resumes = 0
+        # Counts added since the graph was loaded or last saved, merged into the file on save
+        self._pending_rows = {}
+        self._pending_df = {}
+        self._pending_resumes = 0
+        for skill in TAXONOMY:
+            self._intern(skill)
+        self.suggestable = frozenset(range(len(TAXONOMY)))
+
+    def _intern(self, term):
+        term_id = self.ids.get(term)
+        if term_id is None and len(self.terms) < self.max_terms:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+            self.doc_freq.append(0)
+            self.rows.append({})
+        return term_id
+
+    def add_resume(self, terms):
+        """Counts every (term, taxonomy skill) pair in one resume. O(k * s) for k terms, s skills."""
+        with self._lock:
+            ids = [i for i in (self._intern(t) for t in terms) if i is not None]
+            skill_ids = [j for j in ids if j in self.suggestable]
+            self.resumes += 1
+            self._pending_resumes += 1
+            for i in ids:
+                self.doc_freq[i] += 1
+                self._pending_df[i] = self._pending_df.get(i, 0) + 1
+                row = self.rows[i]
+                pending = self._pending_rows.setdefault(i, {})
+                for j in skill_ids:
+                    if j != i:
+                        row[j] = row.get(j, 0) + 1
+                        pending[j] = pending.get(j, 0) + 1
+                # Other rows keep their cached ranking until they change themselves
+                self._neighbours.pop(i, None)
+
+    def _top_neighbours(self, i):
+        """Suggestable neighbours of term i ranked by P(j | i), kept only when j is over-represented (lift > 1)."""
+        cached = self._neighbours.get(i)
+        if cached is None:
+            df_i = self.doc_freq[i]
+            scored = [
+                (j, count / df_i) for j, count in self.rows[i].items()
+                if count >= MIN_COOCCURRENCE
+                and count * self.resumes > df_i * self.doc_freq[j]
+            ]
+            cached = self._neighbours[i] = sorted(scored, key=lambda x: x[1], reverse=True)[:NEIGHBOURS_PER_TERM]
+        return cached
+
+    def related_missing(self, terms, k=5):
+        """TECH_SKILLS entries most associated with `terms` that `terms` lacks."""
+        if self.resumes < MIN_RESUMES:
+            return []
+        with self._lock:
+            present = {self.ids[t] for t in terms if t in self.ids}
+            scores = {}
+            for i in present:
+                for j, confidence in self._top_neighbours(i):
+                    if j not in present:
+                        scores[j] = scores.get(j, 0.0) + confidence
+            best = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k]
+            return [self.terms[j] for j, _ in best]
+
+    def save(self, path):
+        """
+        Adds the counts collected since the last load or save to the graph on
+        disk, which other workers may have updated meanwhile, writes the result
+        and adopts it, so every worker ends up with everyone's counts.
+        """
+        with _locked(path), self._lock:
+            merged = load_skill_graph(path) if os.path.exists(path) else SkillGraph(self.max_terms)
+            remap = [merged._intern(term) for term in self.terms]
+            merged.resumes += self._pending_resumes
+            for i, df in self._pending_df.items():
+                if remap[i] is not None:
+                    merged.doc_freq[remap[i]] += df
+            for i, pending in self._pending_rows.items():
+                if remap[i] is None:
+                    continue
+                row = merged.rows[remap[i]]
+                for j, count in pending.items():
+                    row[remap[j]] = row.get(remap[j], 0) + count
+            merged._write(path)
+
+            self.ids, self.terms, self.doc_freq, self.rows = merged.ids, merged.terms, merged.doc_freq, merged.rows
+            self.resumes = merged.resumes
+            self._neighbours = {}
+            self._pending_rows, self._pending_df, self._pending_resumes = {}, {}, 0
+
+    def _write(self, path):
+        pairs = [(i, j, c) for i, row in enumerate(self.rows) for j, c in row.items()]
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 3)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:  # A file object keeps np.savez from appending .npz
+            np.savez(f, terms=np.array(self.terms), doc_freq=np.array(self.doc_freq, dtype=np.int64),
+                     pairs=pairs, resumes=np.array(self.resumes))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        graph = cls()
+        with np.load(path) as data:
+            remap = []
+            for term in data["terms"]:
+                term_id = graph._intern(str(term))
+                remap.append(-1 if term_id is None else term_id)
+            for old, df in enumerate(data["doc_freq"]):
+                if remap[old] >= 0:
+                    graph.doc_freq[remap[old]] = int(df)
+            for i, j, count in data["pairs"]:
+                # Files from before rows were limited to taxonomy columns may hold keyword pairs
+                if remap[i] >= 0 and remap[j] in graph.suggestable:
+                    graph.rows[remap[i]][int(remap[j])] = int(count)
+            graph.resumes = int(data["resumes"])
+        return graph
+
+
+@contextmanager
+def _locked(path):
+    """Exclusive lock on `<path>.lock` across processes."""
+    with open(f"{path}.lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def load_skill_graph(path=SKILL_GRAPH_PATH):
+    if path and os.path.exists(path):
+        try:
+            return SkillGraph.load(path)
+        except Exception as e:
+            print(f"Warning: Could not load skill graph from {path}: {e}")
+    return SkillGraph()
+
+
+skill_graph = load_skill_graph()
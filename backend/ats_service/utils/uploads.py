@@ -0,0 +1,144 @@
+"""
+Upload Limits
+Streams multipart uploads in chunks while enforcing per-file and per-request
+byte limits, and identifies file types from their magic bytes.
+"""
+
+import io
+import os
+import zipfile
+
+from fastapi import HTTPException
+
+MAX_FILE_BYTES = int(os.getenv("MAX_UPLOAD_FILE_BYTES", 10 * 1024 * 1024))
+MAX_REQUEST_BYTES = int(os.getenv("MAX_UPLOAD_REQUEST_BYTES", 25 * 1024 * 1024))
+CHUNK_SIZE = 64 * 1024
+
+# Magic-byte signatures -> canonical file type
+SIGNATURES = [
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "zip"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "ole"),  # Legacy .doc / .xls
+]
+
+RESUME_TYPES = {"pdf": ".pdf", "docx": ".docx"}
+IMAGE_TYPES = {"jpeg", "png", "webp", "bmp"}
+
+
+def _is_docx(data):
+    """DOCX, unlike other OOXML (xlsx, pptx), has a word/document.xml part. Reads only the central directory."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            return "word/document.xml" in zf.namelist()
+    except (zipfile.BadZipFile, ValueError):
+        return False
+
+
+def sniff_file_type(data):
+    """Returns the file type implied by the leading bytes, or None if unknown."""
+    head = bytes(data[:16])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:2] == b"BM":
+        return "bmp"
+    for signature, kind in SIGNATURES:
+        if head.startswith(signature):
+            if kind == "zip":
+                return "docx" if _is_docx(data) else "zip"
+            return kind
+    return None
+
+
+class UploadBudget:
+    """Tracks bytes read across all files of a single request."""
+
+    def __init__(self, limit=MAX_REQUEST_BYTES):
+        self.limit = limit
+        self.used = 0
+
+    def consume(self, n):
+        self.used += n
+        if self.used > self.limit:
+            raise HTTPException(status_code=413, detail=f"Request exceeds the {self.limit // (1024 * 1024)}MB upload limit.")
+
+
+async def read_upload(file, budget=None, limit=MAX_FILE_BYTES):
+    """
+    Reads an UploadFile in chunks, failing fast once the per-file or
+    per-request limit is crossed. The chunks are joined into bytes once;
+    PyMuPDF and np.frombuffer use bytes as is, where a bytearray would be
+    copied again.
+    """
+    size = getattr(file, "size", None)
+    if size is not None and size > limit:
+        raise HTTPException(status_code=413, detail=f"File '{file.filename}' exceeds the {limit // (1024 * 1024)}MB limit.")
+
+    chunks, received = [], 0
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(status_code=413, detail=f"File '{file.filename}' exceeds the {limit // (1024 * 1024)}MB limit.")
+        if budget is not None:
+            budget.consume(len(chunk))
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware rejecting request bodies larger than `max_bytes` before
+    they are fully received: by Content-Length up front, and by counting
+    streamed chunks for chunked uploads.
+    """
+
+    def __init__(self, app, max_bytes=MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                return await self._reject(send)
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Surfaces through FastAPI's exception handling as a 413
+                    raise HTTPException(status_code=413, detail="Request body too large.")
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await self._reject(send)
+
+    async def _reject(self, send):
+        body = b'{"detail":"Request body too large."}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
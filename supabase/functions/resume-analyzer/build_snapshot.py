@@ -0,0 +1,34 @@
+"""
+Builds pipeline_state.pkl, the prepared analyzer state loaded on cold start.
+Run it at deploy time, with the same spaCy version the function installs:
+
+    pip install -r requirements.txt
+    python -m spacy download en_core_web_sm
+    python build_snapshot.py [--out pipeline_state.pkl] [--model en_core_web_sm]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.pipeline_state import SNAPSHOT_PATH, SPACY_MODEL, build_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=SNAPSHOT_PATH)
+    parser.add_argument("--model", default=SPACY_MODEL)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    state = build_snapshot(args.out, args.model)
+    print(f"Wrote {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s")
+    print(f"  stopwords + punctuation: {len(state['to_ignore'])}")
+    print(f"  spaCy {state['spacy_version']}, {args.model} NER, {len(state['spacy_bytes']) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Local cold-start harness for the resume-analyzer function.
+
+Each trial starts a fresh Python process that imports the function package
+the way the edge runtime does and calls its entry point with a resume upload,
+once cold and once warm. Trials run with the prepared snapshot and with live
+preparation (no snapshot), optionally asking for NER entities. Reports
+medians of:
+
+    process   interpreter start until the function module is imported
+    init      module import time as measured by the function (INIT_MS)
+    first     first (cold) request
+    warm      second request on the same instance
+    ready     process start until the first response
+
+Usage:
+    python build_snapshot.py
+    python cold_start_harness.py [--trials 5] [--resume resume.pdf] [--entities]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+FUNCTION_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in the fresh process. `serve` is replaced with a pass-through so the
+# handler can be called directly, as the runtime would on a request.
+CHILD = r"""
+import time
+process_started = float(__import__("sys").argv[1])
+import asyncio, importlib.util, json, sys, types
+
+shim = types.ModuleType("supabase_functions")
+shim.serve = lambda handler: handler
+sys.modules["supabase_functions"] = shim
+
+function_dir, resume_path, filename, entities = sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5] == "1"
+spec = importlib.util.spec_from_file_location(
+    "resume_analyzer", f"{function_dir}/__init__.py", submodule_search_locations=[function_dir])
+package = importlib.util.module_from_spec(spec)
+sys.modules["resume_analyzer"] = package
+from resume_analyzer import main as function
+imported = time.time()
+
+from starlette.requests import Request
+
+with open(resume_path, "rb") as f:
+    body = f.read()
+
+def request():
+    headers = [(b"x-filename", filename.encode()), (b"content-type", b"application/octet-stream")]
+    if entities:
+        headers.append((b"x-include-entities", b"1"))
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "query_string": b""}, receive)
+
+timings = {"process": (imported - process_started) * 1000, "init": function.INIT_MS,
+           "source": function.pipeline.source}
+for name in ("first", "warm"):
+    started = time.perf_counter()
+    response = asyncio.run(function.main(request()))
+    timings[name] = (time.perf_counter() - started) * 1000
+    if name == "first":
+        timings["ready"] = (time.time() - process_started) * 1000
+        timings["status"] = response.status_code
+        timings["server_timing"] = response.headers.get("server-timing", "")
+        if response.status_code != 200:
+            timings["error"] = response.body.decode()
+print("HARNESS " + json.dumps(timings))
+"""
+
+
+def sample_resume(path):
+    import fitz
+
+    lines = [
+        "EXPERIENCE", "Software Engineer at Acme Corp, Berlin (2019 - 2023)",
+        "Developed and managed data pipelines in Python. Built CI with Docker.",
+        "EDUCATION", "Bachelor of Science in Computer Science, University of Lahore",
+        "SKILLS", "Python, SQL, Docker, Kubernetes, React, Flutter",
+        "PROJECTS", "Implemented a resume screening service with FastAPI and spaCy.",
+    ]
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(lines):
+        page.insert_text((50, 60 + 18 * i), line, fontsize=11)
+    doc.save(path)
+
+
+def run_trial(resume, snapshot, entities):
+    env = dict(os.environ, ANALYZER_SNAPSHOT=snapshot)
+    env.pop("OPENAI_API_KEY", None)  # Measure the function, not the LLM call
+    args = [sys.executable, "-c", CHILD, repr(time.time()), FUNCTION_DIR, resume, os.path.basename(resume),
+            "1" if entities else "0"]
+    out = subprocess.run(args, env=env, capture_output=True, text=True, cwd=tempfile.gettempdir())
+    for line in out.stdout.splitlines():
+        if line.startswith("HARNESS "):
+            return json.loads(line[len("HARNESS "):])
+    raise RuntimeError(f"Trial failed:\n{out.stdout}\n{out.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--resume", help="PDF or DOCX to upload (default: a generated one-page PDF)")
+    parser.add_argument("--snapshot", default=os.path.join(FUNCTION_DIR, "pipeline_state.pkl"))
+    parser.add_argument("--entities", action="store_true", help="Also measure requests that ask for NER entities")
+    args = parser.parse_args()
+
+    resume = args.resume
+    if resume is None:
+        resume = os.path.join(tempfile.mkdtemp(), "resume.pdf")
+        sample_resume(resume)
+    if not os.path.exists(args.snapshot):
+        print(f"No snapshot at {args.snapshot}; run build_snapshot.py first. Measuring live preparation only.")
+
+    modes = [("snapshot", args.snapshot, False), ("live", os.devnull + ".missing", False)]
+    if args.entities:
+        modes += [("snapshot+ner", args.snapshot, True), ("live+ner", os.devnull + ".missing", True)]
+
+    columns = ("process", "init", "first", "warm", "ready")
+    print(f"{'mode':<14} {'loaded from':<12}" + "".join(f"{c + ' ms':>12}" for c in columns))
+    for name, snapshot, entities in modes:
+        if name.startswith("snapshot") and not os.path.exists(snapshot):
+            continue
+        trials = [run_trial(resume, snapshot, entities) for _ in range(args.trials)]
+        medians = [statistics.median(t[c] for t in trials) for c in columns]
+        print(f"{name:<14} {trials[0]['source']:<12}" + "".join(f"{m:>12.1f}" for m in medians))
+        if "error" in trials[0]:
+            print(f"{'':<14} status {trials[0]['status']}: {trials[0]['error']}")
+        else:
+            print(f"{'':<14} Server-Timing: {trials[0]['server_timing']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+import time
+_init_started = time.perf_counter()
+
 from supabase_functions import serve
-from fastapi import Request, Response
+# fastapi.Request/Response re-export these; importing fastapi itself adds ~0.3s to cold start
+from starlette.requests import Request
+from starlette.responses import Response
 import os
 import json
 
@@ -7,6 +12,22 @@ from .utils.extractor import extract_resume_text
 from .utils.preprocessor import preprocess_text
 from .utils.analyzer import extract_information, calculate_ats_score
 from .utils.explainer import generate_feedback, get_fallback_feedback
+from .utils.pipeline_state import pipeline
+
+# Module import time of this instance, reported with its first request
+INIT_MS = (time.perf_counter() - _init_started) * 1000
+_cold = True
+
+def server_timing(started, cold, ner_loaded):
+    handler_ms = (time.perf_counter() - started) * 1000
+    timings = [f"handler;dur={handler_ms:.1f}"]
+    if cold:
+        timings.append(f"init;dur={INIT_MS:.1f}")
+        timings.append(f'pipeline;dur={pipeline.timings["load_ms"]:.1f};desc="{pipeline.source}"')
+        print(f"Cold start: init {INIT_MS:.0f}ms (pipeline from {pipeline.source}), first request {handler_ms:.0f}ms")
+    if ner_loaded:
+        timings.append(f'ner_load;dur={pipeline.timings["ner_load_ms"]:.1f}')
+    return {"Server-Timing": ", ".join(timings)}
 
 # This is the entry point for the Supabase Edge Function
 @serve
@@ -14,6 +35,11 @@ async def main(req: Request):
     if req.method == "OPTIONS":
         return Response(status_code=204)
 
+    global _cold
+    started = time.perf_counter()
+    cold, _cold = _cold, False
+    ner_was_loaded = "ner_load_ms" in pipeline.timings
+
     try:
         # Read raw bytes directly from request body
         content = await req.body()
@@ -26,8 +52,8 @@ async def main(req: Request):
             )
 
         # Detect extension from header (passed from Flutter)
-        extension = req.headers.get("x-filename", "resume.pdf").lower()
-        if not extension.endswith(".pdf") and not extension.endswith(".docx"):
+        extension = os.path.splitext(req.headers.get("x-filename", "resume.pdf").lower())[1]
+        if extension not in (".pdf", ".docx"):
             # fallback based on basic magic check or default
             extension = ".pdf"
 
@@ -37,8 +63,9 @@ async def main(req: Request):
         # 2. Preprocessing (Bias Reduction)
         clean_text = preprocess_text(raw_text)
         
-        # 3. NLP Extraction
-        extracted_data = extract_information(clean_text)
+        # 3. NLP Extraction (NER only when the client asks for entities)
+        include_entities = req.headers.get("x-include-entities", "").lower() in ("1", "true")
+        extracted_data = extract_information(clean_text, include_entities)
         
         # 4. ATS Scoring
         score, sections_found = calculate_ats_score(extracted_data, clean_text)
@@ -63,10 +90,14 @@ async def main(req: Request):
             "ats_feedback": feedback.get("summary", ""),
             "status": "success"
         }
+        if include_entities:
+            result["entities"] = extracted_data.get("entities", [])
 
+        ner_loaded = not ner_was_loaded and "ner_load_ms" in pipeline.timings
         return Response(
             content=json.dumps(result),
-            media_type="application/json"
+            media_type="application/json",
+            headers=server_timing(started, cold, ner_loaded)
         )
 
     except Exception as e:
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the function's modules the way build_snapshot.py does (`from utils.x import ...`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
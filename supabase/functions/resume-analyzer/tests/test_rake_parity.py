@@ -0,0 +1,65 @@
+"""
+rake_keywords replaces rake_nltk on the request path, and the keyword count
+feeds 35 points of the ATS score, so its ranked phrases must match rake_nltk's.
+"""
+
+import string
+
+import pytest
+
+Rake = pytest.importorskip("rake_nltk").Rake
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+from utils.pipeline_state import prepare_state, rake_keywords
+from utils.preprocessor import preprocess_text
+
+STOPWORDS = {"a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "is", "it", "of", "on", "or", "the",
+             "to", "was", "were", "with", "i", "my", "we", "our", "this", "that", "over", "than", "then"}
+
+SAMPLE_RESUMES = [
+    """EXPERIENCE
+    Senior Software Engineer, Acme Inc. (Jan. 2019 - Present)
+    - Led a team of 6 engineers building data pipelines in Python and Spark.
+    - Reduced batch costs by 35% with Spark... Migrated CI to GitHub Actions!
+    - Developed a REST API (Flask), deployed on AWS; mentored 4 juniors.
+    EDUCATION
+    B.Sc. Computer Science, University of Lahore, 2014 - 2018. GPA 3.6/4.0.
+    SKILLS
+    Python, SQL, Docker, Kubernetes, React, Node.js, C++, e.g. pandas and NumPy.""",
+    """Jane Doe - Data Scientist. Worked with Dr. Smith at the U.S. office on NLP models.
+    PROJECTS: Built an open-source Airflow plugin (v2.0.1). Why? To cut on-call load by 50%.
+    Certifications: AWS Certified Solutions Architect; TensorFlow Developer. Languages: English, Urdu.""",
+    """SUMMARY Full-stack developer. 5+ years. Flutter & Dart apps with 100k+ installs.
+    EXPERIENCE Mobile Lead at Foo Co. 2020-2023 • Implemented offline sync • Created design system.
+    Managed releases for iOS and Android... etc. Thanks.""",
+]
+
+
+def ranked(text, **rake_args):
+    rake = Rake(**rake_args)
+    rake.extract_keywords_from_text(text)
+    return rake.get_ranked_phrases()[:15]
+
+
+@pytest.mark.parametrize("resume", SAMPLE_RESUMES, ids=["engineer", "data-scientist", "mobile"])
+def test_matches_rake_nltk_with_untrained_punkt(resume):
+    """Needs no NLTK data: punkt without learned parameters, a fixed stopword list."""
+    text = preprocess_text(resume)
+    expected = ranked(text, stopwords=STOPWORDS, punctuations=set(string.punctuation),
+                      sentence_tokenizer=PunktSentenceTokenizer().tokenize)
+    assert rake_keywords(text, frozenset(STOPWORDS | set(string.punctuation)), frozenset()) == expected
+
+
+@pytest.mark.parametrize("resume", SAMPLE_RESUMES, ids=["engineer", "data-scientist", "mobile"])
+def test_matches_rake_nltk_defaults(resume):
+    """The snapshot's inputs against rake_nltk's own defaults (NLTK stopwords, trained punkt)."""
+    import nltk
+
+    try:
+        nltk.data.find("corpora/stopwords")
+        nltk.data.find("tokenizers/punkt_tab/english")
+    except LookupError:
+        pytest.skip("NLTK stopwords and punkt_tab data are not installed")
+    state = prepare_state()
+    text = preprocess_text(resume)
+    assert rake_keywords(text, state["to_ignore"], state["abbreviations"]) == ranked(text)
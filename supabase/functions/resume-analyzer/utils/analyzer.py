@@ -1,35 +1,21 @@
-import spacy
-from rake_nltk import Rake
-import json
-import nltk
+from .pipeline_state import pipeline
 
-# Download NLTK data
-try:
-    nltk.download('stopwords', quiet=True)
-    nltk.download('punkt', quiet=True)
-except:
-    pass
+SECTIONS = ["EDUCATION", "EXPERIENCE", "PROJECTS", "SKILLS", "CERTIFICATIONS"]
 
-# Load spaCy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    nlp = None
-
-def extract_information(text):
-    if not nlp: return {"error": "spaCy model not loaded"}
-    doc = nlp(text)
+def extract_information(text, include_entities=False):
     extracted_data = {"skills": [], "education": [], "experience": [], "projects": [], "keywords": []}
-    
-    r = Rake()
-    r.extract_keywords_from_text(text)
-    extracted_data["keywords"] = r.get_ranked_phrases()[:15]
-    
-    sections = ["EDUCATION", "EXPERIENCE", "PROJECTS", "SKILLS", "CERTIFICATIONS"]
+    extracted_data["keywords"] = pipeline.keywords(text)
+
+    # NER is only loaded and run for requests that ask for entities
+    if include_entities:
+        nlp = pipeline.nlp
+        ents = nlp(text).ents if nlp else []
+        extracted_data["entities"] = [{"text": ent.text, "label": ent.label_} for ent in ents]
+
     current_section = None
     for line in text.split('\n'):
         clean_line = line.strip().upper()
-        if any(section in clean_line for section in sections):
+        if any(section in clean_line for section in SECTIONS):
             current_section = clean_line
             continue
         if current_section:
@@ -1,12 +1,15 @@
 import os
-import openai
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 def generate_feedback(score, extracted_data):
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         return get_fallback_feedback(score, extracted_data)
-    
+
+    # Imported on first use: openai is the slowest import of the function
+    import openai
+    openai.api_key = OPENAI_API_KEY
+
     prompt = f"Analyze resume with score {score}/100 and data {extracted_data}. Provide strengths, weaknesses, suggestions, and summary in JSON."
     try:
         response = openai.ChatCompletion.create(
@@ -1,5 +1,4 @@
 import fitz  # PyMuPDF
-import docx
 import io
 
 def extract_text_from_pdf(file_bytes):
@@ -10,6 +9,7 @@ def extract_text_from_pdf(file_bytes):
     return text
 
 def extract_text_from_docx(file_bytes):
+    import docx  # Only DOCX uploads pay for this import
     doc = docx.Document(io.BytesIO(file_bytes))
     text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
     return text
@@ -0,0 +1,207 @@
+"""
+Prepared pipeline state for the edge function.
+
+Everything the analyzer needs before it can handle a request body (RAKE
+stopwords and punctuation, punkt's abbreviations, the spaCy model trimmed to
+NER) is built once by
+`build_snapshot.py` into a single pickle of plain Python types. Loading it
+imports neither spaCy nor NLTK, so a cold start costs one file read. The NER
+model is only rebuilt from the snapshot bytes, importing spaCy, the first time
+a request asks for entities.
+
+Without a snapshot the state is prepared live as before (NLTK stopword
+download, spaCy load on first NER use).
+
+    ANALYZER_SNAPSHOT=pipeline_state.pkl   (default: next to main.py)
+"""
+
+import os
+import pickle
+import re
+import string
+import time
+from collections import Counter
+from threading import Lock
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_PATH = os.getenv(
+    "ANALYZER_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pipeline_state.pkl"),
+)
+SPACY_MODEL = os.getenv("ANALYZER_SPACY_MODEL", "en_core_web_sm")
+# Everything the en_core_web_* pipelines ship besides tok2vec and ner
+NON_NER_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer"]
+
+# nltk.tokenize.wordpunct_tokenize
+_WORD = re.compile(r"\w+|[^\w\s]+")
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+# punkt only ends a sentence at an ellipsis when its trained orthographic
+# statistics say the next word starts one; untrained, it never does
+_ELLIPSIS = re.compile(r"\.\.+[\"')\]]*$")
+# Used when punkt's trained English parameters are not installed; otherwise
+# the snapshot holds punkt's own abbreviations so sentences split the same way
+ABBREVIATIONS = frozenset({"e.g", "i.e", "etc", "vs", "dr", "mr", "mrs", "ms", "prof", "inc", "ltd", "co", "corp",
+                           "jr", "sr", "st", "no", "approx", "dept", "est", "jan", "feb", "mar", "apr", "jun",
+                           "jul", "aug", "sep", "sept", "oct", "nov", "dec"})
+
+
+def rake_keywords(text, to_ignore, abbreviations=ABBREVIATIONS, top=15):
+    """
+    Ranked RAKE phrases as rake_nltk computes them (degree / frequency,
+    repeated phrases kept), without importing NLTK. Sentences end at a word
+    ending in . ! or ? that is not an abbreviation, initial or ellipsis, which
+    is punkt's main rule; tests/test_rake_parity.py checks it against rake_nltk.
+    """
+    phrases, current = [], []
+    for chunk in text.split():
+        for word in _WORD.findall(chunk):
+            word = word.lower()
+            if word in to_ignore:
+                if current:
+                    phrases.append(tuple(current))
+                    current = []
+            else:
+                current.append(word)
+        if current and _SENTENCE_END.search(chunk) and not _ELLIPSIS.search(chunk):
+            stem = chunk.rstrip(".!?\"')]").lower()
+            if len(stem) > 1 and stem not in abbreviations:
+                phrases.append(tuple(current))
+                current = []
+    if current:
+        phrases.append(tuple(current))
+
+    frequency, degree = Counter(), Counter()
+    for phrase in phrases:
+        for word in phrase:
+            frequency[word] += 1
+            degree[word] += len(phrase)
+    ranked = []
+    for phrase in phrases:
+        rank = 0.0
+        for word in phrase:
+            rank += 1.0 * degree[word] / frequency[word]
+        ranked.append((rank, " ".join(phrase)))
+    ranked.sort(reverse=True)
+    return [phrase for _, phrase in ranked[:top]]
+
+
+def load_trimmed_nlp(model=SPACY_MODEL):
+    """spaCy pipeline with only the components NER depends on."""
+    import spacy
+
+    nlp = spacy.load(model, exclude=NON_NER_COMPONENTS)
+    if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+        nlp.remove_pipe("tok2vec")
+    return nlp
+
+
+def prepare_state(model=SPACY_MODEL, include_ner=False):
+    """Builds the state from the installed NLTK data and spaCy model (slow)."""
+    import nltk
+
+    try:
+        nltk.download("stopwords", quiet=True)
+        stopwords = set(nltk.corpus.stopwords.words("english"))
+    except Exception as e:
+        print(f"Warning: NLTK stopwords unavailable, keywords split on punctuation only: {e}")
+        stopwords = set()
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+        nltk.download("punkt_tab", quiet=True)
+        abbreviations = frozenset(PunktTokenizer("english")._params.abbrev_types)
+    except Exception as e:
+        print(f"Warning: punkt parameters unavailable, using built-in abbreviations: {e}")
+        abbreviations = ABBREVIATIONS
+
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "to_ignore": frozenset(stopwords | set(string.punctuation)),
+        "abbreviations": abbreviations,
+        "spacy_version": None,
+        "spacy_config": None,
+        "spacy_bytes": None,
+    }
+    if include_ner:
+        import spacy
+
+        nlp = load_trimmed_nlp(model)
+        state.update(spacy_version=spacy.__version__, spacy_config=nlp.config.to_str(), spacy_bytes=nlp.to_bytes())
+    return state
+
+
+def build_snapshot(path=SNAPSHOT_PATH, model=SPACY_MODEL):
+    state = prepare_state(model, include_ner=True)
+    if len(state["to_ignore"]) <= len(string.punctuation):
+        raise RuntimeError("NLTK stopwords are required to build a snapshot")
+    if state["abbreviations"] is ABBREVIATIONS:
+        raise RuntimeError("NLTK punkt_tab data is required to build a snapshot")
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return state
+
+
+class Pipeline:
+    def __init__(self, path=SNAPSHOT_PATH, model=SPACY_MODEL):
+        started = time.perf_counter()
+        self.model = model
+        self.source = "live"
+        state = None
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    state = pickle.load(f)
+                if state.get("version") != SNAPSHOT_VERSION:
+                    print(f"Warning: Ignoring snapshot {path} with version {state.get('version')}")
+                    state = None
+                else:
+                    self.source = "snapshot"
+            except Exception as e:
+                print(f"Warning: Could not load snapshot {path}: {e}")
+                state = None
+        self._state = state or prepare_state(model)
+        self.to_ignore = self._state["to_ignore"]
+        self.abbreviations = self._state["abbreviations"]
+        self._nlp = None
+        self._nlp_failed = False
+        self._lock = Lock()
+        self.timings = {"load_ms": (time.perf_counter() - started) * 1000}
+
+    def keywords(self, text, top=15):
+        return rake_keywords(text, self.to_ignore, self.abbreviations, top)
+
+    @property
+    def nlp(self):
+        """NER pipeline, built on first use; None if no model is available."""
+        if self._nlp is None and not self._nlp_failed:
+            with self._lock:
+                if self._nlp is None and not self._nlp_failed:
+                    started = time.perf_counter()
+                    try:
+                        self._nlp = self._load_nlp()
+                    except Exception as e:
+                        print(f"Warning: spaCy NER unavailable: {e}")
+                        self._nlp_failed = True
+                    self.timings["ner_load_ms"] = (time.perf_counter() - started) * 1000
+        return self._nlp
+
+    def _load_nlp(self):
+        import spacy
+
+        state = self._state
+        if state["spacy_bytes"] is not None and state["spacy_version"] == spacy.__version__:
+            from spacy.util import get_lang_class
+            from thinc.api import Config
+
+            config = Config().from_str(state["spacy_config"])
+            nlp = get_lang_class(config["nlp"]["lang"]).from_config(config)
+            nlp.from_bytes(state["spacy_bytes"])
+            state["spacy_bytes"] = None  # The model now owns the weights
+            return nlp
+        if state["spacy_version"] is not None:
+            print(f"Warning: Snapshot built with spaCy {state['spacy_version']}, loading {self.model} instead")
+        return load_trimmed_nlp(self.model)
+
+
+pipeline = Pipeline()